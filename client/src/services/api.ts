@@ -362,14 +362,16 @@ class ApiService {
   async getFavorites(params?: {
     page?: number;
     per_page?: number;
+    cursor?: string;
     tag?: string;
     project_id?: number;
   }): Promise<{
     items: any[];
-    total: number;
+    total: number | null;
     page: number;
     per_page: number;
     has_more: boolean;
+    next_cursor?: string | null;
   }> {
     const response = await apiClient.get('/favorites/', { params });
     return response.data;
@@ -462,14 +464,16 @@ class ApiService {
   async getCompetitors(params?: {
     page?: number;
     per_page?: number;
+    cursor?: string;
     is_active?: boolean;
     project_id?: number;
   }): Promise<{
     items: any[];
-    total: number;
+    total: number | null;
     page: number;
     per_page: number;
     has_more: boolean;
+    next_cursor?: string | null;
   }> {
     const response = await apiClient.get('/competitors/', { params });
     return response.data;
@@ -2,18 +2,25 @@
 AI Script Generation API with Credits Integration
 Generates viral TikTok scripts using Google Gemini with usage tracking
 """
+import asyncio
 import logging
 import uuid
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends, status
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Dict, Any
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..services.gemini_script_generator import GeminiScriptGenerator
-from ..core.database import get_db
+from ..core.database import AsyncSessionLocal, get_async_db
+from ..core.cache import get_cache, make_cache_key
 from ..db.models import User, UserScript, ChatMessage, UserSettings, Project
-from ..api.dependencies import get_current_user
+from ..api.dependencies import get_current_user_async
+from ..api.chat_sessions import format_sse, run_detached, save_generated_image, RESPONSE_CACHE_TTL
+from ..api.routes.usage import invalidate_usage_cache
+from ..prompts import get_mode_prompt, format_history, normalize_mode
 
 logger = logging.getLogger(__name__)
 router = APIRouter()  # Prefix and tags defined in main.py
@@ -41,7 +48,7 @@ MODEL_COSTS = {
 # HELPER FUNCTIONS
 # =============================================================================
 
-def check_credits(user: User, cost: int, db: Session) -> bool:
+def check_credits(user: User, cost: int) -> bool:
     """
     Check if user has enough credits for the operation.
 
@@ -59,7 +66,7 @@ def check_credits(user: User, cost: int, db: Session) -> bool:
     return total_available >= cost
 
 
-def deduct_credits(user: User, cost: int, db: Session):
+async def deduct_credits(user: User, cost: int, db: AsyncSession):
     """
     Deduct credits from user account in correct order.
 
@@ -86,12 +93,13 @@ def deduct_credits(user: User, cost: int, db: Session):
         user.bonus_credits -= deduction
         remaining -= deduction
 
-    db.commit()
+    await db.commit()
+    await invalidate_usage_cache(user.id)
 
     logger.info(
-        f"Deducted {cost} credits from user {user.id}. "
-        f"Remaining: {user.monthly_credits_limit - user.monthly_credits_used} monthly, "
-        f"{user.rollover_credits} rollover, {user.bonus_credits} bonus"
+        "Deducted %d credits from user %s. Remaining: %d monthly, %d rollover, %d bonus",
+        cost, user.id, user.monthly_credits_limit - user.monthly_credits_used,
+        user.rollover_credits, user.bonus_credits
     )
 
 
@@ -169,6 +177,12 @@ class ChatRequest(BaseModel):
     language: str = Field(default="English", description="Response language")
     project_id: Optional[int] = Field(default=None, description="Project ID for personalization")
 
+    @field_validator('mode')
+    @classmethod
+    def validate_mode(cls, v: str) -> str:
+        """Unknown modes fall back to the default mode."""
+        return normalize_mode(v)
+
 
 class ChatResponse(BaseModel):
     """AI chat response"""
@@ -177,84 +191,6 @@ class ChatResponse(BaseModel):
     model_used: str = Field(..., description="AI model used")
 
 
-# System prompts for different modes
-MODE_PROMPTS = {
-    "script": """You are an expert viral TikTok script writer. Create engaging, hook-driven scripts that capture attention in the first 3 seconds.
-Format your response with:
-1. **Hook** (first 3 seconds)
-2. **Body** (main content, bullet points)
-3. **Call to Action**
-4. **Pro Tips** for maximum engagement""",
-
-    "ideas": """You are a creative TikTok content strategist. Generate unique, trending video ideas that have viral potential.
-For each idea include:
-- Video concept
-- Why it could go viral
-- Best posting time
-- Suggested hashtags""",
-
-    "analysis": """You are a TikTok analytics expert. Analyze trends, content strategies, and viral mechanics.
-Provide insights on:
-- What makes content successful
-- Audience behavior patterns
-- Growth opportunities
-- Competitor strategies""",
-
-    "improve": """You are a content optimization specialist. Take existing scripts/content and make them more engaging and viral.
-Focus on:
-- Stronger hooks
-- Better pacing
-- More emotional triggers
-- Clearer call-to-action""",
-
-    "hook": """You are a hook specialist. Create attention-grabbing opening lines that stop the scroll.
-Provide:
-- 5 different hook variations
-- Why each works psychologically
-- Best delivery tips""",
-
-    "chat": """You are a friendly and helpful AI assistant. Have a natural conversation with the user. Answer their questions directly and concisely. Do not format responses as scripts, hooks, or content strategies unless the user specifically asks for that.""",
-
-    "prompt-enhancer": """You are a world-class Prompt Engineer. You take a rough idea and turn it into a perfect, professional prompt.
-
-YOUR PROCESS HAS EXACTLY 2 MESSAGES:
-
-=== YOUR FIRST REPLY (after user's idea) ===
-Output EXACTLY 5 open-ended clarifying questions. These questions must:
-- Deeply understand WHAT the user truly wants to achieve
-- Be open-ended so the user can express their vision freely
-- Cover: goal/vision, style/mood, specific details, technical requirements, context of use
-- Be tailored to the user's specific topic (NOT generic questions)
-No greeting. No intro. No explanation. ONLY the 5 numbered questions.
-
-=== YOUR SECOND REPLY (after user answers) ===
-Generate a POWERFUL, DETAILED prompt that is ready to copy-paste into any AI. The prompt must:
-- Be 150-300 words long
-- Start with a clear role/persona assignment
-- Include ALL specifics from user's answers
-- Define exact style, mood, composition, lighting, colors, perspective
-- Specify technical details (resolution, format, aspect ratio if applicable)
-- Include negative constraints (what to avoid)
-- Use professional prompt engineering structure
-
-Format your second reply as:
-
-🎯 **Enhanced Prompt:**
-[the full detailed prompt here]
-
-📝 **Key improvements:**
-- [what was added/enhanced vs the original rough idea]
-- [...]
-- [...]
-
-ABSOLUTE RULES:
-1. You ask questions ONLY ONCE — in your first reply
-2. After user answers, you IMMEDIATELY output the final prompt — NO MORE QUESTIONS EVER
-3. The final prompt must be significantly better and more detailed than the user's original idea
-4. If the conversation history already contains your questions AND user's answers, skip to generating the final prompt"""
-}
-
-
 # =============================================================================
 # API ENDPOINTS
 # =============================================================================
@@ -262,8 +198,8 @@ ABSOLUTE RULES:
 @router.post("/generate", response_model=ScriptResponse)
 async def generate_script(
     request: ScriptRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ) -> ScriptResponse:
     """
     Generate viral TikTok script with credits tracking.
@@ -275,9 +211,9 @@ async def generate_script(
     """
     try:
         # Get user settings for Auto Mode
-        settings = db.query(UserSettings).filter(
-            UserSettings.user_id == current_user.id
-        ).first()
+        settings = (await db.execute(
+            select(UserSettings).where(UserSettings.user_id == current_user.id)
+        )).scalars().first()
 
         # Determine task complexity (simple heuristic)
         desc_length = len(request.video_description.split())
@@ -287,7 +223,7 @@ async def generate_script(
         model_name, cost = select_model(current_user, settings, task_complexity)
 
         # Check if user has enough credits
-        if not check_credits(current_user, cost, db):
+        if not check_credits(current_user, cost):
             raise HTTPException(
                 status_code=status.HTTP_402_PAYMENT_REQUIRED,
                 detail=f"Insufficient credits. Need {cost}, but you have "
@@ -295,7 +231,7 @@ async def generate_script(
             )
 
         # Generate script
-        script = _get_generator().generate_script(
+        script = await _get_generator().generate_script_async(
             video_description=request.video_description,
             video_stats=request.video_stats,
             tone=request.tone,
@@ -310,7 +246,7 @@ async def generate_script(
             )
 
         # Deduct credits
-        deduct_credits(current_user, cost, db)
+        await deduct_credits(current_user, cost, db)
 
         # Save to database for tracking
         db_script = UserScript(
@@ -328,11 +264,11 @@ async def generate_script(
             created_at=datetime.utcnow()
         )
         db.add(db_script)
-        db.commit()
+        await db.commit()
 
         logger.info(
-            f"User {current_user.id} generated script using {model_name} "
-            f"(cost: {cost} credits, auto_mode: {settings.ai_auto_mode if settings else True})"
+            "User %s generated script using %s (cost: %d credits, auto_mode: %s)",
+            current_user.id, model_name, cost, settings.ai_auto_mode if settings else True
         )
 
         # Return response with credits info
@@ -345,87 +281,79 @@ async def generate_script(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Script generation error for user {current_user.id}: {e}")
+        logger.error("Script generation error for user %s: %s", current_user.id, e)
         raise HTTPException(
             status_code=500,
             detail=f"Script generation failed: {str(e)}"
         )
 
 
-@router.post("/chat", response_model=ChatResponse)
-async def ai_chat(
-    request: ChatRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-) -> ChatResponse:
-    """
-    AI Creator chat with credits tracking.
+async def _select_chat_model(request: ChatRequest, user: User, db: AsyncSession) -> tuple[str, int]:
+    """Pick the model for a chat request and verify the user can afford it."""
+    # Get user settings
+    settings = (await db.execute(
+        select(UserSettings).where(UserSettings.user_id == user.id)
+    )).scalars().first()
+
+    # Determine cost based on model
+    if request.model == "nano-bana":
+        model_name = "nano-bana"
+        cost = MODEL_COSTS.get("nano-bana", 2)
+    else:
+        msg_length = len(request.message.split())
+        task_complexity = "complex" if msg_length > 30 else "simple"
+        model_name, cost = select_model(user, settings, task_complexity)
+
+    # Check credits
+    if not check_credits(user, cost):
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail=f"Insufficient credits. Need {cost} credits."
+        )
 
-    - Uses Auto Mode for model selection
-    - Saves conversation to database
-    - Tracks credits usage
-    """
-    try:
-        # Get user settings
-        settings = db.query(UserSettings).filter(
-            UserSettings.user_id == current_user.id
-        ).first()
+    return model_name, cost
 
-        # Determine cost based on model
-        if request.model == "nano-bana":
-            model_name = "nano-bana"
-            cost = MODEL_COSTS.get("nano-bana", 2)
-        else:
-            msg_length = len(request.message.split())
-            task_complexity = "complex" if msg_length > 30 else "simple"
-            model_name, cost = select_model(current_user, settings, task_complexity)
 
-        # Check credits
-        if not check_credits(current_user, cost, db):
-            raise HTTPException(
-                status_code=status.HTTP_402_PAYMENT_REQUIRED,
-                detail=f"Insufficient credits. Need {cost} credits."
-            )
-
-        # Build conversation history
-        history_text = ""
-        for msg in request.history[-6:]:
-            role = "User" if msg.get("role") == "user" else "Assistant"
-            history_text += f"{role}: {msg.get('content', '')}\n"
+async def _build_chat_prompts(request: ChatRequest, user: User, db: AsyncSession) -> tuple[str, str]:
+    """Build (system_instruction, prompt) for a chat request."""
+    # Build conversation history
+    history_text = format_history(request.history, limit=6)
 
-        # Get mode-specific system prompt
-        system_prompt = MODE_PROMPTS.get(request.mode, MODE_PROMPTS["script"])
+    # Get mode-specific system prompt
+    system_prompt = get_mode_prompt(request.mode)
 
-        # Add language instruction
-        lang_instruction = ""
-        if request.language and request.language.lower() != "english":
-            lang_instruction = f"IMPORTANT: You MUST respond entirely in {request.language}. All text, headings, and content must be in {request.language}.\n\n"
+    # Add language instruction
+    lang_instruction = ""
+    if request.language and request.language.lower() != "english":
+        lang_instruction = f"IMPORTANT: You MUST respond entirely in {request.language}. All text, headings, and content must be in {request.language}.\n\n"
 
-        # Inject project context if project_id provided
-        project_context = ""
-        if request.project_id:
-            project = db.query(Project).filter(
+    # Inject project context if project_id provided
+    project_context = ""
+    if request.project_id:
+        project = (await db.execute(
+            select(Project).where(
                 Project.id == request.project_id,
-                Project.user_id == current_user.id
-            ).first()
-            if project and project.profile_data:
-                p = project.profile_data
-                audience = p.get('audience', {})
-                if isinstance(audience, dict):
-                    audience_parts = []
-                    if audience.get('age'): audience_parts.append(f"Age: {audience['age']}")
-                    if audience.get('gender'): audience_parts.append(f"Gender: {audience['gender']}")
-                    if audience.get('level'): audience_parts.append(f"Level: {audience['level']}")
-                    if audience.get('interests'): audience_parts.append(f"Interests: {', '.join(audience['interests'])}")
-                    audience_str = ', '.join(audience_parts)
-                else:
-                    audience_str = str(audience)
-
-                creator_qa = ""
-                if project.raw_input and project.raw_input.get('description_text'):
-                    creator_qa = project.raw_input['description_text']
-
-                project_context = f"""===== CREATOR PROFILE =====
+                Project.user_id == user.id
+            )
+        )).scalars().first()
+        if project and project.profile_data:
+            p = project.profile_data
+            audience = p.get('audience', {})
+            if isinstance(audience, dict):
+                audience_parts = []
+                if audience.get('age'): audience_parts.append(f"Age: {audience['age']}")
+                if audience.get('gender'): audience_parts.append(f"Gender: {audience['gender']}")
+                if audience.get('level'): audience_parts.append(f"Level: {audience['level']}")
+                if audience.get('interests'): audience_parts.append(f"Interests: {', '.join(audience['interests'])}")
+                audience_str = ', '.join(audience_parts)
+            else:
+                audience_str = str(audience)
+
+            creator_qa = ""
+            if project.raw_input and project.raw_input.get('description_text'):
+                creator_qa = project.raw_input['description_text']
+
+            project_context = f"""===== CREATOR PROFILE =====
 NICHE: {p.get('niche', '')} / {p.get('sub_niche', '')}
 FORMATS: {', '.join(p.get('format', []))}
 PLATFORMS: {', '.join(p.get('platforms', []))}
@@ -443,9 +371,10 @@ Tailor ALL script content for this creator's niche, tone, audience, and style. U
 
 """
 
-        prompt = f"""{lang_instruction}{project_context}{system_prompt}
-
-CONVERSATION HISTORY:
+    # Static instructions go first as system_instruction (cacheable prefix);
+    # only history + the request change between calls
+    system_instruction = f"{lang_instruction}{project_context}{system_prompt}"
+    prompt = f"""CONVERSATION HISTORY:
 {history_text}
 
 USER REQUEST: {request.message}
@@ -453,26 +382,72 @@ USER REQUEST: {request.message}
 Respond in a helpful, structured way. Use markdown formatting (bold, bullets, headers) for readability.
 Keep the response focused and actionable."""
 
+    return system_instruction, prompt
+
+
+async def _save_chat_exchange(db: AsyncSession, user_id: int, request: ChatRequest, ai_response: str, model_name: str):
+    """Persist the user message and assistant reply as one chat exchange."""
+    # Save to database
+    session_id = str(uuid.uuid4())
+
+    # Save user message
+    user_msg = ChatMessage(
+        user_id=user_id,
+        session_id=session_id,
+        role="user",
+        content=request.message,
+        mode=request.mode,
+        created_at=datetime.utcnow()
+    )
+    db.add(user_msg)
+
+    # Save assistant response
+    assistant_msg = ChatMessage(
+        user_id=user_id,
+        session_id=session_id,
+        role="assistant",
+        content=ai_response,
+        model=model_name,
+        mode=request.mode,
+        created_at=datetime.utcnow()
+    )
+    db.add(assistant_msg)
+    await db.commit()
+
+
+@router.post("/chat", response_model=ChatResponse)
+async def ai_chat(
+    request: ChatRequest,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+) -> ChatResponse:
+    """
+    AI Creator chat with credits tracking.
+
+    - Uses Auto Mode for model selection
+    - Saves conversation to database
+    - Tracks credits usage
+    """
+    try:
+        model_name, cost = await _select_chat_model(request, current_user, db)
+
+        system_instruction, prompt = await _build_chat_prompts(request, current_user, db)
+
         # Handle image generation for nano-bana model
         if request.model == "nano-bana":
             try:
                 from google.genai import types
-                from pathlib import Path
-                import uuid as _uuid
 
                 gen = _get_generator()
                 if gen.client is None:
                     raise Exception("Gemini API not initialized")
 
-                uploads_dir = Path(__file__).parent.parent.parent / "uploads" / "generated"
-                uploads_dir.mkdir(parents=True, exist_ok=True)
-
                 # Try image generation models in order of preference
                 image_models = ["gemini-2.0-flash-exp-image-generation", "gemini-2.5-flash-image"]
                 img_response = None
                 for img_model in image_models:
                     try:
-                        img_response = gen.client.models.generate_content(
+                        img_response = await gen.client.aio.models.generate_content(
                             model=img_model,
                             contents=request.message,
                             config=types.GenerateContentConfig(
@@ -480,10 +455,10 @@ Keep the response focused and actionable."""
                             )
                         )
                         if img_response.candidates:
-                            print(f"[AI] Image generated with model: {img_model}")
+                            logger.info("[AI] Image generated with model: %s", img_model)
                             break
                     except Exception as model_err:
-                        print(f"[AI] Model {img_model} failed: {model_err}")
+                        logger.warning("[AI] Model %s failed: %s", img_model, model_err)
                         continue
 
                 if not img_response or not img_response.candidates:
@@ -492,13 +467,8 @@ Keep the response focused and actionable."""
                 result_parts = []
                 for part in img_response.candidates[0].content.parts:
                     if hasattr(part, 'inline_data') and part.inline_data:
-                        ext = "png" if "png" in (part.inline_data.mime_type or "") else "jpg"
-                        filename = f"{_uuid.uuid4().hex}.{ext}"
-                        filepath = uploads_dir / filename
-                        filepath.write_bytes(part.inline_data.data)
-                        img_url = f"/uploads/generated/{filename}"
+                        img_url = await save_generated_image(part.inline_data.data, part.inline_data.mime_type)
                         result_parts.append(f"![Generated Image]({img_url})")
-                        print(f"[AI] Image saved: {filepath} ({len(part.inline_data.data)} bytes)")
                     elif hasattr(part, 'text') and part.text:
                         result_parts.append(part.text.strip())
 
@@ -509,50 +479,37 @@ Keep the response focused and actionable."""
                     result_parts.insert(0, "Вот сгенерированное изображение по вашему запросу:")
                 ai_response = "\n\n".join(result_parts) if result_parts else "Не удалось сгенерировать изображение. Попробуйте более подробный запрос."
             except Exception as img_err:
-                print(f"[AI] Nano Bana error: {img_err}")
+                logger.error("[AI] Nano Bana error: %s", img_err)
                 ai_response = f"Ошибка генерации изображения: {str(img_err)}"
         else:
-            # Generate text response
-            response = _get_generator().client.models.generate_content(
-                model="gemini-2.0-flash" if model_name == "gemini-flash" else "gemini-2.0-pro",
-                contents=prompt
-            )
-
-            ai_response = response.text.strip() if response.text else "I couldn't generate a response. Please try again."
+            # Generate text response (exact-duplicate requests are served from cache)
+            cache = get_cache()
+            cache_key = make_cache_key("ai_chat", model_name, request.mode, system_instruction, prompt)
+            ai_response = await cache.get(cache_key)
+            if ai_response is not None:
+                cost = 0  # Cached answers cost the provider nothing; don't charge for them
+            else:
+                from google.genai import types
+                response = await _get_generator().client.aio.models.generate_content(
+                    model="gemini-2.0-flash" if model_name == "gemini-flash" else "gemini-2.0-pro",
+                    contents=prompt,
+                    config=types.GenerateContentConfig(system_instruction=system_instruction)
+                )
+
+                if response.text:
+                    ai_response = response.text.strip()
+                    await cache.set(cache_key, ai_response, RESPONSE_CACHE_TTL)
+                else:
+                    ai_response = "I couldn't generate a response. Please try again."
 
         # Deduct credits
-        deduct_credits(current_user, cost, db)
-
-        # Save to database
-        session_id = str(uuid.uuid4())
+        await deduct_credits(current_user, cost, db)
 
-        # Save user message
-        user_msg = ChatMessage(
-            user_id=current_user.id,
-            session_id=session_id,
-            role="user",
-            content=request.message,
-            mode=request.mode,
-            created_at=datetime.utcnow()
-        )
-        db.add(user_msg)
-
-        # Save assistant response
-        assistant_msg = ChatMessage(
-            user_id=current_user.id,
-            session_id=session_id,
-            role="assistant",
-            content=ai_response,
-            model=model_name,
-            mode=request.mode,
-            created_at=datetime.utcnow()
-        )
-        db.add(assistant_msg)
-        db.commit()
+        await _save_chat_exchange(db, current_user.id, request, ai_response, model_name)
 
         logger.info(
-            f"User {current_user.id} sent chat message using {model_name} "
-            f"(cost: {cost} credits)"
+            "User %s sent chat message using %s (cost: %d credits)",
+            current_user.id, model_name, cost
         )
 
         return ChatResponse(
@@ -564,7 +521,7 @@ Keep the response focused and actionable."""
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"AI chat error for user {current_user.id}: {e}")
+        logger.error("AI chat error for user %s: %s", current_user.id, e)
         return ChatResponse(
             response="Sorry, I encountered an error. Please try again.",
             credits_used=0,
@@ -572,6 +529,80 @@ Keep the response focused and actionable."""
         )
 
 
+@router.post("/chat/stream")
+async def ai_chat_stream(
+    request: ChatRequest,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Streaming variant of /chat (Server-Sent Events).
+
+    Emits `{"delta": "..."}` events as Gemini produces tokens, then a final
+    `{"done": true, "credits_used": ..., "model_used": ...}` event.
+    Credits are checked up front and charged once text has been sent, also
+    when the client disconnects mid-stream (saved by a detached task).
+    """
+    if request.model == "nano-bana":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Image generation is not streamable, use /chat"
+        )
+
+    model_name, cost = await _select_chat_model(request, current_user, db)
+    system_instruction, prompt = await _build_chat_prompts(request, current_user, db)
+    user_id = current_user.id
+    # Release the request-scoped connection; it is not needed while streaming
+    await db.close()
+
+    async def save_exchange(ai_response: str) -> None:
+        # Short-lived session so no transaction is held open during generation
+        async with AsyncSessionLocal() as write_db:
+            user = await write_db.get(User, user_id)
+            await deduct_credits(user, cost, write_db)
+            await _save_chat_exchange(write_db, user_id, request, ai_response, model_name)
+
+    async def event_stream():
+        from google.genai import types
+
+        chunks = []
+        try:
+            async for chunk in await _get_generator().client.aio.models.generate_content_stream(
+                model="gemini-2.0-flash" if model_name == "gemini-flash" else "gemini-2.0-pro",
+                contents=prompt,
+                config=types.GenerateContentConfig(system_instruction=system_instruction)
+            ):
+                if chunk.text:
+                    chunks.append(chunk.text)
+                    yield format_sse({"delta": chunk.text})
+        except Exception as e:
+            logger.error("AI chat stream error for user %s: %s", user_id, e)
+            yield format_sse({"error": "Sorry, I encountered an error. Please try again."})
+            return
+        except (GeneratorExit, asyncio.CancelledError):
+            # Client left mid-stream after receiving text: save and bill what it got
+            if chunks:
+                run_detached(save_exchange("".join(chunks).strip()))
+            raise
+
+        ai_response = "".join(chunks).strip() or "I couldn't generate a response. Please try again."
+
+        # Shielded so a disconnect during the write can't skip the charge
+        await asyncio.shield(run_detached(save_exchange(ai_response)))
+
+        logger.info(
+            "User %s streamed chat message using %s (cost: %d credits)",
+            user_id, model_name, cost
+        )
+        yield format_sse({"done": True, "credits_used": cost, "model_used": model_name})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/health")
 def health_check():
     """Check AI Script Generator health"""
@@ -6,18 +6,34 @@ Manages AI chat sessions and message history for users.
 Supports multiple AI providers: Gemini, Claude, GPT
 """
 import os
+import re
+import json
+import asyncio
+import logging
 import uuid
 from datetime import datetime
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-
-from ..core.database import get_db
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from sqlalchemy import delete, desc, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload
+
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal, get_async_db
+from ..core.cache import TTLCache, get_cache, make_cache_key
+from ..core.http_client import get_shared_async_http_client
+from ..core.resilience import CircuitBreaker, call_with_retry, is_transient_error
 from ..db.models import User, ChatSession, ChatMessage, Project
-from .dependencies import get_current_user, CreditManager
+from .dependencies import get_current_user_async, CreditManager
+from .pagination import decode_cursor, encode_cursor
+from ..services.link_parser import extract_video_info, get_parse_pool
+from ..prompts import get_localized_system_prompt, format_history, normalize_mode
 
+logger = logging.getLogger(__name__)
 router = APIRouter(tags=["Chat Sessions"])
 
 # =============================================================================
@@ -27,19 +43,29 @@ router = APIRouter(tags=["Chat Sessions"])
 _gemini_client = None
 _anthropic_client = None
 _openai_client = None
+_async_anthropic_client = None
+_async_openai_client = None
+# google.genai.types, bound once by get_gemini_client() so request paths
+# don't go through the import machinery on every call
+_gtypes = None
 
 def get_gemini_client():
     """Get or create Gemini client"""
-    global _gemini_client
+    global _gemini_client, _gtypes
     if _gemini_client is None:
         api_key = os.getenv("GEMINI_API_KEY")
         if api_key:
             try:
                 from google import genai
-                _gemini_client = genai.Client(api_key=api_key)
-                print("[AI] Gemini client initialized")
+                from google.genai import types as _gtypes_mod
+                _gtypes = _gtypes_mod
+                _gemini_client = genai.Client(
+                    api_key=api_key,
+                    http_options=_gtypes.HttpOptions(httpx_async_client=get_shared_async_http_client())
+                )
+                logger.info("[AI] Gemini client initialized")
             except Exception as e:
-                print(f"[AI] Failed to initialize Gemini: {e}")
+                logger.error("[AI] Failed to initialize Gemini: %s", e)
     return _gemini_client
 
 def get_anthropic_client():
@@ -51,9 +77,9 @@ def get_anthropic_client():
             try:
                 import anthropic
                 _anthropic_client = anthropic.Anthropic(api_key=api_key)
-                print("[AI] Anthropic client initialized")
+                logger.info("[AI] Anthropic client initialized")
             except Exception as e:
-                print(f"[AI] Failed to initialize Anthropic: {e}")
+                logger.error("[AI] Failed to initialize Anthropic: %s", e)
     return _anthropic_client
 
 def get_openai_client():
@@ -65,29 +91,471 @@ def get_openai_client():
             try:
                 from openai import OpenAI
                 _openai_client = OpenAI(api_key=api_key)
-                print("[AI] OpenAI client initialized")
+                logger.info("[AI] OpenAI client initialized")
             except Exception as e:
-                print(f"[AI] Failed to initialize OpenAI: {e}")
+                logger.error("[AI] Failed to initialize OpenAI: %s", e)
     return _openai_client
 
+def get_async_anthropic_client():
+    """Get or create async Anthropic (Claude) client"""
+    global _async_anthropic_client
+    if _async_anthropic_client is None:
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if api_key and not api_key.startswith("your-"):
+            try:
+                import anthropic
+                try:
+                    _async_anthropic_client = anthropic.AsyncAnthropic(
+                        api_key=api_key,
+                        http_client=get_shared_async_http_client(),
+                        max_retries=0  # retries handled by call_with_retry
+                    )
+                except TypeError:
+                    # SDK releases built on a different HTTP library reject httpx clients
+                    _async_anthropic_client = anthropic.AsyncAnthropic(api_key=api_key, max_retries=0)
+                logger.info("[AI] Async Anthropic client initialized")
+            except Exception as e:
+                logger.error("[AI] Failed to initialize async Anthropic: %s", e)
+    return _async_anthropic_client
 
-async def generate_ai_response(model: str, system_prompt: str, user_message: str, history_text: str = "", mode: str = "") -> str:
+def get_async_openai_client():
+    """Get or create async OpenAI client"""
+    global _async_openai_client
+    if _async_openai_client is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if api_key and not api_key.startswith("your-"):
+            try:
+                from openai import AsyncOpenAI
+                _async_openai_client = AsyncOpenAI(
+                    api_key=api_key,
+                    http_client=get_shared_async_http_client(),
+                    max_retries=0  # retries handled by call_with_retry
+                )
+                logger.info("[AI] Async OpenAI client initialized")
+            except Exception as e:
+                logger.error("[AI] Failed to initialize async OpenAI: %s", e)
+    return _async_openai_client
+
+
+async def warm_up_ai_clients(timeout: float = 10.0) -> None:
     """
-    Generate AI response using the specified model.
-    Supports: gemini, claude, gpt4
+    Create the provider clients and open pooled connections at startup.
+
+    Uses the free model-listing endpoints (no generation, no tokens billed)
+    so the first user request doesn't pay for client setup and TLS handshakes,
+    and missing or invalid API keys show up in the boot logs.
     """
-    # Skip generic formatting instructions for modes that have strict formatting rules
-    if mode == "prompt-enhancer":
-        suffix = ""
-    else:
-        suffix = "\n\n[FINAL REMINDER] Use emojis naturally throughout to make the response lively and easy to scan. Add blank lines between sections for breathing room. Use clean markdown: bold key points, emoji-prefixed bullets, headers with emojis. Be focused and concise. Do NOT include any profile data, keyword lists, or profile sections in your response."
+    async def _warm(name: str, client, fetch) -> None:
+        if client is None:
+            logger.warning("[AI] %s client not configured, skipping warm-up", name)
+            return
+        try:
+            await fetch(client)
+            logger.info("[AI] %s client warmed up", name)
+        except Exception as e:
+            logger.warning("[AI] %s warm-up failed: %s", name, e)
+
+    try:
+        await asyncio.wait_for(asyncio.gather(
+            _warm("Gemini", get_gemini_client(), lambda c: c.aio.models.list(config={"page_size": 1})),
+            _warm("Anthropic", get_async_anthropic_client(), lambda c: c.models.list(limit=1)),
+            _warm("OpenAI", get_async_openai_client(), lambda c: c.models.list()),
+        ), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning("[AI] Client warm-up timed out after %.0fs", timeout)
+
+
+# One breaker per provider: after 5 consecutive failures calls fail fast for 30s
+_PROVIDER_BREAKERS = {
+    "gemini": CircuitBreaker("Gemini", fail_max=5, reset_timeout=30),
+    "claude": CircuitBreaker("Claude", fail_max=5, reset_timeout=30),
+    "gpt4": CircuitBreaker("GPT-4", fail_max=5, reset_timeout=30),
+}
+
+
+# Anthropic prompt caching: a breakpoint caches everything up to and including the marked block
+_CLAUDE_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _mark_cache_breakpoint(message: dict) -> dict:
+    """Return a copy of a Claude message with cache_control set on its last content block."""
+    content = [dict(block) for block in message["content"]]
+    content[-1]["cache_control"] = _CLAUDE_CACHE_CONTROL
+    return {**message, "content": content}
+
+
+def _build_claude_messages(history: List[dict], user_content: str) -> List[dict]:
+    """
+    Build a structured Claude messages array from chat history.
+    The second-to-last turn carries a cache breakpoint so the growing
+    conversation prefix is served from Anthropic's prompt cache on the next call.
+    """
+    messages = []
+    for turn in history:
+        text = turn.get("content") or ""
+        if not text:
+            continue
+        role = "user" if turn.get("role") == "user" else "assistant"
+        # Claude conversations must open with a user turn
+        if not messages and role == "assistant":
+            continue
+        messages.append({"role": role, "content": [{"type": "text", "text": text}]})
+
+    messages.append({"role": "user", "content": [{"type": "text", "text": user_content}]})
+
+    if len(messages) >= 2:
+        messages[-2] = _mark_cache_breakpoint(messages[-2])
+    return messages
+
+
+def _build_gemini_contents(history: List[dict], user_message: str) -> list:
+    """
+    Build Gemini contents from the (already bounded) history window plus the
+    new message. Nothing is kept between calls, so each request carries exactly
+    the same turns the other providers see.
+    """
+    contents = []
+    for turn in history:
+        if not turn.get("content"):
+            continue
+        role = "user" if turn["role"] == "user" else "model"
+        # Like Claude, start the conversation on a user turn
+        if not contents and role == "model":
+            continue
+        contents.append(_gtypes.Content(role=role, parts=[_gtypes.Part(text=turn["content"])]))
+    contents.append(_gtypes.Content(role="user", parts=[_gtypes.Part(text=user_message)]))
+    return contents
+
+
+# Rolling history policy: keep the most recent turns verbatim and fold older
+# ones into a summary stored in ChatSession.context_data once history gets long
+HISTORY_RECENT_TURNS = 6
+HISTORY_TOKEN_BUDGET = 4000
+_SUMMARY_KEYS = ("rolling_summary", "summary_until_id")
 
-    full_prompt = f"""{system_prompt}
 
-CONVERSATION HISTORY:
+def _count_tokens(text: str) -> int:
+    """Rough token estimate (~4 chars per token), good enough for budgeting."""
+    return len(text) // 4
+
+
+async def _summarize_history(turns: List[dict], previous_summary: str = "") -> str:
+    """Fold older turns (and any previous summary) into a short summary with Gemini Flash."""
+    client = get_gemini_client()
+    if not client:
+        raise Exception("Gemini API not configured - add GEMINI_API_KEY to .env")
+
+    prompt = "Summarize the following dialogue concisely. Keep facts, decisions, preferences and open questions.\n\n"
+    if previous_summary:
+        prompt += f"EARLIER SUMMARY:\n{previous_summary}\n\n"
+    prompt += f"DIALOGUE:\n{format_history(turns)}"
+
+    response = await client.aio.models.generate_content(model="gemini-2.0-flash", contents=prompt)
+    return response.text.strip() if response.text else previous_summary
+
+
+# Field labels from project_context, used to pull the creator profile into image prompts
+_PROFILE_LINE_RE = re.compile(
+    r'^[ \t]*(?:PROJECT NAME:|NICHE:|SUB-NICHE:|CONTENT FORMATS:|PLATFORMS:|TONE & STYLE:|'
+    r'KEYWORDS \(|ANTI-KEYWORDS \(|REFERENCE ACCOUNTS:)[^\n]*',
+    re.M
+)
+
+# Headings of profile dumps that older assistant replies sometimes contain
+PROFILE_MARKERS = (
+    "CREATOR PROFILE", "===== ПРОФИЛЬ", "ПРОФИЛЬ КАНАЛА", "ПРОФИЛЬ СОЗДАТЕЛЯ",
+    "КЛЮЧЕВЫЕ СЛОВА:", "KEYWORDS:", "ANTI-KEYWORDS", "АНТИ-КЛЮЧЕВЫЕ",
+    "НАЗВАНИЕ ПРОЕКТА:", "PROJECT NAME:", "===== END PROFILE"
+)
+# One case-insensitive pass over the text instead of lower() + a find() per marker
+_PROFILE_MARKER_RE = re.compile("|".join(map(re.escape, PROFILE_MARKERS)), re.I)
+
+
+def _strip_profile_dump(content: str) -> str:
+    """Cut an assistant reply before the first profile marker (unless it starts with one)."""
+    match = _PROFILE_MARKER_RE.search(content, 1)
+    return content[:match.start()].strip() if match else content
+
+
+GENERATED_IMAGES_DIR = Path(__file__).parent.parent.parent / "uploads" / "generated"
+_IMAGE_EXTENSIONS = {"image/png": "png", "image/jpeg": "jpg", "image/webp": "webp"}
+
+
+def _write_image_file(filepath: Path, data: bytes) -> None:
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    filepath.write_bytes(data)
+
+
+async def save_generated_image(data: bytes, mime_type: Optional[str]) -> str:
+    """Write generated image bytes off the event loop; returns its public URL."""
+    ext = _IMAGE_EXTENSIONS.get(mime_type or "", "jpg")
+    filename = f"{uuid.uuid4().hex}.{ext}"
+    filepath = GENERATED_IMAGES_DIR / filename
+    await anyio.to_thread.run_sync(_write_image_file, filepath, data)
+    logger.info("[AI] Image saved path=%s size=%d", filepath, len(data))
+    return f"/uploads/generated/{filename}"
+
+
+def _build_dynamic_prompt(user_message: str, history_text: str) -> str:
+    """
+    Only the dynamic tail (history + request) goes into contents; the static
+    system prompt (mode prompt + formatting rules) is sent separately so it
+    stays a stable cacheable prefix.
+    """
+    return f"""CONVERSATION HISTORY:
 {history_text}
 
-USER REQUEST: {user_message}{suffix}"""
+USER REQUEST: {user_message}"""
+
+
+def format_sse(payload: dict) -> str:
+    """Frame a JSON payload as a Server-Sent Events message."""
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+# Strong references to detached tasks so they aren't garbage-collected mid-run
+_detached_tasks: set = set()
+
+
+def _on_detached_done(task: asyncio.Task) -> None:
+    _detached_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("[TASK] Detached task failed: %s", task.exception())
+
+
+def run_detached(coro) -> asyncio.Task:
+    """
+    Run a coroutine as a task that completes even if the request that
+    started it is cancelled (e.g. a streaming client disconnects).
+    """
+    task = asyncio.create_task(coro)
+    _detached_tasks.add(task)
+    task.add_done_callback(_on_detached_done)
+    return task
+
+
+async def stream_ai_response(
+    model: str,
+    system_prompt: str,
+    user_message: str,
+    history_text: str = "",
+    mode: str = "",
+    history: Optional[List[dict]] = None
+) -> AsyncIterator[str]:
+    """
+    Stream an AI response as text deltas using each provider's async streaming API.
+    Supports: gemini, claude, gpt4 (image generation is not streamable).
+
+    Goes through the provider's circuit breaker like non-streaming calls, so a
+    tripped provider fails fast instead of opening a stream.
+    """
+    breaker = _PROVIDER_BREAKERS[model if model in _PROVIDER_BREAKERS else "gemini"]
+    breaker.before_call()
+    try:
+        async for text in _stream_provider(model, system_prompt, user_message, history_text, history):
+            yield text
+    except Exception as e:
+        # A non-transient error (bad request, auth) still means the provider is up
+        if is_transient_error(e):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        raise
+    except BaseException:
+        # Client disconnected mid-stream: no verdict on the provider
+        breaker.release_trial()
+        raise
+    breaker.record_success()
+
+
+async def _stream_provider(
+    model: str,
+    system_prompt: str,
+    user_message: str,
+    history_text: str,
+    history: Optional[List[dict]]
+) -> AsyncIterator[str]:
+    dynamic_prompt = _build_dynamic_prompt(user_message, history_text)
+
+    if model == "claude":
+        client = get_async_anthropic_client()
+        if not client:
+            raise Exception("Claude API not configured - add valid ANTHROPIC_API_KEY to .env")
+
+        if history is not None:
+            messages = _build_claude_messages(history, user_message)
+        else:
+            messages = [{"role": "user", "content": dynamic_prompt}]
+
+        async with client.messages.stream(
+            model="claude-3-5-sonnet-20241022",
+            max_tokens=4096,
+            temperature=1.0,
+            system=[{"type": "text", "text": system_prompt, "cache_control": _CLAUDE_CACHE_CONTROL}],
+            messages=messages
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+    elif model == "gpt4":
+        client = get_async_openai_client()
+        if not client:
+            raise Exception("OpenAI API not configured - add valid OPENAI_API_KEY to .env")
+
+        stream = await client.chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"CONVERSATION HISTORY:\n{history_text}\n\nUSER REQUEST: {user_message}"}
+            ],
+            max_tokens=4096,
+            temperature=1.5,
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    else:
+        # Default to Gemini
+        client = get_gemini_client()
+        if not client:
+            raise Exception("Gemini API not configured - add GEMINI_API_KEY to .env")
+
+        if history is not None:
+            contents = _build_gemini_contents(history, user_message)
+        else:
+            contents = dynamic_prompt
+
+        async for chunk in await client.aio.models.generate_content_stream(
+            model="gemini-2.0-flash",
+            contents=contents,
+            config=_gtypes.GenerateContentConfig(
+                system_instruction=system_prompt,
+                temperature=1.5
+            )
+        ):
+            if chunk.text:
+                yield chunk.text
+
+
+# Identical (model, mode, prompt, history, message) requests within this window
+# are answered from cache instead of calling the provider again
+RESPONSE_CACHE_TTL = 300
+
+
+async def generate_ai_response(
+    model: str,
+    system_prompt: str,
+    user_message: str,
+    history_text: str = "",
+    mode: str = "",
+    history: Optional[List[dict]] = None,
+    allow_fan_out: bool = False
+) -> Tuple[str, int]:
+    """
+    Generate AI response, serving exact-duplicate text requests from cache.
+    Image generation (nano-bana) is never cached.
+
+    Returns (text, provider_calls) so the caller can charge per call: 0 for a
+    cache hit, one per generated item for a fan-out, otherwise 1.
+    """
+    if model == "nano-bana":
+        return await _call_ai_provider(
+            model, system_prompt, user_message, history_text, mode, history
+        ), 1
+
+    cache = get_cache()
+    cache_key = make_cache_key("ai_response", model, mode, system_prompt, history_text, user_message)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        logger.info("[AI] Response cache hit model=%s", model)
+        return cached, 0
+
+    if allow_fan_out and mode in _FANOUT_ANGLES and not history_text.strip():
+        response, provider_calls = await _fan_out_items(model, system_prompt, user_message, mode)
+        if provider_calls < len(_FANOUT_ANGLES[mode]):
+            # Partial merge: serve it, but let the next identical request retry in full
+            return response, provider_calls
+    else:
+        response = await _call_ai_provider(
+            model, system_prompt, user_message, history_text, mode, history
+        )
+        provider_calls = 1
+    await cache.set(cache_key, response, RESPONSE_CACHE_TTL)
+    return response, provider_calls
+
+
+# Modes that return a list of independent items. With AI_FANOUT_ENABLED, the
+# first turn generates each item by its own concurrent call (one angle per
+# call) and merges them, so latency is that of a single item rather than all
+# of them in sequence. Every call is a provider request and is charged.
+_FANOUT_ANGLES = {
+    "hook": [
+        "a provocative question",
+        "a bold or contrarian claim",
+        "a curiosity gap / open loop",
+        "a personal story opener",
+        "a surprising fact or number",
+    ],
+    "ideas": [
+        "a trend or challenge remix",
+        "an educational / how-to angle",
+        "a storytelling or POV angle",
+        "a myth-busting or hot-take angle",
+        "a behind-the-scenes or day-in-the-life angle",
+    ],
+}
+_FANOUT_ITEM_NAMES = {"hook": "hook variation", "ideas": "video idea"}
+_FANOUT_MAX_CALLS = max(len(angles) for angles in _FANOUT_ANGLES.values())
+
+
+async def _fan_out_items(model: str, system_prompt: str, user_message: str, mode: str) -> Tuple[str, int]:
+    """
+    Generate each list item concurrently and merge them in order.
+
+    Returns (text, items_generated); failed calls are dropped and not counted.
+    """
+    angles = _FANOUT_ANGLES[mode]
+    item_name = _FANOUT_ITEM_NAMES[mode]
+
+    async def _one_item(i: int, angle: str) -> str:
+        item_request = (
+            f"{user_message}\n\n"
+            f"Give exactly ONE {item_name} (#{i} of {len(angles)}), built around {angle}. "
+            f"Use the format from your instructions, numbered #{i}. Output only this one item."
+        )
+        return await _call_ai_provider(model, system_prompt, item_request, "", mode, [])
+
+    results = await asyncio.gather(
+        *[_one_item(i, angle) for i, angle in enumerate(angles, start=1)],
+        return_exceptions=True
+    )
+    items = [r for r in results if isinstance(r, str) and r.strip()]
+    if not items:
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            raise errors[0]
+        return "I couldn't generate a response.", 0
+    return "\n\n".join(items), len(items)
+
+
+async def _call_ai_provider(
+    model: str,
+    system_prompt: str,
+    user_message: str,
+    history_text: str = "",
+    mode: str = "",
+    history: Optional[List[dict]] = None
+) -> str:
+    """
+    Generate AI response using the specified model.
+    Supports: gemini, claude, gpt4
+
+    history: structured turns [{"role": "user"|"assistant", "content": str}], oldest first.
+    Used by providers that accept a messages array (Claude, Gemini) instead of history_text.
+    """
+    dynamic_prompt = _build_dynamic_prompt(user_message, history_text)
 
     try:
         if model == "gemini":
@@ -95,55 +563,71 @@ USER REQUEST: {user_message}{suffix}"""
             if not client:
                 raise Exception("Gemini API not configured - add GEMINI_API_KEY to .env")
 
-            # Try with retry on rate limit
-            max_retries = 3
-            response = None
-            for attempt in range(max_retries):
-                try:
-                    from google.genai import types as _gtypes
-                    response = client.models.generate_content(
-                        model="gemini-2.0-flash",
-                        contents=full_prompt,
-                        config=_gtypes.GenerateContentConfig(temperature=1.5)
+            if history is not None:
+                contents = _build_gemini_contents(history, user_message)
+            else:
+                contents = dynamic_prompt
+
+            async def _gemini_call():
+                return await client.aio.models.generate_content(
+                    model="gemini-2.0-flash",
+                    contents=contents,
+                    config=_gtypes.GenerateContentConfig(
+                        system_instruction=system_prompt,
+                        temperature=1.5
                     )
-                    break
-                except Exception as e:
-                    error_str = str(e)
-                    if ("429" in error_str or "RESOURCE_EXHAUSTED" in error_str) and attempt < max_retries - 1:
-                        import asyncio
-                        await asyncio.sleep((attempt + 1) * 5)
-                        continue
-                    raise
+                )
+
+            response = await call_with_retry(_gemini_call, breaker=_PROVIDER_BREAKERS["gemini"])
             return response.text.strip() if response.text else "I couldn't generate a response."
 
         elif model == "claude":
-            client = get_anthropic_client()
+            client = get_async_anthropic_client()
             if not client:
                 raise Exception("Claude API not configured - add valid ANTHROPIC_API_KEY to .env")
 
-            response = client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=4096,
-                temperature=1.0,
-                messages=[
-                    {"role": "user", "content": full_prompt}
-                ]
+            if history is not None:
+                messages = _build_claude_messages(history, user_message)
+            else:
+                messages = [{"role": "user", "content": dynamic_prompt}]
+
+            # System prompt is static per mode/project, so it is the first cache breakpoint
+            response = await call_with_retry(
+                lambda: client.messages.create(
+                    model="claude-3-5-sonnet-20241022",
+                    max_tokens=4096,
+                    temperature=1.0,
+                    system=[{"type": "text", "text": system_prompt, "cache_control": _CLAUDE_CACHE_CONTROL}],
+                    messages=messages
+                ),
+                breaker=_PROVIDER_BREAKERS["claude"]
             )
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                logger.info(
+                    "[AI] Claude cache read=%s created=%s uncached=%s",
+                    getattr(usage, 'cache_read_input_tokens', 0) or 0,
+                    getattr(usage, 'cache_creation_input_tokens', 0) or 0,
+                    usage.input_tokens
+                )
             return response.content[0].text.strip() if response.content else "I couldn't generate a response."
 
         elif model == "gpt4":
-            client = get_openai_client()
+            client = get_async_openai_client()
             if not client:
                 raise Exception("OpenAI API not configured - add valid OPENAI_API_KEY to .env")
 
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"CONVERSATION HISTORY:\n{history_text}\n\nUSER REQUEST: {user_message}"}
-                ],
-                max_tokens=4096,
-                temperature=1.5
+            response = await call_with_retry(
+                lambda: client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": f"CONVERSATION HISTORY:\n{history_text}\n\nUSER REQUEST: {user_message}"}
+                    ],
+                    max_tokens=4096,
+                    temperature=1.5
+                ),
+                breaker=_PROVIDER_BREAKERS["gpt4"]
             )
             return response.choices[0].message.content.strip() if response.choices else "I couldn't generate a response."
 
@@ -154,27 +638,14 @@ USER REQUEST: {user_message}{suffix}"""
                 raise Exception("Gemini API not configured - add GEMINI_API_KEY to .env")
 
             try:
-                from google.genai import types
-                from pathlib import Path
-                import uuid as _uuid
-
                 # Extract creator profile from system_prompt for image context
                 profile_summary = ""
                 if "CREATOR PROFILE" in system_prompt or "PROJECT NAME:" in system_prompt:
-                    profile_lines = []
-                    for line in system_prompt.split('\n'):
-                        s = line.strip()
-                        # Match actual field labels from project_context
-                        if s.startswith((
-                            'PROJECT NAME:', 'NICHE:', 'SUB-NICHE:',
-                            'CONTENT FORMATS:', 'PLATFORMS:', 'TONE & STYLE:',
-                            'KEYWORDS (', 'ANTI-KEYWORDS (', 'REFERENCE ACCOUNTS:',
-                        )):
-                            profile_lines.append(s)
-                    if profile_lines:
-                        profile_summary = '\n'.join(profile_lines)
-
-                print(f"[AI] Nano Bana: profile_found={bool(profile_summary)}, user_msg='{user_message[:100]}'")
+                    profile_summary = '\n'.join(
+                        m.group(0).strip() for m in _PROFILE_LINE_RE.finditer(system_prompt)
+                    )
+
+                logger.info("[AI] Nano Bana profile_found=%s user_msg=%.100r", bool(profile_summary), user_message)
 
                 # Build image prompt with creator context baked in
                 if profile_summary:
@@ -189,38 +660,34 @@ Create a vibrant, professional, aesthetic image matching this creator's niche an
 
 Create a vibrant, professional, high-quality image."""
 
-                print(f"[AI] Nano Bana final prompt ({len(image_prompt)} chars): {image_prompt[:300]}")
-
-                uploads_dir = Path(__file__).parent.parent.parent / "uploads" / "generated"
-                uploads_dir.mkdir(parents=True, exist_ok=True)
+                logger.debug("[AI] Nano Bana final prompt (%d chars): %.300s", len(image_prompt), image_prompt)
 
                 # Attempt 1: Image-only modality (forces Gemini to generate image, not text)
                 for attempt in range(2):
                     try:
                         if attempt == 0:
                             # Force image-only output
-                            response = client.models.generate_content(
+                            response = await client.aio.models.generate_content(
                                 model="gemini-2.5-flash-image",
                                 contents=image_prompt,
-                                config=types.GenerateContentConfig(
+                                config=_gtypes.GenerateContentConfig(
                                     response_modalities=["Image"]
                                 )
                             )
                         else:
                             # Fallback: allow text+image
-                            response = client.models.generate_content(
+                            response = await client.aio.models.generate_content(
                                 model="gemini-2.5-flash-image",
                                 contents=f"Generate an image: {user_message}",
-                                config=types.GenerateContentConfig(
+                                config=_gtypes.GenerateContentConfig(
                                     response_modalities=["Image", "Text"]
                                 )
                             )
                     except Exception as api_err:
                         error_str = str(api_err)
-                        print(f"[AI] Nano Bana API error attempt {attempt+1}: {error_str}")
+                        logger.warning("[AI] Nano Bana API error attempt=%d: %s", attempt + 1, error_str)
                         # If Image-only modality not supported, try with Text+Image
                         if attempt == 0:
-                            import asyncio
                             await asyncio.sleep(2)
                             continue
                         raise
@@ -232,21 +699,16 @@ Create a vibrant, professional, high-quality image."""
                     if response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
                         for part in response.candidates[0].content.parts:
                             if hasattr(part, 'inline_data') and part.inline_data and part.inline_data.data:
-                                ext = "png" if "png" in (part.inline_data.mime_type or "") else "jpg"
-                                filename = f"{_uuid.uuid4().hex}.{ext}"
-                                filepath = uploads_dir / filename
-                                filepath.write_bytes(part.inline_data.data)
-                                img_url = f"/uploads/generated/{filename}"
+                                img_url = await save_generated_image(part.inline_data.data, part.inline_data.mime_type)
                                 result_parts.append(f"![Generated Image]({img_url})")
                                 has_image = True
-                                print(f"[AI] Nano Bana image saved: {filepath} ({len(part.inline_data.data)} bytes)")
                             elif hasattr(part, 'text') and part.text:
                                 result_parts.append(part.text.strip())
 
                     if has_image:
                         return "\n\n".join(result_parts)
 
-                    print(f"[AI] Nano Bana attempt {attempt+1}: no image in response, text={result_parts[:1]}")
+                    logger.warning("[AI] Nano Bana attempt=%d: no image in response, text=%s", attempt + 1, result_parts[:1])
 
                 # Both attempts failed to produce image
                 if result_parts:
@@ -254,16 +716,16 @@ Create a vibrant, professional, high-quality image."""
                 return "Could not generate an image. Please try a more descriptive prompt."
 
             except Exception as img_err:
-                print(f"[AI] Nano Bana error: {img_err}")
+                logger.error("[AI] Nano Bana error: %s", img_err)
                 return f"Image generation error: {str(img_err)[:200]}. Please try again."
 
         else:
             # Default to Gemini
-            return await generate_ai_response("gemini", system_prompt, user_message, history_text)
+            return await _call_ai_provider("gemini", system_prompt, user_message, history_text, history=history)
 
     except Exception as e:
         error_str = str(e).lower()
-        print(f"[AI] Error with {model}: {e}")
+        logger.error("[AI] Error with %s: %s", model, e)
 
         # User-friendly error messages
         if "credit balance is too low" in error_str or "insufficient_quota" in error_str:
@@ -290,6 +752,12 @@ class ChatSessionCreate(BaseModel):
     context_id: Optional[int] = None
     context_data: Optional[dict] = {}
 
+    @field_validator('mode')
+    @classmethod
+    def validate_mode(cls, v: str) -> str:
+        """Unknown modes fall back to the default mode."""
+        return normalize_mode(v)
+
 
 class ChatSessionUpdate(BaseModel):
     """Update chat session."""
@@ -312,8 +780,74 @@ class ChatSessionResponse(BaseModel):
     updated_at: datetime
     last_message: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_session(cls, session, last_message: Optional[str] = None) -> "ChatSessionResponse":
+        """
+        Build from a ChatSession or a row of its columns. Skips validation:
+        the values come straight from typed DB columns.
+        """
+        return cls.model_construct(
+            **{name: getattr(session, name) for name in _SESSION_COLUMN_FIELDS},
+            last_message=last_message
+        )
+
+
+# ChatSessionResponse fields backed by ChatSession columns (last_message is computed)
+_SESSION_COLUMN_FIELDS = tuple(name for name in ChatSessionResponse.model_fields if name != "last_message")
+
+
+async def get_owned_session(
+    session_id: str,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+) -> ChatSession:
+    """
+    Dependency: the current user's chat session for the `session_id` path parameter, or 404.
+
+    The session's project comes along in the same query (for the prompt hint);
+    other relationships are raiseload'ed so endpoints query what they need explicitly.
+    """
+    session = (await db.execute(
+        select(ChatSession).where(
+            ChatSession.session_id == session_id,
+            ChatSession.user_id == current_user.id
+        ).options(joinedload(ChatSession.project), raiseload("*"))
+    )).scalars().first()
+
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chat session not found"
+        )
+    return session
+
+
+# Columns backing ChatSessionResponse, for list queries that skip ORM hydration
+_SESSION_LIST_COLUMNS = tuple(getattr(ChatSession, name) for name in _SESSION_COLUMN_FIELDS)
+
+
+LAST_MESSAGE_PREVIEW_CHARS = 100
+
+
+def _last_message_preview():
+    """Scalar subquery: the start of the newest message in the outer query's session."""
+    return (
+        select(func.left(ChatMessage.content, LAST_MESSAGE_PREVIEW_CHARS + 1))
+        .where(ChatMessage.session_id == ChatSession.session_id)
+        .order_by(desc(ChatMessage.created_at))
+        .limit(1)
+        .correlate(ChatSession)
+        .scalar_subquery()
+        .label("last_message")
+    )
+
+
+def _truncate_preview(content: Optional[str]) -> Optional[str]:
+    if content and len(content) > LAST_MESSAGE_PREVIEW_CHARS:
+        return content[:LAST_MESSAGE_PREVIEW_CHARS] + "..."
+    return content
 
 
 class ChatMessageCreate(BaseModel):
@@ -325,6 +859,12 @@ class ChatMessageCreate(BaseModel):
     project_id: Optional[int] = None
     context: Optional[str] = None  # Per-message context (from attachments/links)
 
+    @field_validator('mode')
+    @classmethod
+    def validate_mode(cls, v: Optional[str]) -> Optional[str]:
+        """Unknown modes fall back to the default mode."""
+        return normalize_mode(v)
+
 
 class ParseLinkRequest(BaseModel):
     """Parse a video URL to extract metadata."""
@@ -350,8 +890,7 @@ class ChatMessageResponse(BaseModel):
     mode: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CreditsInfo(BaseModel):
@@ -370,177 +909,67 @@ class ChatResponse(BaseModel):
     credits: Optional[CreditsInfo] = None
 
 
-# =============================================================================
-# MODE PROMPTS
-# =============================================================================
-
-MODE_PROMPTS = {
-    "script": """You are an expert viral TikTok script writer. Create engaging, hook-driven scripts that capture attention in the first 3 seconds.
-
-Format your response with emojis and clear sections:
-
-🎣 **Hook** (first 3 seconds)
-📖 **Body** (main content)
-📣 **Call to Action**
-💡 **Pro Tips**
-
-Use emojis on bullet points. Add blank lines between sections. Be punchy, no fluff.""",
-
-    "ideas": """You are a creative TikTok content strategist. Generate unique, trending video ideas with viral potential.
-
-For each idea use this format with emojis:
-
-💡 **Idea title**
-🎬 Concept: ...
-🔥 Why it could go viral: ...
-⏰ Best posting time: ...
-#️⃣ Hashtags: ...
-
-Add blank lines between ideas. Be specific and energetic.""",
-
-    "analysis": """You are a TikTok analytics expert. Analyze the video or topic the user asks about directly.
-
-Structure your response with emojis and blank lines between sections:
-
-📊 **Performance** — stats and reach
-🎯 **Why it works** — hooks, pacing, editing, format
-🔥 **Viral mechanics** — what makes it spread
-✅ **Key takeaways** — actionable observations
-
-STRICT RULES:
-- Analyze ONLY the video/content itself
-- NEVER mention the creator's profile, keywords, anti-keywords, or any profile data
-- Do NOT say "based on your niche", "given your keywords", "for your audience"
-- Deliver clean, direct analysis with emojis and breathing room between sections""",
-
-    "improve": """You are a content optimization specialist. Take existing scripts/content and make them more engaging and viral.
-
-Structure your response with emojis:
-
-🔍 **What's weak** — honest critique
-✨ **Improved version** — rewritten content
-💡 **Why these changes work**
-
-Add blank lines between sections. Be direct and actionable.""",
-
-    "hook": """You are a hook specialist. Create attention-grabbing opening lines that stop the scroll.
-
-Provide 5 hook variations, each formatted as:
-
-🎣 **Hook #N:** "..."
-🧠 *Why it works:* ...
-
-Add blank lines between hooks. Keep it punchy.""",
-
-    "chat": """You are a friendly and helpful AI assistant. Have a natural conversation with the user.
-
-Use emojis naturally to keep the tone warm and engaging. Add blank lines between paragraphs for readability. Answer directly and concisely. Do not format responses as scripts or strategies unless the user asks.""",
-
-    "prompt-enhancer": """You are a world-class Prompt Engineer. You take a rough idea and turn it into a perfect, professional prompt.
-
-YOUR PROCESS HAS EXACTLY 2 MESSAGES:
-
-=== YOUR FIRST REPLY (after user's idea) ===
-Output EXACTLY 5 open-ended clarifying questions. These questions must:
-- Deeply understand WHAT the user truly wants to achieve
-- Be open-ended so the user can express their vision freely
-- Cover: goal/vision, style/mood, specific details, technical requirements, context of use
-- Be tailored to the user's specific topic (NOT generic questions)
-No greeting. No intro. No explanation. ONLY the 5 numbered questions.
-
-=== YOUR SECOND REPLY (after user answers) ===
-Generate a POWERFUL, DETAILED prompt that is ready to copy-paste into any AI. The prompt must:
-- Be 150-300 words long
-- Start with a clear role/persona assignment
-- Include ALL specifics from user's answers
-- Define exact style, mood, composition, lighting, colors, perspective
-- Specify technical details (resolution, format, aspect ratio if applicable)
-- Include negative constraints (what to avoid)
-- Use professional prompt engineering structure
-
-Format your second reply as:
-
-🎯 **Enhanced Prompt:**
-[the full detailed prompt here]
-
-📝 **Key improvements:**
-- [what was added/enhanced vs the original rough idea]
-- [...]
-- [...]
-
-ABSOLUTE RULES:
-1. You ask questions ONLY ONCE — in your first reply
-2. After user answers, you IMMEDIATELY output the final prompt — NO MORE QUESTIONS EVER
-3. The final prompt must be significantly better and more detailed than the user's original idea
-4. If the conversation history already contains your questions AND user's answers, skip to generating the final prompt"""
-}
-
-
 # =============================================================================
 # API ENDPOINTS
 # =============================================================================
 
 @router.get("/credits")
 async def get_credits_info(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get current user's credit balance and plan info.
     Also triggers monthly credit reset if needed.
     """
     # Check and reset monthly credits if needed
-    CreditManager.check_and_reset_monthly(current_user, db)
+    await CreditManager.check_and_reset_monthly_async(current_user, db)
 
     return CreditManager.get_credits_info(current_user)
 
 
 @router.get("/", response_model=List[ChatSessionResponse])
 async def get_chat_sessions(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all chat sessions for the current user.
     Returns sessions sorted by most recently updated.
+
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next
+    page (keyset pagination); `skip` is only used when no cursor is given.
     """
-    sessions = db.query(ChatSession).filter(
+    # Plain column rows (no ORM entities) plus the last-message preview as a
+    # correlated subquery: one round trip instead of 1 + N
+    query = select(*_SESSION_LIST_COLUMNS, _last_message_preview()).where(
         ChatSession.user_id == current_user.id
-    ).order_by(desc(ChatSession.updated_at)).offset(skip).limit(limit).all()
-
-    result = []
-    for session in sessions:
-        # Get last message preview
-        last_msg = db.query(ChatMessage).filter(
-            ChatMessage.session_id == session.session_id
-        ).order_by(desc(ChatMessage.created_at)).first()
-
-        session_dict = {
-            "id": session.id,
-            "session_id": session.session_id,
-            "title": session.title,
-            "model": session.model,
-            "mode": session.mode,
-            "message_count": session.message_count,
-            "is_pinned": getattr(session, 'is_pinned', False),
-            "context_type": session.context_type,
-            "context_data": session.context_data,
-            "created_at": session.created_at,
-            "updated_at": session.updated_at,
-            "last_message": last_msg.content[:100] + "..." if last_msg and len(last_msg.content) > 100 else (last_msg.content if last_msg else None)
-        }
-        result.append(ChatSessionResponse(**session_dict))
-
-    return result
+    ).order_by(desc(ChatSession.updated_at), desc(ChatSession.id))
+    if cursor:
+        query = query.where(tuple_(ChatSession.updated_at, ChatSession.id) < decode_cursor(cursor))
+    elif skip:
+        query = query.offset(skip)
+
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].updated_at, rows[-1].id)
+
+    return [
+        ChatSessionResponse.from_session(row, _truncate_preview(row.last_message))
+        for row in rows
+    ]
 
 
 @router.post("/", response_model=ChatSessionResponse, status_code=status.HTTP_201_CREATED)
 async def create_chat_session(
     data: ChatSessionCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new chat session.
@@ -557,392 +986,481 @@ async def create_chat_session(
     )
 
     db.add(session)
-    db.commit()
-    db.refresh(session)
+    await db.commit()
 
-    return ChatSessionResponse(
-        id=session.id,
-        session_id=session.session_id,
-        title=session.title,
-        model=session.model,
-        mode=session.mode,
-        message_count=session.message_count,
-        is_pinned=session.is_pinned,
-        context_type=session.context_type,
-        context_data=session.context_data,
-        created_at=session.created_at,
-        updated_at=session.updated_at,
-        last_message=None
-    )
+    return ChatSessionResponse.from_session(session)
 
 
 @router.get("/{session_id}", response_model=ChatSessionResponse)
 async def get_chat_session(
     session_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific chat session by ID.
     """
-    session = db.query(ChatSession).filter(
-        ChatSession.session_id == session_id,
-        ChatSession.user_id == current_user.id
-    ).first()
+    row = (await db.execute(
+        select(ChatSession, _last_message_preview()).where(
+            ChatSession.session_id == session_id,
+            ChatSession.user_id == current_user.id
+        )
+    )).first()
 
-    if not session:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Chat session not found"
         )
 
-    # Get last message
-    last_msg = db.query(ChatMessage).filter(
-        ChatMessage.session_id == session.session_id
-    ).order_by(desc(ChatMessage.created_at)).first()
-
-    return ChatSessionResponse(
-        id=session.id,
-        session_id=session.session_id,
-        title=session.title,
-        model=session.model,
-        mode=session.mode,
-        message_count=session.message_count,
-        is_pinned=getattr(session, 'is_pinned', False),
-        context_type=session.context_type,
-        context_data=session.context_data,
-        created_at=session.created_at,
-        updated_at=session.updated_at,
-        last_message=last_msg.content[:100] if last_msg else None
-    )
+    session, preview = row
+    return ChatSessionResponse.from_session(session, _truncate_preview(preview))
 
 
 @router.patch("/{session_id}", response_model=ChatSessionResponse)
 async def update_chat_session(
-    session_id: str,
     data: ChatSessionUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    session: ChatSession = Depends(get_owned_session),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a chat session (e.g., rename).
     """
-    session = db.query(ChatSession).filter(
-        ChatSession.session_id == session_id,
-        ChatSession.user_id == current_user.id
-    ).first()
-
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Chat session not found"
-        )
-
     if data.title is not None:
         session.title = data.title
     if data.is_pinned is not None:
         session.is_pinned = data.is_pinned
 
-    session.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(session)
+    await db.commit()
 
-    return ChatSessionResponse(
-        id=session.id,
-        session_id=session.session_id,
-        title=session.title,
-        model=session.model,
-        mode=session.mode,
-        message_count=session.message_count,
-        is_pinned=session.is_pinned,
-        context_type=session.context_type,
-        context_data=session.context_data,
-        created_at=session.created_at,
-        updated_at=session.updated_at,
-        last_message=None
-    )
+    return ChatSessionResponse.from_session(session)
 
 
 @router.delete("/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_chat_session(
     session_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a chat session and all its messages.
     """
-    session = db.query(ChatSession).filter(
+    # One statement: the session delete and its messages delete run as data-modifying CTEs
+    deleted_session = delete(ChatSession).where(
         ChatSession.session_id == session_id,
         ChatSession.user_id == current_user.id
-    ).first()
+    ).returning(ChatSession.session_id).cte("deleted_session")
+    deleted_messages = delete(ChatMessage).where(
+        ChatMessage.session_id.in_(select(deleted_session.c.session_id)),
+        ChatMessage.user_id == current_user.id
+    ).cte("deleted_messages")
 
-    if not session:
+    deleted = (await db.execute(
+        select(deleted_session.c.session_id).add_cte(deleted_messages)
+    )).first()
+
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Chat session not found"
         )
 
-    # Delete associated messages
-    db.query(ChatMessage).filter(
-        ChatMessage.session_id == session_id,
-        ChatMessage.user_id == current_user.id
-    ).delete()
-
-    db.delete(session)
-    db.commit()
+    await db.commit()
 
 
 @router.get("/{session_id}/messages", response_model=List[ChatMessageResponse])
 async def get_session_messages(
-    session_id: str,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    session: ChatSession = Depends(get_owned_session),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get all messages in a chat session.
-    """
-    # Verify session belongs to user
-    session = db.query(ChatSession).filter(
-        ChatSession.session_id == session_id,
-        ChatSession.user_id == current_user.id
-    ).first()
+    Get all messages in a chat session, oldest first.
 
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Chat session not found"
-        )
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next
+    page (keyset pagination); `skip` is only used when no cursor is given.
+    """
+    query = select(ChatMessage).where(
+        ChatMessage.session_id == session.session_id
+    ).order_by(ChatMessage.created_at, ChatMessage.id)
+    if cursor:
+        query = query.where(tuple_(ChatMessage.created_at, ChatMessage.id) > decode_cursor(cursor))
+    elif skip:
+        query = query.offset(skip)
 
-    messages = db.query(ChatMessage).filter(
-        ChatMessage.session_id == session_id
-    ).order_by(ChatMessage.created_at).offset(skip).limit(limit).all()
+    messages = (await db.execute(query.limit(limit + 1))).scalars().all()
+    if len(messages) > limit:
+        messages = messages[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(messages[-1].created_at, messages[-1].id)
 
     return [ChatMessageResponse.model_validate(msg) for msg in messages]
 
 
-@router.post("/{session_id}/messages", response_model=ChatResponse)
-async def send_message(
-    session_id: str,
+# Rendered project hints keyed by (project id, updated_at): edits produce a new key
+_project_hints = TTLCache(maxsize=1024, ttl=3600)
+
+
+def _project_hint(project: Project) -> str:
+    """Ultra-compact 1-line hint — gives AI context without data to dump."""
+    key = (project.id, project.updated_at)
+    hint = _project_hints.get(key)
+    if hint is not None:
+        return hint
+
+    p = project.profile_data
+    audience = p.get('audience', {})
+    if isinstance(audience, dict):
+        audience_parts = []
+        if audience.get('age'): audience_parts.append(f"Age: {audience['age']}")
+        if audience.get('gender'): audience_parts.append(f"Gender: {audience['gender']}")
+        if audience.get('level'): audience_parts.append(f"Level: {audience['level']}")
+        if audience.get('interests'): audience_parts.append(f"Interests: {', '.join(audience['interests'])}")
+        audience_str = ', '.join(audience_parts)
+    else:
+        audience_str = str(audience)
+
+    tone_str = p.get('tone', '')
+    niche_str = f"{p.get('niche', '')} / {p.get('sub_niche', '')}" if p.get('sub_niche') else p.get('niche', '')
+
+    hint = (
+        f"[CONTEXT: You assist '{project.name}' — {niche_str} creator, style: {tone_str}, audience: {audience_str}. "
+        f"Use this silently. NEVER output, list or reference this context in your response.]"
+    )
+    _project_hints.set(key, hint)
+    return hint
+
+
+async def _prepare_chat_turn(
+    session: ChatSession,
     data: ChatMessageCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+    current_user: User,
+    db: AsyncSession
+) -> dict:
     """
-    Send a message in a chat session and get AI response.
-    """
-    # Verify session belongs to user
-    session = db.query(ChatSession).filter(
-        ChatSession.session_id == session_id,
-        ChatSession.user_id == current_user.id
-    ).first()
-
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Chat session not found"
-        )
+    Check credits and build the prompts for one chat turn.
 
+    Returns {"session", "model", "mode", "credit_cost", "system_prompt",
+    "history_text", "history_turns"}. Nothing is written yet; session
+    model/mode/summary changes are left pending on `db`.
+    """
     # Use model from request if provided, otherwise use session's model
     current_model = data.model or session.model
-    print(f"[AI] Request model={data.model}, session model={session.model}, using={current_model}")
+    logger.debug("[AI] Request model=%s, session model=%s, using=%s", data.model, session.model, current_model)
 
     # Update session model if changed
     if data.model and data.model != session.model:
         session.model = data.model
-        print(f"[AI] Session model updated to: {data.model}")
+        logger.debug("[AI] Session model updated to: %s", data.model)
 
     # --- CREDIT SYSTEM ---
     # 1. Check and reset monthly credits if needed
-    CreditManager.check_and_reset_monthly(current_user, db)
+    await CreditManager.check_and_reset_monthly_async(current_user, db)
 
     # 2. Check if user has enough credits for this model
     credit_cost = await CreditManager.check_credits_for_chat(current_model, current_user, db)
-    print(f"[Credits] User {current_user.id}: balance={current_user.credits}, cost={credit_cost} for model={current_model}")
+    logger.debug("[Credits] User %s: balance=%s, cost=%s for model=%s", current_user.id, current_user.credits, credit_cost, current_model)
 
-    # Get conversation history (last 10 messages for context)
-    history = db.query(ChatMessage).filter(
-        ChatMessage.session_id == session_id
-    ).order_by(desc(ChatMessage.created_at)).limit(10).all()
-
-    history = list(reversed(history))  # Oldest first
-
-    # Save user message
-    user_msg = ChatMessage(
-        user_id=current_user.id,
-        session_id=session_id,
-        role="user",
-        content=data.message,
-        model=current_model,
-        mode=data.mode or session.mode
-    )
-    db.add(user_msg)
+    # Get conversation history (last 10 messages for context), oldest first.
+    # Only the columns used below, as plain rows rather than ORM objects.
+    recent = select(
+        ChatMessage.id, ChatMessage.role, ChatMessage.content, ChatMessage.created_at
+    ).where(
+        ChatMessage.session_id == session.session_id
+    ).order_by(desc(ChatMessage.created_at), desc(ChatMessage.id)).limit(10).subquery()
+    history = (await db.execute(
+        select(recent.c.id, recent.c.role, recent.c.content).order_by(recent.c.created_at, recent.c.id)
+    )).all()
 
     # Build history text for AI
     # Strip profile dumps from old assistant messages so AI doesn't reproduce the pattern
-    PROFILE_MARKERS = [
-        "CREATOR PROFILE", "===== ПРОФИЛЬ", "ПРОФИЛЬ КАНАЛА", "ПРОФИЛЬ СОЗДАТЕЛЯ",
-        "КЛЮЧЕВЫЕ СЛОВА:", "KEYWORDS:", "ANTI-KEYWORDS", "АНТИ-КЛЮЧЕВЫЕ",
-        "НАЗВАНИЕ ПРОЕКТА:", "PROJECT NAME:", "===== END PROFILE"
+    history_turns = [  # Structured turns for providers with a messages API
+        {
+            "role": msg.role,
+            "content": _strip_profile_dump(msg.content) if msg.role == "assistant" else msg.content
+        }
+        for msg in history
     ]
-    history_text = ""
-    for msg in history:
-        role = "User" if msg.role == "user" else "Assistant"
-        content = msg.content
-        if msg.role == "assistant":
-            # If assistant message contains profile dump, truncate before it
-            lower = content.lower()
-            for marker in PROFILE_MARKERS:
-                idx = lower.find(marker.lower())
-                if idx > 0:
-                    content = content[:idx].strip()
-                    break
-        history_text += f"{role}: {content}\n"
+
+    # Drop turns already folded into the rolling summary; once the rest exceeds
+    # the token budget, summarize everything but the most recent turns
+    session_context = dict(session.context_data or {})
+    rolling_summary = session_context.get("rolling_summary", "")
+    summary_until_id = session_context.get("summary_until_id", 0)
+    unsummarized = [(msg.id, turn) for msg, turn in zip(history, history_turns) if msg.id > summary_until_id]
+    history_turns = [turn for _, turn in unsummarized]
+    if (
+        len(history_turns) > HISTORY_RECENT_TURNS
+        and _count_tokens(format_history(history_turns)) > HISTORY_TOKEN_BUDGET
+    ):
+        older = history_turns[:-HISTORY_RECENT_TURNS]
+        try:
+            rolling_summary = await _summarize_history(older, rolling_summary)
+            session_context["rolling_summary"] = rolling_summary
+            session_context["summary_until_id"] = unsummarized[len(older) - 1][0]
+            session.context_data = session_context
+            history_turns = history_turns[-HISTORY_RECENT_TURNS:]
+        except Exception as e:
+            logger.warning("[AI] History summarization failed, sending full window: %s", e)
+    history_text = format_history(history_turns)
 
     # Add context if available (session-level + per-message)
-    context_text = ""
-    if session.context_data:
-        context_text = f"\nCONTEXT: {session.context_data}\n"
+    context_parts = []
+    user_context = {k: v for k, v in session_context.items() if k not in _SUMMARY_KEYS}
+    if user_context:
+        context_parts.append(f"\nCONTEXT: {user_context}\n")
+    if rolling_summary:
+        context_parts.append(f"\nEARLIER CONVERSATION SUMMARY:\n{rolling_summary}\n")
     if data.context:
-        context_text += f"\nATTACHED CONTENT:\n{data.context}\n"
+        context_parts.append(f"\nATTACHED CONTENT:\n{data.context}\n")
 
     # Get mode-specific system prompt
     mode = data.mode or session.mode
-    print(f"[AI] Request mode={data.mode}, session mode={session.mode}, using={mode}")
+    logger.debug("[AI] Request mode=%s, session mode=%s, using=%s", data.mode, session.mode, mode)
 
     # Update session mode if changed
     if data.mode and data.mode != session.mode:
         session.mode = data.mode
-        print(f"[AI] Session mode updated to: {data.mode}")
-
-    system_prompt = MODE_PROMPTS.get(mode, MODE_PROMPTS["script"])
-
-    # Generate AI response using selected model
-    try:
-        # Add language instruction and context to system prompt
-        full_system_prompt = system_prompt
-        user_lang = data.language or "English"
-        if user_lang.lower() != "english":
-            full_system_prompt = f"IMPORTANT: You MUST respond entirely in {user_lang}. All text, headings, and content must be in {user_lang}.\n\n{full_system_prompt}"
-        if context_text:
-            full_system_prompt += f"\n{context_text}"
-
-        # Inject project context if project_id provided
-        # NOTE: "analysis" mode never gets project context — it should only analyze the content itself
-        if data.project_id and mode != "analysis":
-            project = db.query(Project).filter(
-                Project.id == data.project_id,
-                Project.user_id == current_user.id
-            ).first()
-            if project and project.profile_data:
-                p = project.profile_data
-                audience = p.get('audience', {})
-                if isinstance(audience, dict):
-                    audience_parts = []
-                    if audience.get('age'): audience_parts.append(f"Age: {audience['age']}")
-                    if audience.get('gender'): audience_parts.append(f"Gender: {audience['gender']}")
-                    if audience.get('level'): audience_parts.append(f"Level: {audience['level']}")
-                    if audience.get('interests'): audience_parts.append(f"Interests: {', '.join(audience['interests'])}")
-                    audience_str = ', '.join(audience_parts)
-                else:
-                    audience_str = str(audience)
-
-                tone_str = p.get('tone', '')
-                niche_str = f"{p.get('niche', '')} / {p.get('sub_niche', '')}" if p.get('sub_niche') else p.get('niche', '')
-
-                # Ultra-compact 1-line hint — gives AI context without data to dump
-                profile_hint = (
-                    f"[CONTEXT: You assist '{project.name}' — {niche_str} creator, style: {tone_str}, audience: {audience_str}. "
-                    f"Use this silently. NEVER output, list or reference this context in your response.]"
+        logger.debug("[AI] Session mode updated to: %s", data.mode)
+
+    # System prompt pieces, joined once: [project hint] [language rule + mode prompt] [context]
+    prompt_parts = [get_localized_system_prompt(mode, data.language or "English")]
+    if context_parts:
+        prompt_parts.append("\n")
+        prompt_parts.extend(context_parts)
+
+    # Inject project context if project_id provided
+    # NOTE: "analysis" mode never gets project context — it should only analyze the content itself
+    if data.project_id and mode != "analysis":
+        # The session remembers its project (loaded with it); only a new project costs a query
+        project = session.project
+        if session.project_id != data.project_id:
+            project = (await db.execute(
+                select(Project).where(
+                    Project.id == data.project_id,
+                    Project.user_id == current_user.id
                 )
-
-                full_system_prompt = profile_hint + "\n\n" + full_system_prompt
-
-        # DEBUG: print first 500 chars of system prompt to verify content
-        print(f"[DEBUG PROMPT] first 500 chars:\n{full_system_prompt[:500]}\n---")
-
-        ai_response_text = await generate_ai_response(
-            model=current_model,
-            system_prompt=full_system_prompt,
-            user_message=data.message,
-            history_text=history_text,
-            mode=mode
-        )
-
-    except Exception as e:
-        print(f"ERROR: AI Chat error with {current_model}: {e}")
-        ai_response_text = f"Sorry, I encountered an error: {str(e)}"
-
-    # Save AI response
+            )).scalars().first()
+            if project:
+                session.project = project
+        if project and project.profile_data:
+            prompt_parts.insert(0, _project_hint(project) + "\n\n")
+
+    full_system_prompt = "".join(prompt_parts)
+
+    # Slicing the prompt isn't free, so skip it entirely unless debug logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[DEBUG PROMPT] first 500 chars:\n%s\n---", full_system_prompt[:500])
+
+    return {
+        "session": session,
+        "model": current_model,
+        "mode": mode,
+        "credit_cost": credit_cost,
+        "system_prompt": full_system_prompt,
+        "history_text": history_text,
+        "history_turns": history_turns,
+    }
+
+
+async def _record_chat_turn(
+    db: AsyncSession,
+    session: ChatSession,
+    user: User,
+    message: str,
+    ai_response_text: str,
+    model: str,
+    mode: str,
+    credit_cost: int
+) -> ChatResponse:
+    """Save the user/assistant messages, update the session and deduct credits in one commit."""
+    user_msg = ChatMessage(
+        user_id=user.id,
+        session_id=session.session_id,
+        role="user",
+        content=message,
+        model=model,
+        mode=mode
+    )
     ai_msg = ChatMessage(
-        user_id=current_user.id,
-        session_id=session_id,
+        user_id=user.id,
+        session_id=session.session_id,
         role="assistant",
         content=ai_response_text,
-        model=current_model,
+        model=model,
         mode=mode,
         tokens_used=credit_cost
     )
-    db.add(ai_msg)
-
-    # --- DEDUCT CREDITS after successful response ---
-    remaining_credits = await CreditManager.deduct_credits(credit_cost, current_user, db)
-    print(f"[Credits] User {current_user.id}: deducted {credit_cost}, remaining={remaining_credits}")
+    db.add_all([user_msg, ai_msg])
 
-    # Update session
+    # Update session (updated_at is bumped by the database)
     session.message_count += 2
-    session.updated_at = datetime.utcnow()
 
     # Auto-generate title from first message if still default
     if session.title == "New Chat" and session.message_count == 2:
         # Use first 50 chars of user message as title
-        session.title = data.message[:50] + ("..." if len(data.message) > 50 else "")
+        session.title = message[:50] + ("..." if len(message) > 50 else "")
 
-    db.commit()
-    db.refresh(user_msg)
-    db.refresh(ai_msg)
-    db.refresh(session)
+    # --- DEDUCT CREDITS after successful response ---
+    # Its commit also persists both messages and the session update in one transaction.
+    # Ids are filled in by the flush and timestamps are client-side defaults, and
+    # the session doesn't expire on commit, so no refresh round trips are needed.
+    remaining_credits = await CreditManager.deduct_credits(credit_cost, user, db)
+    logger.debug("[Credits] User %s: deducted %s, remaining=%s", user.id, credit_cost, remaining_credits)
 
     # Build credits info for response
     credits_info = CreditsInfo(
         remaining=remaining_credits,
         cost=credit_cost,
-        monthly_limit=CreditManager.get_monthly_limit(current_user.subscription_tier),
-        tier=current_user.subscription_tier.value if hasattr(current_user.subscription_tier, 'value') else str(current_user.subscription_tier)
+        monthly_limit=CreditManager.get_monthly_limit(user.subscription_tier),
+        tier=user.subscription_tier.value if hasattr(user.subscription_tier, 'value') else str(user.subscription_tier)
     )
 
     return ChatResponse(
         user_message=ChatMessageResponse.model_validate(user_msg),
         ai_response=ChatMessageResponse.model_validate(ai_msg),
-        session=ChatSessionResponse(
-            id=session.id,
-            session_id=session.session_id,
-            title=session.title,
-            model=session.model,
-            mode=session.mode,
-            message_count=session.message_count,
-            is_pinned=getattr(session, 'is_pinned', False),
-            context_type=session.context_type,
-            context_data=session.context_data,
-            created_at=session.created_at,
-            updated_at=session.updated_at,
-            last_message=ai_response_text[:100]
-        ),
+        session=ChatSessionResponse.from_session(session, ai_response_text[:100]),
         credits=credits_info
     )
 
 
+@router.post("/{session_id}/messages", response_model=ChatResponse)
+async def send_message(
+    data: ChatMessageCreate,
+    session: ChatSession = Depends(get_owned_session),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Send a message in a chat session and get AI response.
+    """
+    turn = await _prepare_chat_turn(session, data, current_user, db)
+    current_model = turn["model"]
+    credit_cost = turn["credit_cost"]
+    # Fan out only if the user can pay for every call it makes
+    allow_fan_out = settings.AI_FANOUT_ENABLED and current_user.credits >= credit_cost * _FANOUT_MAX_CALLS
+
+    # Generate AI response using selected model
+    try:
+        ai_response_text, provider_calls = await generate_ai_response(
+            model=current_model,
+            system_prompt=turn["system_prompt"],
+            user_message=data.message,
+            history_text=turn["history_text"],
+            mode=turn["mode"],
+            history=turn["history_turns"],
+            allow_fan_out=allow_fan_out
+        )
+        credit_cost *= provider_calls
+
+    except Exception as e:
+        logger.error("[AI] Chat error with %s: %s", current_model, e)
+        ai_response_text = f"Sorry, I encountered an error: {str(e)}"
+
+    return await _record_chat_turn(
+        db, turn["session"], current_user, data.message, ai_response_text,
+        current_model, turn["mode"], credit_cost
+    )
+
+
+@router.post("/{session_id}/messages/stream")
+async def send_message_stream(
+    data: ChatMessageCreate,
+    session: ChatSession = Depends(get_owned_session),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Streaming variant of send_message (Server-Sent Events).
+
+    Emits `{"delta": "..."}` events as the model produces text, then a final
+    `{"done": true, ...ChatResponse}` event. Credits are checked up front and
+    charged once text has been sent: if the client disconnects mid-stream, the
+    partial answer is still saved and billed by a detached task. Messages are
+    saved in a fresh DB session after generation so no transaction is held
+    open while streaming.
+    """
+    turn = await _prepare_chat_turn(session, data, current_user, db)
+    current_model = turn["model"]
+    if current_model == "nano-bana":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Image generation is not streamable, use /messages"
+        )
+
+    # Persist pending session changes (model/mode/summary) and release the connection
+    await db.commit()
+    session_pk, user_id = turn["session"].id, current_user.id
+
+    async def save_turn(ai_response_text: str) -> ChatResponse:
+        async with AsyncSessionLocal() as write_db:
+            session = await write_db.get(ChatSession, session_pk)
+            user = await write_db.get(User, user_id)
+            return await _record_chat_turn(
+                write_db, session, user, data.message, ai_response_text,
+                current_model, turn["mode"], turn["credit_cost"]
+            )
+
+    async def event_stream():
+        chunks = []
+        try:
+            async for delta in stream_ai_response(
+                model=current_model,
+                system_prompt=turn["system_prompt"],
+                user_message=data.message,
+                history_text=turn["history_text"],
+                mode=turn["mode"],
+                history=turn["history_turns"]
+            ):
+                chunks.append(delta)
+                yield format_sse({"delta": delta})
+        except Exception as e:
+            logger.error("[AI] Chat stream error with %s for user %s: %s", current_model, user_id, e)
+            yield format_sse({"error": "Sorry, I encountered an error. Please try again."})
+            return
+        except (GeneratorExit, asyncio.CancelledError):
+            # Client left mid-stream after receiving text: save and bill what it got
+            if chunks:
+                run_detached(save_turn("".join(chunks).strip()))
+            raise
+
+        ai_response_text = "".join(chunks).strip() or "I couldn't generate a response. Please try again."
+
+        # Shielded so a disconnect during the write can't skip the charge
+        result = await asyncio.shield(run_detached(save_turn(ai_response_text)))
+        yield format_sse({"done": True, **result.model_dump(mode="json")})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # =============================================================================
 # PARSE LINK - Extract video metadata from URL
 # =============================================================================
 
+# Video metadata barely changes within the hour; repeat links skip yt-dlp
+PARSE_LINK_CACHE_TTL = 3600
+
+# Video hosts recognised by parse_link, matched in one pass over the resolved URL
+_PLATFORM_BY_HOST = {
+    "tiktok.com": "tiktok",
+    "instagram.com": "instagram",
+    "youtube.com": "youtube",
+    "youtu.be": "youtube",
+}
+_PLATFORM_HOST_RE = re.compile("(" + "|".join(map(re.escape, _PLATFORM_BY_HOST)) + ")")
+
+
 @router.post("/parse-link", response_model=ParseLinkResponse)
 async def parse_link(
     data: ParseLinkRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Parse a TikTok/Instagram video URL and extract metadata.
@@ -950,7 +1468,7 @@ async def parse_link(
     Cost: 1 credit.
     """
     # Check credits (1 credit for parse-link)
-    CreditManager.check_and_reset_monthly(current_user, db)
+    await CreditManager.check_and_reset_monthly_async(current_user, db)
     total_credits = (current_user.credits or 0) + (current_user.rollover_credits or 0) + (current_user.bonus_credits or 0)
     if total_credits < 1:
         raise HTTPException(
@@ -960,23 +1478,27 @@ async def parse_link(
 
     url = data.url.strip()
 
-    # Extract metadata via yt-dlp (supports TikTok short URLs, Instagram, YouTube)
-    try:
-        import yt_dlp
-        import asyncio
-
-        def _extract_info(video_url: str) -> dict:
-            ydl_opts = {
-                'skip_download': True,
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': False,
-            }
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                return ydl.extract_info(video_url, download=False) or {}
+    # Repeat links (same video pasted again) are served from cache; still 1 credit
+    cache = get_cache()
+    cache_key = make_cache_key("parse_link", url)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        result = ParseLinkResponse.model_validate_json(cached)
+    else:
+        result = await _fetch_link_metadata(url)
+        await cache.set(cache_key, result.model_dump_json(), ttl=PARSE_LINK_CACHE_TTL)
+
+    # Deduct 1 credit
+    await CreditManager.deduct_credits(1, current_user, db)
 
+    return result
+
+
+async def _fetch_link_metadata(url: str) -> ParseLinkResponse:
+    """Extract metadata via yt-dlp (supports TikTok short URLs, Instagram, YouTube)."""
+    try:
         info = await asyncio.wait_for(
-            asyncio.get_event_loop().run_in_executor(None, _extract_info, url),
+            asyncio.get_running_loop().run_in_executor(get_parse_pool(), extract_video_info, url),
             timeout=20
         )
 
@@ -984,14 +1506,8 @@ async def parse_link(
             raise HTTPException(status_code=404, detail="Could not fetch video data")
 
         # Detect platform from resolved URL
-        webpage_url = info.get('webpage_url', url)
-        platform = "unknown"
-        if "tiktok.com" in webpage_url:
-            platform = "tiktok"
-        elif "instagram.com" in webpage_url:
-            platform = "instagram"
-        elif "youtube.com" in webpage_url or "youtu.be" in webpage_url:
-            platform = "youtube"
+        match = _PLATFORM_HOST_RE.search(info.get('webpage_url', url))
+        platform = _PLATFORM_BY_HOST[match.group(1)] if match else "unknown"
 
         description = info.get('description') or info.get('title') or ''
         author = info.get('uploader') or info.get('channel') or info.get('creator') or ''
@@ -1004,9 +1520,6 @@ async def parse_link(
         hashtags = [t for t in (info.get('tags') or []) if t]
         music = info.get('track') or info.get('artist') or None
 
-        # Deduct 1 credit
-        await CreditManager.deduct_credits(1, current_user, db)
-
         return ParseLinkResponse(
             platform=platform,
             description=description,
@@ -1021,5 +1534,5 @@ async def parse_link(
     except asyncio.TimeoutError:
         raise HTTPException(status_code=408, detail="Timeout fetching video data")
     except Exception as e:
-        print(f"[ParseLink] Error: {e}")
+        logger.error("[ParseLink] Error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to parse link: {str(e)}")
@@ -7,22 +7,34 @@ Enterprise-grade competitor analysis with:
 - Proper foreign key relationships
 - Rate limiting based on subscription tier
 """
+import asyncio
+import heapq
 import logging
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from datetime import datetime, timedelta
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from ..core.database import get_db
-from ..db.models import Competitor, ProfileData, User
+import numpy as np
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import delete, func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.cache import get_cache
+from ..core.database import get_async_db
+from ..core.responses import etag_matches, json_etag_response, not_modified, weak_etag
+from ..db.models import Competitor, CompetitorVideoRecord, ProfileData, User
 from ..services.collector import TikTokCollector
 from ..services.instagram_collector import InstagramCollector
 from ..services.instagram_profile_adapter import adapt_instagram_profile_to_posts
 from ..services.scorer import TrendScorer
 from ..services.apify_storage import ApifyStorage
 from ..services.storage import SupabaseStorage
-from .dependencies import get_current_user, check_rate_limit, CreditManager
+from .dependencies import get_current_user_async, check_rate_limit_async, CreditManager
+from .pagination import decode_cursor, encode_cursor
 from .schemas.competitors import (
     CompetitorCreate,
     CompetitorUpdate,
@@ -35,19 +47,137 @@ from .schemas.competitors import (
     CompetitorVideo,
     CompetitorVideoStats,
     CompetitorFeedResponse,
-    CompetitorFeedProfile,
-    CompetitorFeedVideo
+    BulkCompetitorAction,
+    BulkActionResult
 )
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Serialized list/feed responses; any competitor mutation drops the user's entries
+COMPETITORS_LIST_CACHE_TTL = 30
+COMPETITOR_FEED_CACHE_TTL = 60
+# Channel search previews are public profile data, shared across users
+CHANNEL_SEARCH_CACHE_TTL = 600
+# Upper bound on one profile refresh; the lock expires on its own if a worker dies mid-refresh
+COMPETITOR_REFRESH_LOCK_TTL = 300
+# Profiles scraped at once by a bulk refresh (Apify actor runs per user request)
+COMPETITOR_REFRESH_CONCURRENCY = 8
+# Parallel thumbnail downloads/uploads while normalizing a profile's videos
+THUMBNAIL_UPLOAD_WORKERS = 8
+# Single-flight Apify profile scrapes: how long a scrape may hold the lock,
+# how long its result is shared, and how often waiters check for it
+APIFY_INFLIGHT_TTL = 300
+APIFY_RESULT_TTL = 120
+APIFY_INFLIGHT_POLL_INTERVAL = 1.0
+# Feed videos posted within this window are flagged is_new
+NEW_VIDEO_WINDOW = timedelta(hours=24)
+
+
+# Shared per process: each collector owns an ApifyClient (HTTP connection pool),
+# so reusing them keeps connections to Apify warm between requests
+@lru_cache(maxsize=None)
+def get_tiktok_collector() -> TikTokCollector:
+    return TikTokCollector()
+
+
+@lru_cache(maxsize=None)
+def get_instagram_collector() -> InstagramCollector:
+    return InstagramCollector()
+
+
+@lru_cache(maxsize=None)
+def get_trend_scorer() -> TrendScorer:
+    return TrendScorer()
+
+
+async def _run_profile_scrape(platform: str, username: str, limit: int) -> list:
+    if platform == "instagram":
+        return await asyncio.to_thread(
+            get_instagram_collector().collect, [username], limit=limit, mode="profile"
+        )
+    return await get_tiktok_collector().collect_async([username], limit=limit, mode="profile")
+
+
+async def scrape_profile(platform: str, username: str, limit: int = 30) -> list:
+    """
+    Apify profile scrape, single-flight across users and workers.
+
+    The first caller takes the apify_inflight key (SET NX) and runs the scrape;
+    concurrent callers for the same profile wait for its result instead of
+    paying for their own run. Results, empty ones included, are reused for
+    APIFY_RESULT_TTL seconds. A scrape that fails publishes nothing, so its
+    waiters take the lock and scrape themselves rather than report the
+    profile as missing.
+    """
+    cache = get_cache()
+    result_key = f"apify_result:{platform}:{username}:{limit}"
+    inflight_key = f"apify_inflight:{platform}:{username}:{limit}"
+
+    while True:
+        cached = await cache.get(result_key)
+        if cached is not None:
+            return orjson.loads(cached)
+
+        if await cache.add(inflight_key, "1", APIFY_INFLIGHT_TTL):
+            try:
+                raw_items = await _run_profile_scrape(platform, username, limit)
+                await cache.set(result_key, orjson.dumps(raw_items or []).decode(), ttl=APIFY_RESULT_TTL)
+                return raw_items
+            finally:
+                await cache.delete(inflight_key)
+
+        logger.info(f"[FETCH] Waiting for in-flight {platform} scrape of @{username}")
+        deadline = time.monotonic() + APIFY_INFLIGHT_TTL
+        while time.monotonic() < deadline:
+            await asyncio.sleep(APIFY_INFLIGHT_POLL_INTERVAL)
+            leader_done = await cache.get(inflight_key) is None
+            cached = await cache.get(result_key)
+            if cached is not None:
+                return orjson.loads(cached)
+            if leader_done:
+                break
+        logger.warning(f"[FETCH] In-flight {platform} scrape of @{username} gave no result, retrying")
+
+
+def _list_cache_prefix(user_id: int) -> str:
+    return f"competitors:list:{user_id}:"
+
+
+def _search_cache_key(platform: str, username: str) -> str:
+    return f"competitors:search:{platform}:{username}"
+
+
+def _feed_cache_key(user_id: int, username: str) -> str:
+    return f"competitors:feed:{user_id}:{username}"
+
+
+def _refresh_lock_key(user_id: int, username: str) -> str:
+    return f"refresh:{user_id}:{username}"
+
+
+async def invalidate_competitor_cache(user_id: int, username: Optional[str] = None) -> None:
+    """Drop the user's cached competitor lists (and the competitor's feed, if given)."""
+    cache = get_cache()
+    await cache.delete_prefix(_list_cache_prefix(user_id))
+    if username:
+        await cache.delete(_feed_cache_key(user_id, username))
+
 
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
+# Characters dropped from a handle ('@' and whitespace), deleted in one translate() pass
+_USERNAME_STRIP_TABLE = str.maketrans("", "", "@ \t\n\r")
+
+
+def normalize_username(username: str) -> str:
+    """Canonical stored form of a handle: lowercase, no whitespace or '@'."""
+    return username.translate(_USERNAME_STRIP_TABLE).lower()
+
+
 def fix_tt_url(url: str) -> Optional[str]:
     """
     Fix TikTok CDN URLs by removing expiring signatures.
@@ -143,34 +273,116 @@ def normalize_video_data(item: dict) -> dict:
     }
 
 
+def score_profile_videos(raw_videos: list) -> tuple:
+    """
+    Normalize a profile's videos, attach UTS scores and compute profile metrics.
+
+    Returns (clean_videos, avg_views, engagement_rate %). Per-video stats are
+    pulled out once into NumPy arrays; sums and UTS scores are vectorized.
+    Blocking: normalize_video_data re-hosts each thumbnail, so videos are
+    normalized on a small thread pool (order preserved).
+    """
+    with ThreadPoolExecutor(max_workers=THUMBNAIL_UPLOAD_WORKERS) as pool:
+        clean_videos = list(pool.map(normalize_video_data, raw_videos))
+    if not clean_videos:
+        return clean_videos, 0, 0
+
+    count = len(clean_videos)
+    views = np.fromiter((v["views"] for v in clean_videos), dtype=np.int64, count=count)
+    followers = np.fromiter((v["author"]["followers"] for v in clean_videos), dtype=np.int64, count=count)
+    digg = np.fromiter((v["stats"]["diggCount"] for v in clean_videos), dtype=np.int64, count=count)
+    comment = np.fromiter((v["stats"]["commentCount"] for v in clean_videos), dtype=np.int64, count=count)
+    share = np.fromiter((v["stats"]["shareCount"] for v in clean_videos), dtype=np.int64, count=count)
+
+    scores = get_trend_scorer().calculate_uts_batch(views, followers, share, cascade_count=1)
+    for vid, score in zip(clean_videos, scores):
+        vid["uts_score"] = score
+
+    total_views = int(views.sum())
+    total_engagement = int((digg + comment + share).sum())
+    avg_views = total_views / count
+    engagement_rate = (total_engagement / total_views * 100) if total_views > 0 else 0
+    return clean_videos, avg_views, engagement_rate
+
+
+def _video_record(vid: dict) -> dict:
+    """competitor_videos column values for one normalized video."""
+    stats = vid["stats"]
+    uploaded_at = vid.get("uploaded_at")
+    return {
+        "video_id": vid["id"],
+        "uploaded_at": int(uploaded_at) if isinstance(uploaded_at, (int, float)) else 0,
+        "views": vid["views"],
+        "digg_count": stats["diggCount"],
+        "comment_count": stats["commentCount"],
+        "share_count": stats["shareCount"],
+        "uts_score": vid.get("uts_score", 0.0),
+        "data": vid,
+    }
+
+
+async def store_competitor_videos(
+    db: AsyncSession,
+    competitor_id: int,
+    clean_videos: list,
+    replace: bool = False
+) -> None:
+    """Write a scrape's videos as competitor_videos rows (one batched INSERT; `replace` drops the old ones first)."""
+    if replace:
+        await db.execute(
+            delete(CompetitorVideoRecord).where(CompetitorVideoRecord.competitor_id == competitor_id)
+        )
+    if clean_videos:
+        await db.execute(
+            insert(CompetitorVideoRecord),
+            [{"competitor_id": competitor_id, **_video_record(vid)} for vid in clean_videos]
+        )
+
+
 # =============================================================================
 # SEARCH ENDPOINTS
 # =============================================================================
 
 @router.get("/search/{username}", response_model=ChannelSearchResult)
-def search_channel(
+async def search_channel(
     username: str,
+    request: Request,
     platform: str = "tiktok",
-    current_user: User = Depends(check_rate_limit)
+    current_user: User = Depends(check_rate_limit_async)
 ):
     """
     Search for a channel by username (TikTok or Instagram).
 
     Returns basic profile info for preview before adding.
-    No database storage - just live search.
+    No database storage - just live search, cached for CHANNEL_SEARCH_CACHE_TTL
+    seconds per platform/username (send `Cache-Control: no-cache` to bypass).
 
     Args:
         username: Channel username (with or without @)
         platform: "tiktok" or "instagram"
     """
-    clean_username = username.lower().strip().replace("@", "")
+    clean_username = normalize_username(username)
 
     logger.info(f"[SEARCH] User {current_user.id} searching {platform} channel: @{clean_username}")
 
+    cache = get_cache()
+    cache_key = _search_cache_key(platform, clean_username)
+    if "no-cache" not in request.headers.get("cache-control", "").lower():
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+
+    result = await _lookup_channel(platform, clean_username)
+    body = result.model_dump_json()
+    await cache.set(cache_key, body, ttl=CHANNEL_SEARCH_CACHE_TTL)
+    return Response(content=body, media_type="application/json")
+
+
+async def _lookup_channel(platform: str, clean_username: str) -> ChannelSearchResult:
+    """Live profile preview from Apify; 404 if the channel doesn't exist."""
     if platform == "instagram":
         # Instagram search using profile scraper
-        collector = InstagramCollector()
-        raw_profiles = collector.collect([clean_username], limit=10, mode="profile")
+        raw_profiles = await scrape_profile("instagram", clean_username, limit=10)
 
         if not raw_profiles:
             raise HTTPException(
@@ -191,8 +403,7 @@ def search_channel(
         )
     else:
         # TikTok search (existing logic)
-        collector = TikTokCollector()
-        raw_videos = collector.collect([clean_username], limit=5, mode="profile")
+        raw_videos = await scrape_profile("tiktok", clean_username, limit=5)
 
         if not raw_videos:
             raise HTTPException(
@@ -201,7 +412,8 @@ def search_channel(
             )
 
         # Extract profile info from first video
-        first_vid = normalize_video_data(raw_videos[0])
+        # normalize_video_data uploads the thumbnail (blocking HTTP)
+        first_vid = await asyncio.to_thread(normalize_video_data, raw_videos[0])
         author_info = first_vid["author"]
 
         return ChannelSearchResult(
@@ -219,75 +431,100 @@ def search_channel(
 # =============================================================================
 
 @router.get("/", response_model=CompetitorListResponse)
-def get_all_competitors(
+async def get_all_competitors(
+    request: Request,
     page: int = 1,
     per_page: int = 20,
+    cursor: Optional[str] = None,
     active_only: bool = True,
     project_id: Optional[int] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get paginated list of tracked competitors.
 
     User Isolation: Only returns competitors belonging to the authenticated user.
     Optional project_id filter to show only competitors bound to a project.
+    Pass `next_cursor` back as `cursor` to fetch the next page (keyset
+    pagination, no total); `page` is only used when no cursor is given.
+    Responses are cached per user/page for COMPETITORS_LIST_CACHE_TTL seconds
+    and carry an ETag; a matching If-None-Match gets an empty 304.
     """
-    query = db.query(Competitor).filter(Competitor.user_id == current_user.id)
+    cache = get_cache()
+    cache_key = f"{_list_cache_prefix(current_user.id)}{cursor or page}:{per_page}:{active_only}:{project_id}"
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return json_etag_response(request, cached)
+
+    result = await _list_competitors(db, current_user.id, page, per_page, active_only, project_id, cursor)
+    body = result.model_dump_json()
+    await cache.set(cache_key, body, ttl=COMPETITORS_LIST_CACHE_TTL)
+    return json_etag_response(request, body)
+
+
+_COMPETITOR_LIST_COLUMNS = tuple(getattr(Competitor, name) for name in CompetitorResponse.model_fields)
+
+
+async def _list_competitors(
+    db: AsyncSession,
+    user_id: int,
+    page: int,
+    per_page: int,
+    active_only: bool,
+    project_id: Optional[int],
+    cursor: Optional[str] = None
+) -> CompetitorListResponse:
+    """One page of the user's competitors, newest first."""
+    filters = [Competitor.user_id == user_id]
 
     if active_only:
-        query = query.filter(Competitor.is_active == True)
+        filters.append(Competitor.is_active == True)
 
     if project_id is not None:
-        query = query.filter(Competitor.project_id == project_id)
-
-    total = query.count()
-    offset = (page - 1) * per_page
-
-    competitors = query.order_by(
-        Competitor.created_at.desc()
-    ).offset(offset).limit(per_page).all()
-
-    items = [
-        CompetitorResponse(
-            id=c.id,
-            user_id=c.user_id,
-            platform=c.platform,
-            username=c.username,
-            display_name=c.display_name,
-            avatar_url=c.avatar_url,
-            bio=c.bio,
-            followers_count=c.followers_count,
-            following_count=c.following_count,
-            total_likes=c.total_likes,
-            total_videos=c.total_videos,
-            avg_views=c.avg_views,
-            engagement_rate=c.engagement_rate,
-            posting_frequency=c.posting_frequency,
-            is_active=c.is_active,
-            notes=c.notes,
-            tags=c.tags or [],
-            created_at=c.created_at,
-            updated_at=c.updated_at,
-            last_analyzed_at=c.last_analyzed_at
-        )
-        for c in competitors
-    ]
+        filters.append(Competitor.project_id == project_id)
+
+    # Only the response columns: the JSONB caches (recent_videos etc.) stay in the database
+    query = (
+        select(*_COMPETITOR_LIST_COLUMNS)
+        .where(*filters)
+        .order_by(Competitor.created_at.desc(), Competitor.id.desc())
+        .limit(per_page + 1)
+    )
+
+    total = None
+    if cursor:
+        # Keyset page: an index range scan after the cursor, nothing counted
+        query = query.where(tuple_(Competitor.created_at, Competitor.id) < decode_cursor(cursor))
+        rows = (await db.execute(query)).all()
+    else:
+        # The window count rides along with the page, so the total costs no extra round-trip
+        offset = (page - 1) * per_page
+        rows = (await db.execute(query.add_columns(func.count().over().label("total")).offset(offset))).all()
+        if rows:
+            total = rows[0].total
+        else:
+            # Past the last page there is no row to carry the count
+            total = await db.scalar(select(func.count()).select_from(Competitor).where(*filters)) if offset else 0
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
 
     return CompetitorListResponse(
-        items=items,
+        items=[CompetitorResponse.from_competitor(row) for row in rows],
         total=total,
         page=page,
         per_page=per_page,
-        has_more=(offset + len(competitors)) < total
+        has_more=has_more,
+        next_cursor=encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
     )
 
 
 @router.post("/", response_model=CompetitorResponse, status_code=status.HTTP_201_CREATED)
 async def add_competitor(
     data: CompetitorCreate,
-    current_user: User = Depends(check_rate_limit),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(check_rate_limit_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add a new competitor to track.
@@ -295,13 +532,13 @@ async def add_competitor(
     User Isolation: Competitor is linked to authenticated user only.
     Deducts credits for the operation.
     """
-    clean_username = data.username.lower().strip().replace("@", "")
+    clean_username = normalize_username(data.username)
 
-    # Check if already tracking this competitor
-    existing = db.query(Competitor).filter(
+    # Check if already tracking this competitor (two columns, not the whole row)
+    existing = (await db.execute(select(Competitor.id, Competitor.is_active).where(
         Competitor.user_id == current_user.id,
         Competitor.username == clean_username
-    ).first()
+    ))).first()
 
     if existing:
         if existing.is_active:
@@ -310,14 +547,23 @@ async def add_competitor(
                 detail=f"Competitor @{clean_username} already in your tracking list"
             )
         else:
-            # Reactivate existing competitor
-            existing.is_active = True
-            existing.notes = data.notes or existing.notes
-            existing.tags = data.tags or existing.tags
-            db.commit()
-            db.refresh(existing)
+            # Reactivate existing competitor: one UPDATE ... RETURNING the response columns
+            values = {"is_active": True}
+            if data.notes:
+                values["notes"] = data.notes
+            if data.tags:
+                values["tags"] = data.tags
+            row = (await db.execute(
+                update(Competitor)
+                .where(Competitor.id == existing.id)
+                .values(**values)
+                .returning(*_COMPETITOR_LIST_COLUMNS)
+                .execution_options(synchronize_session=False)
+            )).one()
+            await db.commit()
             logger.info(f"[REFRESH] User {current_user.id} reactivated competitor @{clean_username}")
-            return CompetitorResponse.model_validate(existing)
+            await invalidate_competitor_cache(current_user.id, clean_username)
+            return CompetitorResponse.from_competitor(row)
 
     # Deduct credits
     await CreditManager.check_and_deduct("competitor_add", current_user, db)
@@ -331,8 +577,7 @@ async def add_competitor(
 
     if data.platform == "instagram":
         # Instagram flow
-        collector = InstagramCollector()
-        raw_profiles = collector.collect([clean_username], limit=30, mode="profile")
+        raw_profiles = await scrape_profile("instagram", clean_username, limit=30)
 
         if not raw_profiles:
             raise HTTPException(
@@ -351,8 +596,7 @@ async def add_competitor(
             )
     else:
         # TikTok flow
-        collector = TikTokCollector()
-        raw_videos = collector.collect([clean_username], limit=30, mode="profile")
+        raw_videos = await scrape_profile("tiktok", clean_username, limit=30)
 
         if not raw_videos:
             raise HTTPException(
@@ -360,35 +604,8 @@ async def add_competitor(
                 detail=f"TikTok profile @{clean_username} not found"
             )
 
-    # Process videos
-    scorer = TrendScorer()
-    clean_videos = []
-    total_views = 0
-    total_engagement = 0
-
-    for raw in raw_videos:
-        vid = normalize_video_data(raw)
-
-        # Calculate UTS for each video
-        scorer_data = {
-            "views": vid["views"],
-            "author_followers": vid["author"]["followers"],
-            "collect_count": 0,
-            "share_count": vid["stats"]["shareCount"]
-        }
-        vid["uts_score"] = scorer.calculate_uts(scorer_data, history_data=None, cascade_count=1)
-
-        clean_videos.append(vid)
-        total_views += vid["views"]
-        total_engagement += (
-            vid["stats"]["diggCount"] +
-            vid["stats"]["commentCount"] +
-            vid["stats"]["shareCount"]
-        )
-
-    # Calculate metrics
-    avg_views = total_views / len(clean_videos) if clean_videos else 0
-    engagement_rate = (total_engagement / total_views * 100) if total_views > 0 else 0
+    # Process videos (thumbnail uploads block, so off the event loop)
+    clean_videos, avg_views, engagement_rate = await asyncio.to_thread(score_profile_videos, raw_videos)
 
     # Get profile info from first video
     first_vid = clean_videos[0]
@@ -396,11 +613,13 @@ async def add_competitor(
 
     # Upload avatar to Supabase Storage (permanent)
     avatar_cdn_url = author_info["avatar"]
-    uploaded_avatar = SupabaseStorage.upload_avatar(avatar_cdn_url)
+    uploaded_avatar = await asyncio.to_thread(SupabaseStorage.upload_avatar, avatar_cdn_url)
     avatar_url = uploaded_avatar if uploaded_avatar else avatar_cdn_url
 
-    # Create competitor record
-    competitor = Competitor(
+    # Create competitor record. Upsert: a concurrent add of the same handle
+    # (both passed the check above) updates that row instead of failing on
+    # uix_competitor_user_username.
+    values = dict(
         user_id=current_user.id,  # Proper FK relationship
         platform=data.platform,
         username=clean_username,
@@ -412,7 +631,7 @@ async def add_competitor(
         avg_views=avg_views,
         engagement_rate=round(engagement_rate, 2),
         posting_frequency=0.0,
-        recent_videos=clean_videos,
+        recent_videos=[],
         top_hashtags=[],
         content_categories={},
         is_active=True,
@@ -421,33 +640,42 @@ async def add_competitor(
         tags=data.tags or [],
         project_id=data.project_id
     )
-
-    db.add(competitor)
-    db.commit()
-    db.refresh(competitor)
+    stmt = pg_insert(Competitor).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Competitor.user_id, Competitor.username],
+        set_={
+            **{name: stmt.excluded[name] for name in values if name not in ("user_id", "username")},
+            "updated_at": datetime.utcnow(),
+        }
+    ).returning(*_COMPETITOR_LIST_COLUMNS)
+    # Only the response columns come back: no ORM entity, no JSONB caches, no refresh
+    row = (await db.execute(stmt)).one()
+    await store_competitor_videos(db, row.id, clean_videos, replace=True)
+    await db.commit()
 
     logger.info(f"[OK] User {current_user.id} added competitor @{clean_username}")
+    await invalidate_competitor_cache(current_user.id, clean_username)
 
-    return CompetitorResponse.model_validate(competitor)
+    return CompetitorResponse.from_competitor(row)
 
 
 @router.get("/{username}", response_model=CompetitorResponse)
-def get_competitor(
+async def get_competitor(
     username: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get detailed information about a tracked competitor.
 
     User Isolation: Only returns if competitor belongs to authenticated user.
     """
-    clean_username = username.lower().strip().replace("@", "")
+    clean_username = normalize_username(username)
 
-    competitor = db.query(Competitor).filter(
+    competitor = await db.scalar(select(Competitor).where(
         Competitor.user_id == current_user.id,
         Competitor.username == clean_username
-    ).first()
+    ))
 
     if not competitor:
         raise HTTPException(
@@ -455,27 +683,27 @@ def get_competitor(
             detail=f"Competitor @{clean_username} not found in your tracking list"
         )
 
-    return CompetitorResponse.model_validate(competitor)
+    return CompetitorResponse.from_competitor(competitor)
 
 
 @router.patch("/{username}", response_model=CompetitorResponse)
-def update_competitor(
+async def update_competitor(
     username: str,
     data: CompetitorUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update competitor notes, tags, or status.
 
     User Isolation: Only updates if competitor belongs to authenticated user.
     """
-    clean_username = username.lower().strip().replace("@", "")
+    clean_username = normalize_username(username)
 
-    competitor = db.query(Competitor).filter(
+    competitor = await db.scalar(select(Competitor).where(
         Competitor.user_id == current_user.id,
         Competitor.username == clean_username
-    ).first()
+    ))
 
     if not competitor:
         raise HTTPException(
@@ -492,20 +720,20 @@ def update_competitor(
         competitor.is_active = data.is_active
 
     competitor.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(competitor)
+    await db.commit()
 
     logger.info(f"[NOTE] User {current_user.id} updated competitor @{clean_username}")
+    await invalidate_competitor_cache(current_user.id, clean_username)
 
-    return CompetitorResponse.model_validate(competitor)
+    return CompetitorResponse.from_competitor(competitor)
 
 
 @router.delete("/{username}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_competitor(
+async def delete_competitor(
     username: str,
     hard_delete: bool = True,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Remove competitor from tracking.
@@ -515,12 +743,12 @@ def delete_competitor(
 
     User Isolation: Only deletes if competitor belongs to authenticated user.
     """
-    clean_username = username.lower().strip().replace("@", "")
+    clean_username = normalize_username(username)
 
-    competitor = db.query(Competitor).filter(
+    competitor = await db.scalar(select(Competitor).where(
         Competitor.user_id == current_user.id,
         Competitor.username == clean_username
-    ).first()
+    ))
 
     if not competitor:
         raise HTTPException(
@@ -530,40 +758,45 @@ def delete_competitor(
 
     if hard_delete:
         # Clean up images from Supabase Storage before deleting DB record
-        deleted_count = SupabaseStorage.cleanup_competitor(
+        stored_videos = (await db.scalars(
+            select(CompetitorVideoRecord.data).where(CompetitorVideoRecord.competitor_id == competitor.id)
+        )).all()
+        deleted_count = await asyncio.to_thread(
+            SupabaseStorage.cleanup_competitor,
             avatar_url=competitor.avatar_url or "",
-            recent_videos=competitor.recent_videos or []
+            recent_videos=[*(competitor.recent_videos or []), *stored_videos]
         )
         if deleted_count:
             logger.info(f"[DELETE] Cleaned {deleted_count} images from Supabase for @{clean_username}")
 
-        db.delete(competitor)
+        await db.delete(competitor)
         logger.info(f"[DELETE] User {current_user.id} permanently deleted competitor @{clean_username}")
     else:
         competitor.is_active = False
         competitor.updated_at = datetime.utcnow()
         logger.info(f"[STOP] User {current_user.id} deactivated competitor @{clean_username}")
 
-    db.commit()
+    await db.commit()
+    await invalidate_competitor_cache(current_user.id, clean_username)
 
 
 @router.put("/{username}/refresh", response_model=CompetitorResponse)
-def refresh_competitor_data(
+async def refresh_competitor_data(
     username: str,
-    current_user: User = Depends(check_rate_limit),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(check_rate_limit_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Refresh competitor data by re-parsing their profile.
 
     User Isolation: Only refreshes if competitor belongs to authenticated user.
     """
-    clean_username = username.lower().strip().replace("@", "")
+    clean_username = normalize_username(username)
 
-    competitor = db.query(Competitor).filter(
+    competitor = await db.scalar(select(Competitor).where(
         Competitor.user_id == current_user.id,
         Competitor.username == clean_username
-    ).first()
+    ))
 
     if not competitor:
         raise HTTPException(
@@ -571,10 +804,42 @@ def refresh_competitor_data(
             detail=f"Competitor @{clean_username} not found"
         )
 
-    logger.info(f"[REFRESH] User {current_user.id} refreshing competitor: @{clean_username}")
+    # One Apify scrape per competitor at a time: concurrent refresh clicks would each pay for one
+    cache = get_cache()
+    lock_key = _refresh_lock_key(current_user.id, clean_username)
+    if not await cache.add(lock_key, "1", COMPETITOR_REFRESH_LOCK_TTL):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"@{clean_username} is already being refreshed"
+        )
+    try:
+        return await _refresh_competitor(db, competitor, current_user.id, clean_username)
+    finally:
+        await cache.delete(lock_key)
+
+
+async def _refresh_competitor(db: AsyncSession, competitor: Competitor, user_id: int, clean_username: str) -> CompetitorResponse:
+    """Re-scrape the profile and store fresh metrics/videos (caller holds the refresh lock)."""
+    logger.info(f"[REFRESH] User {user_id} refreshing competitor: @{clean_username}")
+
+    scraped = await _scrape_for_refresh(clean_username)
+    await _apply_refresh(db, competitor, scraped)
+    await db.commit()
+
+    logger.info(f"[OK] User {user_id} refreshed competitor @{clean_username}")
+    await invalidate_competitor_cache(user_id, clean_username)
 
-    collector = TikTokCollector()
-    raw_videos = collector.collect([clean_username], limit=30, mode="profile")
+    return CompetitorResponse.from_competitor(competitor)
+
+
+async def _scrape_for_refresh(clean_username: str) -> tuple:
+    """
+    Scrape, score and re-host the avatar for a refresh.
+
+    No database access, so a bulk refresh can run several of these at once.
+    Returns (clean_videos, avg_views, engagement_rate, avatar_url).
+    """
+    raw_videos = await scrape_profile("tiktok", clean_username, limit=30)
 
     if not raw_videos:
         raise HTTPException(
@@ -582,85 +847,169 @@ def refresh_competitor_data(
             detail=f"Failed to refresh @{clean_username} - profile not found"
         )
 
-    # Process videos
-    scorer = TrendScorer()
-    clean_videos = []
-    total_views = 0
-    total_engagement = 0
-
-    for raw in raw_videos:
-        vid = normalize_video_data(raw)
-        scorer_data = {
-            "views": vid["views"],
-            "author_followers": vid["author"]["followers"],
-            "collect_count": 0,
-            "share_count": vid["stats"]["shareCount"]
-        }
-        vid["uts_score"] = scorer.calculate_uts(scorer_data, history_data=None, cascade_count=1)
-        clean_videos.append(vid)
-        total_views += vid["views"]
-        total_engagement += (
-            vid["stats"]["diggCount"] +
-            vid["stats"]["commentCount"] +
-            vid["stats"]["shareCount"]
-        )
+    # Process videos (thumbnail uploads block, so off the event loop)
+    clean_videos, avg_views, engagement_rate = await asyncio.to_thread(score_profile_videos, raw_videos)
 
-    avg_views = total_views / len(clean_videos) if clean_videos else 0
-    engagement_rate = (total_engagement / total_views * 100) if total_views > 0 else 0
+    # Upload new avatar to Supabase Storage (permanent)
+    avatar_cdn_url = clean_videos[0]["author"]["avatar"]
+    uploaded_avatar = await asyncio.to_thread(SupabaseStorage.upload_avatar, avatar_cdn_url)
+    return clean_videos, avg_views, engagement_rate, uploaded_avatar if uploaded_avatar else avatar_cdn_url
 
-    # Update competitor
-    first_vid = clean_videos[0]
-    competitor.followers_count = first_vid["author"]["followers"]
 
-    # Upload new avatar to Supabase Storage (permanent)
-    avatar_cdn_url = first_vid["author"]["avatar"]
-    uploaded_avatar = SupabaseStorage.upload_avatar(avatar_cdn_url)
-    competitor.avatar_url = uploaded_avatar if uploaded_avatar else avatar_cdn_url
+async def _apply_refresh(db: AsyncSession, competitor: Competitor, scraped: tuple) -> None:
+    """Write a _scrape_for_refresh result to the competitor and its videos (caller commits)."""
+    clean_videos, avg_views, engagement_rate, avatar_url = scraped
+
+    # Update competitor
+    competitor.followers_count = clean_videos[0]["author"]["followers"]
+    competitor.avatar_url = avatar_url
     competitor.total_videos = len(clean_videos)
     competitor.avg_views = avg_views
     competitor.engagement_rate = round(engagement_rate, 2)
-    competitor.recent_videos = clean_videos
+    await store_competitor_videos(db, competitor.id, clean_videos, replace=True)
+    if competitor.recent_videos:
+        competitor.recent_videos = []  # superseded by the competitor_videos rows
     competitor.last_analyzed_at = datetime.utcnow()
     competitor.updated_at = datetime.utcnow()
 
-    db.commit()
-    db.refresh(competitor)
 
-    logger.info(f"[OK] User {current_user.id} refreshed competitor @{clean_username}")
+@router.post("/bulk", response_model=BulkActionResult)
+async def bulk_competitor_action(
+    data: BulkCompetitorAction,
+    current_user: User = Depends(check_rate_limit_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Bulk action on tracked competitors. Currently supports "refresh".
 
-    return CompetitorResponse.model_validate(competitor)
+    Profiles are scraped concurrently (at most COMPETITOR_REFRESH_CONCURRENCY
+    at a time), so a batch takes about as long as its slowest profile; the
+    results are then written in one transaction. Competitors that are
+    already being refreshed are skipped.
+
+    User Isolation: Only acts on competitors belonging to authenticated user.
+    """
+    if data.action != "refresh":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bulk '{data.action}' is not supported"
+        )
+
+    usernames = list(dict.fromkeys(normalize_username(u) for u in data.usernames))
+    competitors = {
+        c.username: c for c in (await db.scalars(select(Competitor).where(
+            Competitor.user_id == current_user.id,
+            Competitor.username.in_(usernames)
+        ))).all()
+    }
+
+    errors = []
+    cache = get_cache()
+    locked = []
+    for username in usernames:
+        if username not in competitors:
+            errors.append(f"@{username} not found")
+        elif await cache.add(_refresh_lock_key(current_user.id, username), "1", COMPETITOR_REFRESH_LOCK_TTL):
+            locked.append(username)
+        else:
+            errors.append(f"@{username} is already being refreshed")
+
+    semaphore = asyncio.Semaphore(COMPETITOR_REFRESH_CONCURRENCY)
+
+    async def scrape(username: str) -> tuple:
+        async with semaphore:
+            return await _scrape_for_refresh(username)
+
+    results = []
+    try:
+        scraped = await asyncio.gather(*(scrape(u) for u in locked), return_exceptions=True)
+        # One AsyncSession can't be shared between tasks: writes happen here, sequentially
+        for username, outcome in zip(locked, scraped):
+            if isinstance(outcome, Exception):
+                logger.warning(f"[REFRESH] Bulk refresh of @{username} failed: {outcome}")
+                errors.append(outcome.detail if isinstance(outcome, HTTPException) else f"Failed to refresh @{username}")
+                continue
+            await _apply_refresh(db, competitors[username], outcome)
+            results.append({"username": username})
+        await db.commit()
+    finally:
+        await cache.delete(*(_refresh_lock_key(current_user.id, u) for u in locked))
+
+    logger.info(f"[OK] User {current_user.id} bulk refreshed {len(results)} competitors")
+    await invalidate_competitor_cache(current_user.id)
+    await cache.delete(*(_feed_cache_key(current_user.id, r["username"]) for r in results))
+
+    return BulkActionResult(
+        success_count=len(results),
+        failed_count=len(errors),
+        results=results,
+        errors=errors
+    )
 
 
 # =============================================================================
 # SPY MODE
 # =============================================================================
 
+_VIDEO_STAT_FIELDS = tuple(CompetitorVideoStats.model_fields)
+
+
+def _spy_video(vid: dict) -> CompetitorVideo:
+    """CompetitorVideo from a stored video dict, via model_construct (written by us, no re-validation)."""
+    stats = vid.get("stats") or {}
+    return CompetitorVideo.model_construct(
+        id=vid.get("id", ""),
+        title=vid.get("title", ""),
+        url=vid.get("url", ""),
+        cover_url=vid.get("cover_url"),
+        uploaded_at=vid.get("uploaded_at"),
+        views=vid.get("views", 0),
+        stats=CompetitorVideoStats.model_construct(**{k: stats[k] for k in _VIDEO_STAT_FIELDS if k in stats}),
+        uts_score=vid.get("uts_score", 0.0)
+    )
+
+
 @router.get("/{username}/spy", response_model=SpyModeResponse)
-def spy_competitor(
+async def spy_competitor(
     username: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Spy Mode: Detailed competitor analysis with top videos and feed.
 
     User Isolation: Only returns data if competitor belongs to authenticated user.
+    The ETag follows the competitor's updated_at (bumped by every refresh), so a
+    revalidation is answered with 304 before the videos are loaded.
     """
-    clean_username = username.lower().strip().replace("@", "")
+    clean_username = normalize_username(username)
 
     # Try to find in user's competitors
-    competitor = db.query(Competitor).filter(
+    competitor = await db.scalar(select(Competitor).where(
         Competitor.user_id == current_user.id,
         Competitor.username == clean_username
-    ).first()
-
-    if not competitor or not competitor.recent_videos:
+    ))
+
+    etag = None
+    latest_rows = []
+    if competitor:
+        etag = weak_etag("spy", competitor.id, competitor.updated_at)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        latest_rows = (await db.execute(
+            select(CompetitorVideoRecord.views, CompetitorVideoRecord.data)
+            .where(CompetitorVideoRecord.competitor_id == competitor.id)
+            .order_by(CompetitorVideoRecord.uploaded_at.desc())
+        )).all()
+
+    if not latest_rows:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Competitor @{clean_username} not found. Add them first using POST /api/competitors/"
         )
 
-    clean_feed = competitor.recent_videos
     channel_data = ChannelData(
         nickName=competitor.display_name or competitor.username,
         uniqueId=competitor.username,
@@ -671,28 +1020,17 @@ def spy_competitor(
         following=competitor.following_count
     )
 
-    # Sort videos
-    top_videos = sorted(clean_feed, key=lambda x: x.get("views", 0), reverse=True)[:3]
-    latest_videos = sorted(clean_feed, key=lambda x: x.get("uploaded_at", 0), reverse=True)
-
     # Convert to response format
-    def convert_video(vid: dict) -> CompetitorVideo:
-        return CompetitorVideo(
-            id=vid.get("id", ""),
-            title=vid.get("title", ""),
-            url=vid.get("url", ""),
-            cover_url=vid.get("cover_url"),
-            uploaded_at=vid.get("uploaded_at"),
-            views=vid.get("views", 0),
-            stats=CompetitorVideoStats(**vid.get("stats", {})),
-            uts_score=vid.get("uts_score", 0.0)
-        )
+    # Latest come sorted from the index; each video is converted once and the
+    # top 3 by views are picked from the same converted list
+    latest_feed = [_spy_video(row.data) for row in latest_rows]
+    top_indexes = heapq.nlargest(3, range(len(latest_rows)), key=lambda i: latest_rows[i].views)
 
-    return SpyModeResponse(
+    spy = SpyModeResponse(
         username=clean_username,
         channel_data=channel_data,
-        top_3_hits=[convert_video(v) for v in top_videos],
-        latest_feed=[convert_video(v) for v in latest_videos],
+        top_3_hits=[latest_feed[i] for i in top_indexes],
+        latest_feed=latest_feed,
         metrics=CompetitorMetrics(
             avg_views=int(competitor.avg_views),
             engagement_rate=competitor.engagement_rate,
@@ -702,6 +1040,9 @@ def spy_competitor(
         content_categories=competitor.content_categories,
         last_analyzed_at=competitor.last_analyzed_at
     )
+    # Already a validated model: serialize once in pydantic-core instead of
+    # FastAPI re-validating it against response_model and encoding it again
+    return json_etag_response(request, spy.model_dump_json(), etag)
 
 
 # =============================================================================
@@ -709,10 +1050,10 @@ def spy_competitor(
 # =============================================================================
 
 @router.get("/{username}/feed", response_model=CompetitorFeedResponse)
-def get_competitor_feed(
+async def get_competitor_feed(
     username: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get competitor's full feed with recent videos.
@@ -722,14 +1063,35 @@ def get_competitor_feed(
     - Recent videos (with is_new flag for last 24h)
     
     User Isolation: Only returns data if competitor belongs to authenticated user.
+    Responses are cached for COMPETITOR_FEED_CACHE_TTL seconds.
+    """
+    clean_username = normalize_username(username)
+
+    cache = get_cache()
+    cache_key = _feed_cache_key(current_user.id, clean_username)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    feed = await _load_competitor_feed(db, current_user.id, clean_username)
+    body = orjson.dumps(feed).decode()
+    await cache.set(cache_key, body, ttl=COMPETITOR_FEED_CACHE_TTL)
+    return Response(content=body, media_type="application/json")
+
+
+async def _load_competitor_feed(db: AsyncSession, user_id: int, clean_username: str) -> dict:
+    """
+    Build the feed from the stored competitor row.
+
+    Returns plain dicts in the CompetitorFeedResponse shape: the values come
+    from our own normalized video records, so they go straight to orjson
+    instead of through ~20 model constructions per request.
     """
-    clean_username = username.lower().strip().replace("@", "")
-    
     # Get competitor from database
-    competitor = db.query(Competitor).filter(
-        Competitor.user_id == current_user.id,
+    competitor = await db.scalar(select(Competitor).where(
+        Competitor.user_id == user_id,
         Competitor.username == clean_username
-    ).first()
+    ))
     
     if not competitor:
         raise HTTPException(
@@ -737,83 +1099,64 @@ def get_competitor_feed(
             detail=f"Competitor @{clean_username} not found in your tracking list"
         )
     
-    logger.info(f"[STATS] User {current_user.id} viewing feed for @{clean_username}")
+    logger.info(f"[STATS] User {user_id} viewing feed for @{clean_username}")
 
     # FEED ДОЛЖЕН ПОКАЗЫВАТЬ ДАННЫЕ ИЗ БАЗЫ МГНОВЕННО!
     # Обновление данных через отдельный endpoint: PUT /competitors/{username}/refresh
 
     # Build profile data
-    profile = CompetitorFeedProfile(
-        username=competitor.username,
-        nickname=competitor.display_name or competitor.username,
-        avatar_url=ApifyStorage.fix_tiktok_url(competitor.avatar_url),
-        bio=competitor.bio or "",
-        followers_count=competitor.followers_count,
-        total_videos=competitor.total_videos,
-        avg_views=competitor.avg_views,
-        engagement_rate=competitor.engagement_rate,
-        created_at=competitor.created_at.isoformat(),
-        last_checked_at=competitor.last_analyzed_at.isoformat() if competitor.last_analyzed_at else None
-    )
+    profile = {
+        "username": competitor.username,
+        "nickname": competitor.display_name or competitor.username,
+        "avatar_url": ApifyStorage.fix_tiktok_url(competitor.avatar_url),
+        "bio": competitor.bio or "",
+        "followers_count": competitor.followers_count or 0,
+        "total_videos": competitor.total_videos or 0,
+        "avg_views": float(competitor.avg_views or 0.0),
+        "engagement_rate": float(competitor.engagement_rate or 0.0),
+        "created_at": competitor.created_at.isoformat(),
+        "last_checked_at": competitor.last_analyzed_at.isoformat() if competitor.last_analyzed_at else None
+    }
     
-    # Get videos from recent_videos field (JSONB)
-    videos_data = competitor.recent_videos or []
+    # 20 most recent videos (index scan on competitor_id, uploaded_at DESC)
+    videos_data = (await db.scalars(
+        select(CompetitorVideoRecord.data)
+        .where(CompetitorVideoRecord.competitor_id == competitor.id)
+        .order_by(CompetitorVideoRecord.uploaded_at.desc())
+        .limit(20)
+    )).all()
+
+    # "New" = posted in the last 24 hours; uploaded_at is Unix seconds, so compare epochs
+    now_iso = datetime.utcnow().isoformat()
+    cutoff_ts = time.time() - NEW_VIDEO_WINDOW.total_seconds()
 
-    # Log summary
-    logger.info(f"Returning {len(videos_data)} videos for @{clean_username}")
-
-    # Calculate cutoff time for "new" videos (last 24 hours)
-    from datetime import datetime, timedelta
-    now = datetime.utcnow()
-    cutoff_time = now - timedelta(hours=24)
-    
     # Build feed videos
     feed_videos = []
-    for vid in videos_data[:20]:  # Limit to 20 most recent
-        # Determine if video is "new" (posted in last 24h)
+    for vid in videos_data:
         uploaded_at = vid.get("uploaded_at", 0)
-        is_new = False
-        
-        if uploaded_at and uploaded_at > 0:
-            try:
-                video_date = datetime.fromtimestamp(uploaded_at)
-                is_new = video_date > cutoff_time
-            except:
-                is_new = False
-        
-        # Format video data - fix ALL URLs from database
-        cover_url_value = vid.get("cover_url")
-        cover_url_value = ApifyStorage.fix_tiktok_url(cover_url_value)
-        video_url_value = ApifyStorage.fix_tiktok_url(vid.get("video_url"))
-        page_url_value = ApifyStorage.fix_tiktok_url(vid.get("url"))
-        
-        # Fix author avatar from video metadata
-        if vid.get("author") and vid["author"].get("avatar"):
-            vid["author"]["avatar"] = ApifyStorage.fix_tiktok_url(vid["author"]["avatar"])
-
-        feed_video = CompetitorFeedVideo(
-            id=vid.get("id", ""),
-            title=vid.get("title", ""),
-            description=vid.get("title", ""),  # TikTok doesn't have separate description
-            thumbnail_url=cover_url_value,
-            video_url=vid.get("video_url"),  # Add video URL for playback
-            url=vid.get("url", ""),
-            stats=CompetitorVideoStats(
-                playCount=vid.get("stats", {}).get("playCount", 0),
-                diggCount=vid.get("stats", {}).get("diggCount", 0),
-                commentCount=vid.get("stats", {}).get("commentCount", 0),
-                shareCount=vid.get("stats", {}).get("shareCount", 0),
-            ),
-            posted_at=datetime.fromtimestamp(uploaded_at).isoformat() if uploaded_at > 0 else now.isoformat(),
-            uts_score=vid.get("uts_score", 0.0),
-            is_new=is_new
-        )
-        feed_videos.append(feed_video)
-    
-    new_videos_count = sum(1 for v in feed_videos if v.is_new)
-    logger.info(f"Returned {len(feed_videos)} videos for @{clean_username} ({new_videos_count} new)")
-
-    return CompetitorFeedResponse(
-        profile=profile,
-        videos=feed_videos
-    )
+        stats = vid.get("stats", {})
+        title = vid.get("title") or ""
+
+        feed_videos.append({
+            "id": vid.get("id") or "",
+            "title": title,
+            "description": title,  # TikTok doesn't have separate description
+            "thumbnail_url": ApifyStorage.fix_tiktok_url(vid.get("cover_url")),
+            "video_url": vid.get("video_url"),  # Add video URL for playback
+            "url": vid.get("url") or "",
+            "stats": {
+                "playCount": stats.get("playCount", 0),
+                "diggCount": stats.get("diggCount", 0),
+                "commentCount": stats.get("commentCount", 0),
+                "shareCount": stats.get("shareCount", 0),
+            },
+            "posted_at": datetime.fromtimestamp(uploaded_at).isoformat() if uploaded_at > 0 else now_iso,
+            "uts_score": vid.get("uts_score", 0.0),
+            "is_new": uploaded_at > cutoff_ts
+        })
+
+    if logger.isEnabledFor(logging.DEBUG):
+        new_videos_count = sum(1 for v in feed_videos if v["is_new"])
+        logger.debug("Returned %d videos for @%s (%d new)", len(feed_videos), clean_username, new_videos_count)
+
+    return {"profile": profile, "videos": feed_videos}
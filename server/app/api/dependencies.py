@@ -23,8 +23,9 @@ from collections import defaultdict
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.database import get_db
+from ..core.database import get_db, get_async_db
 from ..core.security import decode_token
 from ..db.models import User, UserSettings, SubscriptionTier
 
@@ -197,34 +198,15 @@ rate_limiter = RateLimiter()
 # AUTHENTICATION DEPENDENCIES
 # =============================================================================
 
-async def get_current_user(
+def _get_token_user_id(
     request: Request,
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    credentials: Optional[HTTPAuthorizationCredentials]
+) -> int:
     """
-    Dependency to get the current authenticated user from JWT token.
-
-    Security:
-    - Validates JWT signature and expiration
-    - Checks user exists and is active
-    - No sensitive data in error messages
-
-    Supports tokens from:
-    - Authorization header (Bearer token)
-    - Query parameter (?token=...) for OAuth redirects
-
-    Args:
-        request: FastAPI Request object
-        credentials: HTTP Bearer token from Authorization header
-        db: Database session
-
-    Returns:
-        User: The authenticated user object
+    Extract and validate the user ID from the bearer token (header or ?token=).
 
     Raises:
-        HTTPException: 401 if token is invalid or user not found
-        HTTPException: 403 if user account is disabled
+        HTTPException: 401 if token is missing, invalid or has no user ID
     """
     token = None
 
@@ -270,9 +252,17 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    return user_id
 
+
+def _ensure_active_user(user: Optional[User]) -> User:
+    """
+    Check the loaded user exists and is active.
+
+    Raises:
+        HTTPException: 401 if user not found
+        HTTPException: 403 if user account is disabled
+    """
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -290,6 +280,62 @@ async def get_current_user(
     return user
 
 
+async def get_current_user(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Dependency to get the current authenticated user from JWT token.
+
+    Security:
+    - Validates JWT signature and expiration
+    - Checks user exists and is active
+    - No sensitive data in error messages
+
+    Supports tokens from:
+    - Authorization header (Bearer token)
+    - Query parameter (?token=...) for OAuth redirects
+
+    Args:
+        request: FastAPI Request object
+        credentials: HTTP Bearer token from Authorization header
+        db: Database session
+
+    Returns:
+        User: The authenticated user object
+
+    Raises:
+        HTTPException: 401 if token is invalid or user not found
+        HTTPException: 403 if user account is disabled
+    """
+    user_id = _get_token_user_id(request, credentials)
+
+    # Get user from database
+    user = db.query(User).filter(User.id == user_id).first()
+
+    return _ensure_active_user(user)
+
+
+async def get_current_user_async(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    Same as get_current_user, but loads the user through the AsyncSession.
+
+    Use together with get_async_db so the endpoint shares the same session
+    (and can commit changes to the returned user).
+    """
+    user_id = _get_token_user_id(request, credentials)
+
+    # Get user from database
+    user = await db.get(User, user_id)
+
+    return _ensure_active_user(user)
+
+
 async def get_current_user_optional(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
@@ -428,6 +474,14 @@ async def check_rate_limit(
     return current_user
 
 
+async def check_rate_limit_async(
+    current_user: User = Depends(get_current_user_async)
+) -> User:
+    """check_rate_limit for endpoints that use get_async_db (user bound to the AsyncSession)."""
+    rate_limiter.check_rate_limit(current_user.id, current_user.subscription_tier)
+    return current_user
+
+
 async def check_deep_analyze_limit(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -536,6 +590,8 @@ class CreditManager:
         SubscriptionTier.PRO: 5000,
         SubscriptionTier.AGENCY: 10000,
     }
+    # JSON-ready form for credit info responses
+    _PLAN_CREDITS_BY_NAME: Dict[str, int] = {k.value: v for k, v in PLAN_CREDITS.items()}
 
     # Credit cost per AI model (per message)
     MODEL_COSTS: Dict[str, int] = {
@@ -599,12 +655,24 @@ class CreditManager:
         """Get credit cost for an AI model per message."""
         return cls.MODEL_COSTS.get(model, 1)
 
+    @staticmethod
+    async def _commit(db) -> None:
+        """Commit a sync Session or an AsyncSession."""
+        if isinstance(db, AsyncSession):
+            await db.commit()
+        else:
+            db.commit()
+
+    @staticmethod
+    async def _invalidate_usage(user: User) -> None:
+        """Drop the user's cached /usage response after a credit change."""
+        # Imported here: the usage routes import this module
+        from .routes.usage import invalidate_usage_cache
+        await invalidate_usage_cache(user.id)
+
     @classmethod
-    def check_and_reset_monthly(cls, user: User, db: Session) -> None:
-        """
-        Check if credits should be reset for the new month.
-        Resets credits to the plan's monthly allocation if a month has passed.
-        """
+    def _apply_monthly_reset(cls, user: User) -> bool:
+        """Reset credits on the user object if due. Returns True if anything changed."""
         from dateutil.relativedelta import relativedelta
 
         now = datetime.utcnow()
@@ -614,16 +682,32 @@ class CreditManager:
             user.credits_reset_at = now + relativedelta(months=1)
             monthly_limit = cls.get_monthly_limit(user.subscription_tier)
             user.credits = monthly_limit
-            db.commit()
-            return
+            return True
 
         # Check if reset time has passed
         if now >= user.credits_reset_at:
             monthly_limit = cls.get_monthly_limit(user.subscription_tier)
             user.credits = monthly_limit
             user.credits_reset_at = now + relativedelta(months=1)
+            return True
+
+        return False
+
+    @classmethod
+    def check_and_reset_monthly(cls, user: User, db: Session) -> None:
+        """
+        Check if credits should be reset for the new month.
+        Resets credits to the plan's monthly allocation if a month has passed.
+        """
+        if cls._apply_monthly_reset(user):
             db.commit()
 
+    @classmethod
+    async def check_and_reset_monthly_async(cls, user: User, db: AsyncSession) -> None:
+        """Async-session variant of check_and_reset_monthly."""
+        if cls._apply_monthly_reset(user):
+            await db.commit()
+
     @classmethod
     async def check_credits_for_chat(
         cls,
@@ -665,7 +749,8 @@ class CreditManager:
     ) -> int:
         """Deduct credits after successful AI response. Returns remaining credits."""
         user.credits = max(0, user.credits - cost)
-        db.commit()
+        await cls._commit(db)
+        await cls._invalidate_usage(user)
         return user.credits
 
     @classmethod
@@ -696,7 +781,8 @@ class CreditManager:
             )
 
         user.credits -= cost
-        db.commit()
+        await cls._commit(db)
+        await cls._invalidate_usage(user)
 
     @classmethod
     def get_operation_cost(cls, operation: str) -> int:
@@ -712,9 +798,9 @@ class CreditManager:
             "credits": user.credits,
             "monthly_limit": monthly_limit,
             "tier": tier.value if hasattr(tier, 'value') else str(tier),
-            "credits_reset_at": user.credits_reset_at.isoformat() if user.credits_reset_at else None,
+            "credits_reset_at": user.credits_reset_at,
             "model_costs": cls.MODEL_COSTS,
-            "plan_credits": {k.value: v for k, v in cls.PLAN_CREDITS.items()},
+            "plan_credits": cls._PLAN_CREDITS_BY_NAME,
         }
 
 
@@ -8,13 +8,19 @@ Full CRUD operations with user isolation.
 import logging
 from typing import Optional, List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-
-from ..core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from ..core.cache import get_cache
+from ..core.database import get_async_db
+from ..core.responses import json_etag_response
 from pydantic import BaseModel
 from ..db.models import User, Trend, UserFavorite, SearchMode as DBSearchMode
-from .dependencies import get_current_user, check_rate_limit
+from .dependencies import get_current_user_async, check_rate_limit_async
+from .pagination import decode_cursor, encode_cursor
 from .schemas.favorites import (
     FavoriteCreate,
     FavoriteUpdate,
@@ -30,85 +36,144 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Serialized list pages; any favorite mutation drops the user's entries
+FAVORITES_LIST_CACHE_TTL = 30
+
+
+def _list_cache_prefix(user_id: int) -> str:
+    return f"favorites:list:{user_id}:"
+
+
+async def invalidate_favorites_cache(user_id: int) -> None:
+    """Drop the user's cached favorites list pages."""
+    await get_cache().delete_prefix(_list_cache_prefix(user_id))
+
 
 # =============================================================================
 # CRUD OPERATIONS
 # =============================================================================
 
 @router.get("/", response_model=FavoriteListResponse)
-def get_favorites(
+async def get_favorites(
+    request: Request,
     page: int = 1,
     per_page: int = 20,
+    cursor: Optional[str] = None,
     tag: Optional[str] = None,
     project_id: Optional[int] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get paginated list of user's favorites.
 
     User Isolation: Only returns favorites belonging to the authenticated user.
+    Pass `next_cursor` back as `cursor` to fetch the next page (keyset
+    pagination, no total); `page` is only used when no cursor is given.
+    Responses are cached per user/page for FAVORITES_LIST_CACHE_TTL seconds
+    and carry an ETag; a matching If-None-Match gets an empty 304.
     """
-    query = db.query(UserFavorite).filter(
-        UserFavorite.user_id == current_user.id
-    ).options(joinedload(UserFavorite.trend))
+    if tag:
+        tag = tag.lower()
+
+    cache = get_cache()
+    cache_key = f"{_list_cache_prefix(current_user.id)}{cursor or page}:{per_page}:{tag}:{project_id}"
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return json_etag_response(request, cached)
+
+    filters = [UserFavorite.user_id == current_user.id]
 
     # Filter by tag if provided
     if tag:
-        query = query.filter(UserFavorite.tags.contains([tag.lower()]))
+        filters.append(UserFavorite.tags.contains([tag]))
 
     # Filter by project if provided
     if project_id is not None:
-        query = query.filter(UserFavorite.project_id == project_id)
-
-    total = query.count()
-    offset = (page - 1) * per_page
-
-    favorites = query.order_by(
-        UserFavorite.created_at.desc()
-    ).offset(offset).limit(per_page).all()
-
-    items = []
-    for fav in favorites:
-        trend_summary = None
-        if fav.trend:
-            trend_summary = TrendSummary(
-                id=fav.trend.id,
-                platform_id=fav.trend.platform_id,
-                url=fav.trend.url,
-                play_addr=fav.trend.play_addr,  # Direct CDN URL for inline video playback
-                description=fav.trend.description,
-                cover_url=fav.trend.cover_url,
-                author_username=fav.trend.author_username,
-                uts_score=fav.trend.uts_score or 0.0,
-                stats=fav.trend.stats or {}
-            )
+        filters.append(UserFavorite.project_id == project_id)
+
+    # Only the response columns: the trend's other JSONB/text columns stay in the database
+    query = select(*_FAVORITE_LIST_COLUMNS, *_TREND_SUMMARY_COLUMNS).outerjoin(
+        Trend, Trend.id == UserFavorite.trend_id
+    ).where(*filters)
+
+    query = query.order_by(UserFavorite.created_at.desc(), UserFavorite.id.desc()).limit(per_page + 1)
+
+    total = None
+    if cursor:
+        # Keyset page: an index range scan after the cursor, nothing counted
+        query = query.where(tuple_(UserFavorite.created_at, UserFavorite.id) < decode_cursor(cursor))
+        rows = (await db.execute(query)).all()
+    else:
+        # The window count rides along with the page, so the total costs no extra round-trip
+        offset = (page - 1) * per_page
+        rows = (await db.execute(query.add_columns(func.count().over().label("total")).offset(offset))).all()
+        if rows:
+            total = rows[0].total
+        else:
+            # Past the last page there is no row to carry the count
+            total = await db.scalar(select(func.count()).select_from(UserFavorite).where(*filters)) if offset else 0
 
-        items.append(FavoriteResponse(
-            id=fav.id,
-            user_id=fav.user_id,
-            trend_id=fav.trend_id,
-            notes=fav.notes,
-            tags=fav.tags or [],
-            project_id=fav.project_id,
-            created_at=fav.created_at,
-            trend=trend_summary
-        ))
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
 
-    return FavoriteListResponse(
-        items=items,
+    result = FavoriteListResponse(
+        items=[_favorite_from_row(row) for row in rows],
         total=total,
         page=page,
         per_page=per_page,
-        has_more=(offset + len(favorites)) < total
+        has_more=has_more,
+        next_cursor=encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+    )
+    # Serialize directly: the items were built from trusted DB rows without validation
+    body = result.model_dump_json()
+    await cache.set(cache_key, body, ttl=FAVORITES_LIST_CACHE_TTL)
+    return json_etag_response(request, body)
+
+
+_FAVORITE_LIST_COLUMNS = tuple(
+    getattr(UserFavorite, name) for name in FavoriteResponse.model_fields if name != "trend"
+)
+_TREND_SUMMARY_COLUMNS = tuple(
+    getattr(Trend, name).label(f"trend__{name}") for name in TrendSummary.model_fields
+)
+
+
+def _favorite_from_row(row) -> FavoriteResponse:
+    """FavoriteResponse from a list row (favorite columns + trend__* columns)."""
+    trend = _trend_summary(row, prefix="trend__") if row.trend__id is not None else None
+    return _favorite_response(row, trend)
+
+
+# Responses are built from trusted DB data with model_construct (no re-validation)
+
+def _trend_summary(trend, prefix: str = "") -> TrendSummary:
+    """TrendSummary from a Trend, or from row attributes named `prefix + field`."""
+    fields = {name: getattr(trend, prefix + name) for name in TrendSummary.model_fields}
+    fields["uts_score"] = fields["uts_score"] or 0.0
+    fields["stats"] = fields["stats"] or {}
+    return TrendSummary.model_construct(**fields)
+
+
+def _favorite_response(favorite, trend: Optional[TrendSummary]) -> FavoriteResponse:
+    """FavoriteResponse from a UserFavorite (or a row with its columns)."""
+    return FavoriteResponse.model_construct(
+        id=favorite.id,
+        user_id=favorite.user_id,
+        trend_id=favorite.trend_id,
+        notes=favorite.notes,
+        tags=favorite.tags or [],
+        project_id=favorite.project_id,
+        created_at=favorite.created_at,
+        trend=trend
     )
 
 
 @router.post("/", response_model=FavoriteResponse, status_code=status.HTTP_201_CREATED)
-def add_favorite(
+async def add_favorite(
     data: FavoriteCreate,
-    current_user: User = Depends(check_rate_limit),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(check_rate_limit_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add a trend to user's favorites.
@@ -117,7 +182,7 @@ def add_favorite(
     Prevents duplicates: Same trend can only be favorited once per user.
     """
     # Check if trend exists (user can favorite any trend they can see)
-    trend = db.query(Trend).filter(Trend.id == data.trend_id).first()
+    trend = await db.get(Trend, data.trend_id)
 
     if not trend:
         raise HTTPException(
@@ -126,10 +191,10 @@ def add_favorite(
         )
 
     # Check if already favorited
-    existing = db.query(UserFavorite).filter(
+    existing = await db.scalar(select(UserFavorite.id).where(
         UserFavorite.user_id == current_user.id,
         UserFavorite.trend_id == data.trend_id
-    ).first()
+    ))
 
     if existing:
         raise HTTPException(
@@ -147,49 +212,29 @@ def add_favorite(
     )
 
     db.add(favorite)
-    db.commit()
-    db.refresh(favorite)
+    await db.commit()
+    await invalidate_favorites_cache(current_user.id)
 
     logger.info(f"[STAR] User {current_user.id} favorited trend {data.trend_id}")
 
-    # Build response with trend data
-    trend_summary = TrendSummary(
-        id=trend.id,
-        platform_id=trend.platform_id,
-        url=trend.url,
-        description=trend.description,
-        cover_url=trend.cover_url,
-        author_username=trend.author_username,
-        uts_score=trend.uts_score or 0.0,
-        stats=trend.stats or {}
-    )
-
-    return FavoriteResponse(
-        id=favorite.id,
-        user_id=favorite.user_id,
-        trend_id=favorite.trend_id,
-        notes=favorite.notes,
-        tags=favorite.tags or [],
-        created_at=favorite.created_at,
-        trend=trend_summary
-    )
+    return _favorite_response(favorite, _trend_summary(trend))
 
 
 @router.get("/{favorite_id}", response_model=FavoriteResponse)
-def get_favorite(
+async def get_favorite(
     favorite_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific favorite by ID.
 
     User Isolation: Only returns if favorite belongs to authenticated user.
     """
-    favorite = db.query(UserFavorite).filter(
+    favorite = await db.scalar(select(UserFavorite).where(
         UserFavorite.id == favorite_id,
         UserFavorite.user_id == current_user.id
-    ).options(joinedload(UserFavorite.trend)).first()
+    ).options(joinedload(UserFavorite.trend)))
 
     if not favorite:
         raise HTTPException(
@@ -197,46 +242,25 @@ def get_favorite(
             detail="Favorite not found"
         )
 
-    trend_summary = None
-    if favorite.trend:
-        trend_summary = TrendSummary(
-            id=favorite.trend.id,
-            platform_id=favorite.trend.platform_id,
-            url=favorite.trend.url,
-            description=favorite.trend.description,
-            cover_url=favorite.trend.cover_url,
-            author_username=favorite.trend.author_username,
-            uts_score=favorite.trend.uts_score or 0.0,
-            stats=favorite.trend.stats or {}
-        )
-
-    return FavoriteResponse(
-        id=favorite.id,
-        user_id=favorite.user_id,
-        trend_id=favorite.trend_id,
-        notes=favorite.notes,
-        tags=favorite.tags or [],
-        created_at=favorite.created_at,
-        trend=trend_summary
-    )
+    return _favorite_response(favorite, _trend_summary(favorite.trend) if favorite.trend else None)
 
 
 @router.patch("/{favorite_id}", response_model=FavoriteResponse)
-def update_favorite(
+async def update_favorite(
     favorite_id: int,
     data: FavoriteUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a favorite's notes or tags.
 
     User Isolation: Only updates if favorite belongs to authenticated user.
     """
-    favorite = db.query(UserFavorite).filter(
+    favorite = await db.scalar(select(UserFavorite).where(
         UserFavorite.id == favorite_id,
         UserFavorite.user_id == current_user.id
-    ).options(joinedload(UserFavorite.trend)).first()
+    ).options(joinedload(UserFavorite.trend)))
 
     if not favorite:
         raise HTTPException(
@@ -250,50 +274,29 @@ def update_favorite(
     if data.tags is not None:
         favorite.tags = data.tags
 
-    db.commit()
-    db.refresh(favorite)
+    await db.commit()
+    await invalidate_favorites_cache(current_user.id)
 
     logger.info(f"[NOTE] User {current_user.id} updated favorite {favorite_id}")
 
-    trend_summary = None
-    if favorite.trend:
-        trend_summary = TrendSummary(
-            id=favorite.trend.id,
-            platform_id=favorite.trend.platform_id,
-            url=favorite.trend.url,
-            description=favorite.trend.description,
-            cover_url=favorite.trend.cover_url,
-            author_username=favorite.trend.author_username,
-            uts_score=favorite.trend.uts_score or 0.0,
-            stats=favorite.trend.stats or {}
-        )
-
-    return FavoriteResponse(
-        id=favorite.id,
-        user_id=favorite.user_id,
-        trend_id=favorite.trend_id,
-        notes=favorite.notes,
-        tags=favorite.tags or [],
-        created_at=favorite.created_at,
-        trend=trend_summary
-    )
+    return _favorite_response(favorite, _trend_summary(favorite.trend) if favorite.trend else None)
 
 
 @router.delete("/{favorite_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_favorite(
+async def delete_favorite(
     favorite_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Remove a trend from favorites.
 
     User Isolation: Only deletes if favorite belongs to authenticated user.
     """
-    favorite = db.query(UserFavorite).filter(
+    favorite = await db.scalar(select(UserFavorite).where(
         UserFavorite.id == favorite_id,
         UserFavorite.user_id == current_user.id
-    ).first()
+    ))
 
     if not favorite:
         raise HTTPException(
@@ -301,8 +304,9 @@ def delete_favorite(
             detail="Favorite not found"
         )
 
-    db.delete(favorite)
-    db.commit()
+    await db.delete(favorite)
+    await db.commit()
+    await invalidate_favorites_cache(current_user.id)
 
     logger.info(f"[DELETE] User {current_user.id} removed favorite {favorite_id}")
 
@@ -312,50 +316,46 @@ def delete_favorite(
 # =============================================================================
 
 @router.post("/bulk", response_model=BulkOperationResult)
-def bulk_add_favorites(
+async def bulk_add_favorites(
     data: BulkFavoriteCreate,
-    current_user: User = Depends(check_rate_limit),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(check_rate_limit_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add multiple trends to favorites at once.
 
     User Isolation: All trends must belong to authenticated user.
+    Two statements regardless of batch size: one existence check, one
+    INSERT ... ON CONFLICT DO NOTHING that reports what it actually inserted.
     """
-    success_count = 0
-    failed_count = 0
-    errors = []
-
-    for trend_id in data.trend_ids:
-        # Check if trend exists (user can favorite any trend they can see)
-        trend = db.query(Trend).filter(Trend.id == trend_id).first()
+    trend_ids = list(dict.fromkeys(data.trend_ids))  # de-duplicated, request order kept
+
+    # Check which trends exist (user can favorite any trend they can see)
+    valid_ids = set((await db.scalars(select(Trend.id).where(Trend.id.in_(trend_ids)))).all())
+
+    rows = [
+        {"user_id": current_user.id, "trend_id": trend_id, "tags": data.tags or []}
+        for trend_id in trend_ids if trend_id in valid_ids
+    ]
+    added_ids = set()
+    if rows:
+        # Already-favorited trends hit uix_favorite_user_trend and are skipped
+        added_ids = set((await db.execute(
+            pg_insert(UserFavorite).values(rows)
+            .on_conflict_do_nothing(index_elements=["user_id", "trend_id"])
+            .returning(UserFavorite.trend_id)
+        )).scalars())
+    await db.commit()
+    await invalidate_favorites_cache(current_user.id)
 
-        if not trend:
-            failed_count += 1
+    errors = []
+    for trend_id in trend_ids:
+        if trend_id not in valid_ids:
             errors.append(f"Trend {trend_id} not found")
-            continue
-
-        # Check if already favorited
-        existing = db.query(UserFavorite).filter(
-            UserFavorite.user_id == current_user.id,
-            UserFavorite.trend_id == trend_id
-        ).first()
-
-        if existing:
-            failed_count += 1
+        elif trend_id not in added_ids:
             errors.append(f"Trend {trend_id} already in favorites")
-            continue
-
-        # Create favorite
-        favorite = UserFavorite(
-            user_id=current_user.id,
-            trend_id=trend_id,
-            tags=data.tags or []
-        )
-        db.add(favorite)
-        success_count += 1
-
-    db.commit()
+    success_count = len(added_ids)
+    failed_count = len(errors)
 
     logger.info(f"[STAR] User {current_user.id} bulk added {success_count} favorites")
 
@@ -367,35 +367,31 @@ def bulk_add_favorites(
 
 
 @router.delete("/bulk", response_model=BulkOperationResult)
-def bulk_delete_favorites(
+async def bulk_delete_favorites(
     data: BulkFavoriteDelete,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Remove multiple favorites at once.
 
     User Isolation: Only deletes favorites belonging to authenticated user.
+    One DELETE ... RETURNING id; ids it didn't return were not found.
     """
-    success_count = 0
-    failed_count = 0
-    errors = []
-
-    for favorite_id in data.favorite_ids:
-        favorite = db.query(UserFavorite).filter(
-            UserFavorite.id == favorite_id,
-            UserFavorite.user_id == current_user.id
-        ).first()
+    favorite_ids = list(dict.fromkeys(data.favorite_ids))
 
-        if not favorite:
-            failed_count += 1
-            errors.append(f"Favorite {favorite_id} not found")
-            continue
+    deleted_ids = set((await db.execute(
+        delete(UserFavorite)
+        .where(UserFavorite.id.in_(favorite_ids), UserFavorite.user_id == current_user.id)
+        .returning(UserFavorite.id)
+        .execution_options(synchronize_session=False)
+    )).scalars())
+    await db.commit()
+    await invalidate_favorites_cache(current_user.id)
 
-        db.delete(favorite)
-        success_count += 1
-
-    db.commit()
+    errors = [f"Favorite {favorite_id} not found" for favorite_id in favorite_ids if favorite_id not in deleted_ids]
+    success_count = len(deleted_ids)
+    failed_count = len(errors)
 
     logger.info(f"[DELETE] User {current_user.id} bulk removed {success_count} favorites")
 
@@ -411,42 +407,47 @@ def bulk_delete_favorites(
 # =============================================================================
 
 @router.get("/tags/all", response_model=List[str])
-def get_all_tags(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_all_tags(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all unique tags used by the user in favorites.
-    """
-    favorites = db.query(UserFavorite).filter(
-        UserFavorite.user_id == current_user.id
-    ).all()
 
-    all_tags = set()
-    for fav in favorites:
-        if fav.tags:
-            all_tags.update(fav.tags)
-
-    return sorted(list(all_tags))
+    Unnested and de-duplicated in Postgres, so only the distinct tag strings
+    come back instead of every favorite's tag list. COLLATE "C" keeps the
+    codepoint order the endpoint always returned.
+    """
+    tag = func.jsonb_array_elements_text(UserFavorite.tags).collate("C").label("tag")
+    tags = await db.scalars(
+        select(tag)
+        .where(
+            UserFavorite.user_id == current_user.id,
+            func.jsonb_typeof(UserFavorite.tags) == "array",
+        )
+        .distinct()
+        .order_by(tag)
+    )
+    return tags.all()
 
 
 @router.get("/check/{trend_id}")
-def check_if_favorited(
+async def check_if_favorited(
     trend_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Check if a specific trend is in user's favorites.
     """
-    favorite = db.query(UserFavorite).filter(
+    favorite_id = await db.scalar(select(UserFavorite.id).where(
         UserFavorite.user_id == current_user.id,
         UserFavorite.trend_id == trend_id
-    ).first()
+    ))
 
     return {
-        "is_favorited": favorite is not None,
-        "favorite_id": favorite.id if favorite else None
+        "is_favorited": favorite_id is not None,
+        "favorite_id": favorite_id
     }
 
 
@@ -470,10 +471,10 @@ class SaveVideoRequest(BaseModel):
 
 
 @router.post("/save-video", status_code=status.HTTP_201_CREATED)
-def save_video_to_favorites(
+async def save_video_to_favorites(
     data: SaveVideoRequest,
-    current_user: User = Depends(check_rate_limit),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(check_rate_limit_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Save a video to DB + favorites in one step.
@@ -484,10 +485,10 @@ def save_video_to_favorites(
         logger.info(f"[DOWNLOAD] save-video request: platform_id={data.platform_id}, user={current_user.id}")
 
         # Check if trend already exists for this user
-        existing_trend = db.query(Trend).filter(
+        existing_trend = await db.scalar(select(Trend).where(
             Trend.platform_id == data.platform_id,
             Trend.user_id == current_user.id
-        ).first()
+        ))
 
         if existing_trend:
             trend = existing_trend
@@ -514,16 +515,18 @@ def save_video_to_favorites(
                 is_deep_scan=False,
             )
             db.add(trend)
-            db.flush()
+            await db.flush()
 
         # Check if already favorited
-        existing_fav = db.query(UserFavorite).filter(
+        existing_fav = await db.scalar(select(UserFavorite).where(
             UserFavorite.user_id == current_user.id,
             UserFavorite.trend_id == trend.id
-        ).first()
+        ))
 
         if existing_fav:
-            db.commit()
+            await db.commit()
+            # The trend's stats/cover may have changed
+            await invalidate_favorites_cache(current_user.id)
             return {
                 "id": existing_fav.id,
                 "trend_id": trend.id,
@@ -539,7 +542,8 @@ def save_video_to_favorites(
             project_id=data.project_id
         )
         db.add(favorite)
-        db.commit()
+        await db.commit()
+        await invalidate_favorites_cache(current_user.id)
 
         logger.info(f"[STAR] User {current_user.id} saved video {data.platform_id} to favorites")
 
@@ -549,6 +553,6 @@ def save_video_to_favorites(
             "message": "Video saved!"
         }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"[ERROR] save-video failed for user {current_user.id}: {type(e).__name__}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to save video: {str(e)}")
@@ -0,0 +1,29 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is the opaque, URL-safe encoding of the (timestamp, id) of the last
+row on a page; the next page is everything strictly after it in the list's
+(timestamp, id) order, which is an index range scan instead of an OFFSET.
+"""
+import base64
+import binascii
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(ts: datetime, row_id: int) -> str:
+    """Opaque keyset cursor for the (timestamp, id) of the last row on a page."""
+    return base64.urlsafe_b64encode(f"{ts.isoformat()}|{row_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Inverse of encode_cursor; a malformed cursor is a 400, not a 500."""
+    try:
+        ts, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(ts), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
@@ -14,18 +14,27 @@ import asyncio
 from datetime import datetime
 from typing import Optional
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.database import get_db
+from ..core.database import get_async_db
+from ..core.http_client import get_shared_async_http_client
 from ..db.models import Project, User, Competitor, UserFavorite
-from ..api.dependencies import get_current_user, CreditManager
+from ..api.dependencies import get_current_user_async, CreditManager
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Created on first use and reused; the single event loop makes a lock unnecessary
+_gemini_client = None
+
+TRANSCRIBE_MAX_BYTES = 25 * 1024 * 1024
+TRANSCRIBE_READ_CHUNK = 1024 * 1024
+
 
 # =============================================================================
 # SCHEMAS
@@ -57,33 +66,60 @@ class ProjectResponse(BaseModel):
     competitors_count: int = 0
     favorites_count: int = 0
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # =============================================================================
 # HELPERS
 # =============================================================================
 
-def _get_user_project(project_id: int, user: User, db: Session) -> Project:
+async def _get_user_project(project_id: int, user: User, db: AsyncSession) -> Project:
     """Get project owned by user or raise 404."""
-    project = db.query(Project).filter(
+    project = await db.scalar(select(Project).where(
         Project.id == project_id,
         Project.user_id == user.id
-    ).first()
+    ))
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
 
-def _project_to_response(project: Project, db: Session) -> dict:
-    """Convert Project model to response dict with counts."""
-    competitors_count = db.query(Competitor).filter(
-        Competitor.project_id == project.id
-    ).count()
-    favorites_count = db.query(UserFavorite).filter(
-        UserFavorite.project_id == project.id
-    ).count()
+# Correlated per-project counts, selected alongside Project so a list is one
+# statement instead of 1 + 2N (separate subqueries avoid the competitors x
+# favorites row blow-up a double outer join would cause).
+_COMPETITORS_COUNT = (
+    select(func.count(Competitor.id))
+    .where(Competitor.project_id == Project.id)
+    .correlate(Project)
+    .scalar_subquery()
+    .label("competitors_count")
+)
+_FAVORITES_COUNT = (
+    select(func.count(UserFavorite.id))
+    .where(UserFavorite.project_id == Project.id)
+    .correlate(Project)
+    .scalar_subquery()
+    .label("favorites_count")
+)
+
+
+async def _list_projects_with_counts(user_id: int, db: AsyncSession, status_filter: Optional[str] = None) -> list:
+    """(Project, competitors_count, favorites_count) rows for a user, newest first."""
+    query = select(Project, _COMPETITORS_COUNT, _FAVORITES_COUNT).where(Project.user_id == user_id)
+    if status_filter:
+        query = query.where(Project.status == status_filter)
+    return (await db.execute(query.order_by(Project.updated_at.desc()))).all()
+
+
+async def _project_counts(project_id: int, db: AsyncSession) -> tuple:
+    """(competitors_count, favorites_count) for one project in a single round-trip."""
+    return (await db.execute(
+        select(_COMPETITORS_COUNT, _FAVORITES_COUNT).select_from(Project).where(Project.id == project_id)
+    )).one()
+
+
+def _project_to_response(project: Project, competitors_count: int = 0, favorites_count: int = 0) -> dict:
+    """Convert Project model to response dict with (pre-computed) counts."""
     return {
         "id": project.id,
         "name": project.name,
@@ -99,16 +135,23 @@ def _project_to_response(project: Project, db: Session) -> dict:
 
 
 def _get_gemini_client():
-    """Get Gemini client for profile generation."""
-    api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_GENAI_API_KEY")
-    if not api_key or api_key.startswith("your_"):
-        return None
-    try:
-        from google import genai
-        return genai.Client(api_key=api_key)
-    except Exception as e:
-        logger.error(f"Failed to init Gemini: {e}")
-        return None
+    """Get or create the Gemini client for profile generation."""
+    global _gemini_client
+    if _gemini_client is None:
+        api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_GENAI_API_KEY")
+        if not api_key or api_key.startswith("your_"):
+            return None
+        try:
+            from google import genai
+            from google.genai import types
+            _gemini_client = genai.Client(
+                api_key=api_key,
+                http_options=types.HttpOptions(httpx_async_client=get_shared_async_http_client())
+            )
+        except Exception as e:
+            logger.error(f"Failed to init Gemini: {e}")
+            return None
+    return _gemini_client
 
 
 # =============================================================================
@@ -118,22 +161,19 @@ def _get_gemini_client():
 @router.get("/")
 async def list_projects(
     status_filter: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List all projects for the current user."""
-    query = db.query(Project).filter(Project.user_id == current_user.id)
-    if status_filter:
-        query = query.filter(Project.status == status_filter)
-    projects = query.order_by(Project.updated_at.desc()).all()
-    return [_project_to_response(p, db) for p in projects]
+    rows = await _list_projects_with_counts(current_user.id, db, status_filter)
+    return [_project_to_response(p, competitors_count, favorites_count) for p, competitors_count, favorites_count in rows]
 
 
 @router.post("/", status_code=201)
 async def create_project(
     data: ProjectCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new project (step 1 of onboarding)."""
     project = Project(
@@ -145,31 +185,30 @@ async def create_project(
         raw_input={},
     )
     db.add(project)
-    db.commit()
-    db.refresh(project)
-    return _project_to_response(project, db)
+    await db.commit()
+    return _project_to_response(project)
 
 
 @router.get("/{project_id}")
 async def get_project(
     project_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get project details."""
-    project = _get_user_project(project_id, current_user, db)
-    return _project_to_response(project, db)
+    project = await _get_user_project(project_id, current_user, db)
+    return _project_to_response(project, *await _project_counts(project.id, db))
 
 
 @router.patch("/{project_id}")
 async def update_project(
     project_id: int,
     data: ProjectUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update project fields."""
-    project = _get_user_project(project_id, current_user, db)
+    project = await _get_user_project(project_id, current_user, db)
 
     if data.name is not None:
         project.name = data.name
@@ -183,21 +222,20 @@ async def update_project(
         project.profile_data = data.profile_data
 
     project.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(project)
-    return _project_to_response(project, db)
+    await db.commit()
+    return _project_to_response(project, *await _project_counts(project.id, db))
 
 
 @router.delete("/{project_id}")
 async def delete_project(
     project_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a project. Competitors/favorites are unlinked (SET NULL)."""
-    project = _get_user_project(project_id, current_user, db)
-    db.delete(project)
-    db.commit()
+    project = await _get_user_project(project_id, current_user, db)
+    await db.delete(project)
+    await db.commit()
     return {"detail": "Project deleted"}
 
 
@@ -209,14 +247,14 @@ async def delete_project(
 async def generate_profile(
     project_id: int,
     data: GenerateProfileRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Generate AI content profile from form data + text description.
     Costs 2 credits.
     """
-    project = _get_user_project(project_id, current_user, db)
+    project = await _get_user_project(project_id, current_user, db)
 
     # Check credits
     await CreditManager.check_and_deduct("project_generate_profile", current_user, db)
@@ -274,7 +312,7 @@ Return ONLY valid JSON, no other text."""
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                response = client.models.generate_content(
+                response = await client.aio.models.generate_content(
                     model="gemini-2.0-flash",
                     contents=prompt,
                     config={"temperature": 0.0}
@@ -298,24 +336,23 @@ Return ONLY valid JSON, no other text."""
 
     project.profile_data = profile
     project.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(project)
-    return _project_to_response(project, db)
+    await db.commit()
+    return _project_to_response(project, *await _project_counts(project.id, db))
 
 
 @router.post("/{project_id}/generate-questions")
 async def generate_questions(
     project_id: int,
     data: GenerateProfileRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Generate personalized open-ended questions based on Step 1 form data.
     AI creates 5 targeted questions to deeply understand the creator's content profile.
     Costs 1 credit.
     """
-    project = _get_user_project(project_id, current_user, db)
+    project = await _get_user_project(project_id, current_user, db)
 
     # Check credits
     await CreditManager.check_and_deduct("project_generate_questions", current_user, db)
@@ -363,7 +400,7 @@ Return ONLY a valid JSON array of 5 strings, no other text:
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            response = client.models.generate_content(
+            response = await client.aio.models.generate_content(
                 model="gemini-2.0-flash",
                 contents=prompt,
                 config={"temperature": 0.7}
@@ -394,22 +431,17 @@ Return ONLY a valid JSON array of 5 strings, no other text:
 async def transcribe_audio(
     project_id: int,
     audio: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Transcribe audio file to text using Gemini.
     Costs 1 credit. Supports webm, mp3, wav, ogg, m4a.
     """
-    project = _get_user_project(project_id, current_user, db)
-
-    # Check credits
-    await CreditManager.check_and_deduct("project_transcribe", current_user, db)
+    project = await _get_user_project(project_id, current_user, db)
 
-    # Read audio data
-    audio_data = await audio.read()
-    if len(audio_data) > 25 * 1024 * 1024:  # 25MB limit
-        raise HTTPException(status_code=400, detail="Audio file too large (max 25MB)")
+    # Read audio data (size-checked before any credit is taken)
+    audio_data = await _read_upload_limited(audio, TRANSCRIBE_MAX_BYTES)
 
     # Determine mime type
     content_type = audio.content_type or "audio/webm"
@@ -427,13 +459,16 @@ async def transcribe_audio(
     if not client:
         raise HTTPException(status_code=503, detail="AI service unavailable")
 
+    # Check credits
+    await CreditManager.check_and_deduct("project_transcribe", current_user, db)
+
     try:
         # Send audio as inline data (no file upload needed)
         from google.genai import types
 
         audio_part = types.Part.from_bytes(data=audio_data, mime_type=mime_type)
 
-        response = client.models.generate_content(
+        response = await client.aio.models.generate_content(
             model="gemini-2.0-flash",
             contents=[
                 audio_part,
@@ -453,17 +488,36 @@ async def transcribe_audio(
 # HELPERS
 # =============================================================================
 
+_JSON_FENCE_RE = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+
+
+async def _read_upload_limited(upload: UploadFile, limit: int) -> bytes:
+    """Read an upload in chunks, failing with 400 as soon as it exceeds `limit` bytes."""
+    too_large = HTTPException(status_code=400, detail=f"Audio file too large (max {limit // (1024 * 1024)}MB)")
+    # The spooled upload's size is known up front; reject without reading it
+    if upload.size is not None and upload.size > limit:
+        raise too_large
+    data = bytearray()
+    while chunk := await upload.read(TRANSCRIBE_READ_CHUNK):
+        data += chunk
+        if len(data) > limit:
+            raise too_large
+    return bytes(data)
+
+
 def _parse_json_response(text: str) -> Optional[dict]:
     """Extract JSON from AI response."""
     try:
         # Try ```json ... ``` block
-        match = re.search(r'```json\s*(.*?)\s*```', text, re.DOTALL)
+        match = _JSON_FENCE_RE.search(text)
         if match:
-            return json.loads(match.group(1))
+            return orjson.loads(match.group(1))
         # Try raw JSON
-        match = re.search(r'\{.*\}', text, re.DOTALL)
+        match = _JSON_OBJECT_RE.search(text)
         if match:
-            return json.loads(match.group(0))
+            return orjson.loads(match.group(0))
     except (json.JSONDecodeError, Exception) as e:
         logger.warning(f"Failed to parse JSON: {e}")
     return None
@@ -500,12 +554,12 @@ def _fallback_profile(form_data: dict, description: str) -> dict:
 def _parse_json_response_array(text: str) -> Optional[list]:
     """Extract JSON array from AI response."""
     try:
-        match = re.search(r'```json\s*(.*?)\s*```', text, re.DOTALL)
+        match = _JSON_FENCE_RE.search(text)
         if match:
-            return json.loads(match.group(1))
-        match = re.search(r'\[.*\]', text, re.DOTALL)
+            return orjson.loads(match.group(1))
+        match = _JSON_ARRAY_RE.search(text)
         if match:
-            return json.loads(match.group(0))
+            return orjson.loads(match.group(0))
     except (json.JSONDecodeError, Exception) as e:
         logger.warning(f"Failed to parse JSON array: {e}")
     return None
@@ -6,7 +6,7 @@ import os
 import httpx
 import logging
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from datetime import datetime
@@ -98,8 +98,7 @@ class FeedbackResponse(BaseModel):
     rating: Optional[int]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class FeedbackAdminUpdate(BaseModel):
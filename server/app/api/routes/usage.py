@@ -7,11 +7,13 @@ Real AI usage tracking will be implemented when AI models are integrated.
 """
 import logging
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...core.database import get_db
+from ...core.cache import get_cache
+from ...core.database import get_async_db
+from ...core.responses import json_etag_response
 from ...db.models import User, UserSettings, UserScript, ChatMessage
 from ..schemas.usage import (
     UsageResponse,
@@ -21,7 +23,7 @@ from ..schemas.usage import (
     AutoModeToggleRequest,
     AutoModeToggleResponse
 )
-from ..dependencies import get_current_user
+from ..dependencies import get_current_user_async
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/usage", tags=["Usage"])
@@ -38,6 +40,19 @@ PLAN_CREDITS = {
     "agency": 10000
 }
 
+# Serialized usage page per user; credit mutations drop it, new scripts and
+# messages show up within the TTL
+USAGE_CACHE_TTL = 60
+
+
+def _usage_cache_key(user_id: int) -> str:
+    return f"usage:{user_id}"
+
+
+async def invalidate_usage_cache(user_id: int) -> None:
+    """Drop the user's cached usage stats."""
+    await get_cache().delete(_usage_cache_key(user_id))
+
 
 def get_next_reset_date() -> str:
     """
@@ -59,8 +74,9 @@ def get_next_reset_date() -> str:
 
 @router.get("", response_model=UsageResponse)
 async def get_usage_stats(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get comprehensive usage statistics for the current user.
@@ -73,19 +89,27 @@ async def get_usage_stats(
 
     NOTE: Beta version with mock data for bonus/rollover credits and savings.
     Real tracking will be implemented with AI model integration.
+
+    Cached per user for USAGE_CACHE_TTL seconds.
     """
+    cache = get_cache()
+    cache_key = _usage_cache_key(current_user.id)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return json_etag_response(request, cached)
+
     try:
         # Get user settings (for auto_mode - will be added to DB later)
-        settings = db.query(UserSettings).filter(
+        settings = await db.scalar(select(UserSettings).where(
             UserSettings.user_id == current_user.id
-        ).first()
+        ))
 
         if not settings:
             # Create default settings if not exist
             settings = UserSettings(user_id=current_user.id)
             db.add(settings)
-            db.commit()
-            db.refresh(settings)
+            await db.commit()
+            await db.refresh(settings)
 
         # Get plan-based credit limit (from DB)
         plan = current_user.subscription_tier.value
@@ -104,16 +128,17 @@ async def get_usage_stats(
         now = datetime.utcnow()
         month_start = datetime(now.year, now.month, 1)
 
-        # Query both counts in parallel (more efficient than separate queries)
-        scripts_count = db.query(func.count(UserScript.id)).filter(
-            UserScript.user_id == current_user.id,
-            UserScript.created_at >= month_start
-        ).scalar() or 0
-
-        messages_count = db.query(func.count(ChatMessage.id)).filter(
-            ChatMessage.user_id == current_user.id,
-            ChatMessage.created_at >= month_start
-        ).scalar() or 0
+        # Both counts as scalar subqueries of one SELECT (one round-trip)
+        scripts_count, messages_count = (await db.execute(select(
+            select(func.count(UserScript.id)).where(
+                UserScript.user_id == current_user.id,
+                UserScript.created_at >= month_start
+            ).scalar_subquery(),
+            select(func.count(ChatMessage.id)).where(
+                ChatMessage.user_id == current_user.id,
+                ChatMessage.created_at >= month_start
+            ).scalar_subquery(),
+        ))).one()
 
         # Deep analyze count (mock for beta - will track separately)
         deep_analyze_count = 2 if plan in ["pro", "agency"] else 0
@@ -125,7 +150,7 @@ async def get_usage_stats(
         # Real calculation: count times auto-mode chose cheaper model
         savings = int(scripts_count * 4.5) if auto_mode_enabled else 0
 
-        return UsageResponse(
+        result = UsageResponse(
             plan=plan,
             reset_date=get_next_reset_date(),
             credits=CreditsInfo(
@@ -145,6 +170,9 @@ async def get_usage_stats(
                 savings=savings
             )
         )
+        body = result.model_dump_json()
+        await cache.set(cache_key, body, ttl=USAGE_CACHE_TTL)
+        return json_etag_response(request, body)
 
     except Exception as e:
         logger.error(f"Error fetching usage stats for user {current_user.id}: {e}")
@@ -157,8 +185,8 @@ async def get_usage_stats(
 @router.post("/auto-mode", response_model=AutoModeToggleResponse)
 async def toggle_auto_mode(
     request: AutoModeToggleRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Toggle Auto Mode for AI model selection.
@@ -186,9 +214,9 @@ async def toggle_auto_mode(
             )
 
         # Get or create user settings
-        settings = db.query(UserSettings).filter(
+        settings = await db.scalar(select(UserSettings).where(
             UserSettings.user_id == current_user.id
-        ).first()
+        ))
 
         if not settings:
             settings = UserSettings(user_id=current_user.id)
@@ -196,7 +224,8 @@ async def toggle_auto_mode(
 
         # Update auto_mode in database
         settings.ai_auto_mode = request.enabled
-        db.commit()
+        await db.commit()
+        await invalidate_usage_cache(current_user.id)
 
         message = "Auto Mode enabled successfully" if request.enabled else "Auto Mode disabled successfully"
 
@@ -213,7 +242,7 @@ async def toggle_auto_mode(
         raise
     except Exception as e:
         logger.error(f"Error toggling auto mode for user {current_user.id}: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to toggle Auto Mode: {str(e)}"
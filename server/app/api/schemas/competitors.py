@@ -168,14 +168,29 @@ class CompetitorResponse(BaseModel):
 
     model_config = {"from_attributes": True}
 
+    @classmethod
+    def from_competitor(cls, competitor) -> "CompetitorResponse":
+        """
+        Build from a Competitor row without validation (values come from typed
+        DB columns). NULL metric/tag columns fall back to the field defaults.
+        """
+        values = {}
+        for name, field in cls.model_fields.items():
+            value = getattr(competitor, name)
+            if value is None and not field.is_required() and field.default is not None:
+                value = field.get_default(call_default_factory=True)
+            values[name] = value
+        return cls.model_construct(**values)
+
 
 class CompetitorListResponse(BaseModel):
     """Paginated list of competitors."""
     items: List[CompetitorResponse]
-    total: int
+    total: Optional[int] = None  # Not counted on cursor pages
     page: int = 1
     per_page: int = 20
     has_more: bool = False
+    next_cursor: Optional[str] = None  # Pass back as `cursor` for the next page
 
 
 # =============================================================================
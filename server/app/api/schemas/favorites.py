@@ -126,10 +126,11 @@ class FavoriteResponse(BaseModel):
 class FavoriteListResponse(BaseModel):
     """Paginated list of favorites."""
     items: List[FavoriteResponse]
-    total: int
+    total: Optional[int] = None  # Not counted on cursor pages
     page: int = 1
     per_page: int = 20
     has_more: bool = False
+    next_cursor: Optional[str] = None  # Pass back as `cursor` for the next page
 
 
 # =============================================================================
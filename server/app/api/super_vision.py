@@ -13,6 +13,7 @@ from sqlalchemy import desc
 
 from ..core.database import get_db
 from ..api.dependencies import get_current_user, require_pro
+from ..api.favorites import invalidate_favorites_cache
 from ..db.models import (
     User, Project, SuperVisionConfig, SuperVisionResult,
     SuperVisionStatus, SubscriptionTier, Trend, UserFavorite
@@ -461,6 +462,7 @@ async def save_result(
 
         result.is_saved = True
         db.commit()
+        await invalidate_favorites_cache(current_user.id)
         logger.info(f"[SV] User {current_user.id} saved result {result_id} (trend_id={trend.id})")
         return {"message": "Result saved", "trend_id": trend.id}
 
@@ -499,6 +501,7 @@ async def unsave_result(
 
         result.is_saved = False
         db.commit()
+        await invalidate_favorites_cache(current_user.id)
         logger.info(f"[SV] User {current_user.id} unsaved result {result_id}")
         return {"message": "Result unsaved"}
 
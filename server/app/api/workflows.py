@@ -7,7 +7,7 @@ Supports per-node model selection (Gemini, Claude, GPT-4).
 from datetime import datetime
 from pathlib import Path
 from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any, List
 from sqlalchemy.orm import Session
 import logging
@@ -131,8 +131,7 @@ class Connection(BaseModel):
     from_node: int = Field(alias="from")
     to_node: int = Field(alias="to")
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class WorkflowExecuteRequest(BaseModel):
@@ -203,8 +202,7 @@ class WorkflowResponse(BaseModel):
     created_at: str
     updated_at: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class WorkflowListItem(BaseModel):
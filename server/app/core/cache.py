@@ -0,0 +1,256 @@
+"""
+Caching helpers.
+
+TTLCache is a per-process LRU+TTL cache for objects that can't be shared
+(e.g. SDK chat handles). ByteTTLCache is the same idea for byte values,
+bounded by total size. AsyncCache stores strings (and, separately, raw
+bytes) and uses Redis when REDIS_URL is set, so entries are shared across
+workers.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry time-to-live.
+
+    Entries expire `ttl` seconds after they were last written; when the cache
+    is full the least recently used entry is evicted.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 1800):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or `default` if missing or expired."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def add(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        """Store a value only if the key is absent (or expired); True if stored."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] >= now:
+                return False
+            self._data[key] = (now + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return True
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove and return a value."""
+        with self._lock:
+            item = self._data.pop(key, None)
+            return default if item is None else item[1]
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Remove every entry whose (string) key starts with `prefix`."""
+        with self._lock:
+            keys = [k for k in self._data if isinstance(k, str) and k.startswith(prefix)]
+            for k in keys:
+                del self._data[k]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ByteTTLCache:
+    """
+    Thread-safe LRU+TTL cache for bytes, bounded by the total size of the
+    stored values rather than by entry count. Values larger than the whole
+    budget are not stored.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, ttl: float = 1800):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._size = 0
+        self._data: "OrderedDict[Hashable, tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _drop(self, key: Hashable) -> None:
+        _, value = self._data.pop(key)
+        self._size -= len(value)
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[0] < time.monotonic():
+                self._drop(key)
+                return None
+            self._data.move_to_end(key)
+            return item[1]
+
+    def set(self, key: Hashable, value: bytes, ttl: Optional[float] = None) -> None:
+        if len(value) > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (expires_at, value)
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                self._drop(next(iter(self._data)))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def make_cache_key(namespace: str, *parts: Any) -> str:
+    """Build a content-addressed key: namespace + SHA-256 of the joined parts."""
+    digest = hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+class AsyncCache:
+    """
+    Async string cache shared by the API layer.
+
+    Uses Redis when REDIS_URL is set (shared across workers), otherwise falls
+    back to an in-process TTLCache. Cache errors never break a request.
+    Byte values (get_bytes/set_bytes) go through a non-decoding Redis client
+    and a local fallback capped at `bytes_max_total` bytes per process, since
+    they can be much larger than strings.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, maxsize: int = 4096, default_ttl: float = 300,
+                 bytes_max_total: int = 32 * 1024 * 1024):
+        self.default_ttl = default_ttl
+        self._local = TTLCache(maxsize=maxsize, ttl=default_ttl)
+        self._local_bytes = ByteTTLCache(max_bytes=bytes_max_total, ttl=default_ttl)
+        self._redis = None
+        self._redis_bytes = None
+        if redis_url:
+            try:
+                import redis.asyncio as aioredis
+                self._redis = aioredis.from_url(redis_url, decode_responses=True)
+                self._redis_bytes = aioredis.from_url(redis_url)
+                logger.info("[CACHE] Using Redis backend")
+            except Exception as e:
+                logger.warning("[CACHE] Redis unavailable, using in-memory cache: %s", e)
+
+    async def get(self, key: str) -> Optional[str]:
+        if self._redis is not None:
+            try:
+                return await self._redis.get(key)
+            except Exception as e:
+                logger.warning("[CACHE] Redis get failed: %s", e)
+        return self._local.get(key)
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, value, ex=int(ttl))
+                return
+            except Exception as e:
+                logger.warning("[CACHE] Redis set failed: %s", e)
+        self._local.set(key, value, ttl)
+
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        if self._redis_bytes is not None:
+            try:
+                return await self._redis_bytes.get(key)
+            except Exception as e:
+                logger.warning("[CACHE] Redis get_bytes failed: %s", e)
+        return self._local_bytes.get(key)
+
+    async def set_bytes(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        if self._redis_bytes is not None:
+            try:
+                await self._redis_bytes.set(key, value, ex=int(ttl))
+                return
+            except Exception as e:
+                logger.warning("[CACHE] Redis set_bytes failed: %s", e)
+        self._local_bytes.set(key, value, ttl)
+
+    async def add(self, key: str, value: str, ttl: Optional[float] = None) -> bool:
+        """SET NX: store only if the key doesn't exist. Usable as a short-lived lock."""
+        ttl = self.default_ttl if ttl is None else ttl
+        if self._redis is not None:
+            try:
+                return bool(await self._redis.set(key, value, ex=int(ttl), nx=True))
+            except Exception as e:
+                logger.warning("[CACHE] Redis add failed: %s", e)
+        return self._local.add(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._local.pop(key)
+        if self._redis is not None and keys:
+            try:
+                await self._redis.unlink(*keys)
+            except Exception as e:
+                logger.warning("[CACHE] Redis delete failed: %s", e)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        """Drop all keys starting with `prefix` (SCAN + UNLINK on Redis, never KEYS)."""
+        self._local.delete_prefix(prefix)
+        if self._redis is not None:
+            try:
+                batch = []
+                async for key in self._redis.scan_iter(match=f"{prefix}*", count=500):
+                    batch.append(key)
+                    if len(batch) >= 500:
+                        await self._redis.unlink(*batch)
+                        batch = []
+                if batch:
+                    await self._redis.unlink(*batch)
+            except Exception as e:
+                logger.warning("[CACHE] Redis delete_prefix failed: %s", e)
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+        if self._redis_bytes is not None:
+            await self._redis_bytes.aclose()
+
+
+_cache: Optional[AsyncCache] = None
+
+
+def get_cache() -> AsyncCache:
+    """Get or create the shared cache (Redis if REDIS_URL is configured)."""
+    global _cache
+    if _cache is None:
+        _cache = AsyncCache(redis_url=os.getenv("REDIS_URL"))
+    return _cache
@@ -1,17 +1,23 @@
 # backend/app/core/database.py
+import logging
+from uuid import uuid4
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from .config import settings
 
+logger = logging.getLogger(__name__)
+
 # 1. Создаем движок (Engine)
 # Используем URL из настроек.
 # Добавляем connect_args для стабильности (опционально)
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,      # Проверяет соединение перед запросом
-    pool_size=20,             # Базовый пул: 20 постоянных соединений
-    max_overflow=20,          # Дополнительно: ещё 20 при нагрузке (итого 40 макс)
-    pool_recycle=3600,        # Пересоздавать соединения каждый час (от stale connections)
+    pool_size=settings.SQLALCHEMY_POOL_SIZE,        # Постоянные соединения (по умолчанию 20)
+    max_overflow=settings.SQLALCHEMY_MAX_OVERFLOW,  # Дополнительно при нагрузке (по умолчанию ещё 20)
+    pool_recycle=settings.SQLALCHEMY_POOL_RECYCLE,  # Пересоздавать соединения раньше, чем их закроет сервер/pgbouncer
     pool_timeout=30,          # Ждать свободное соединение макс 30 сек
     echo=False
 )
@@ -19,6 +25,42 @@ engine = create_engine(
 # 2. Создаем фабрику сессий
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 2a. Async-движок (asyncpg) для async-эндпоинтов, чтобы запросы к БД не блокировали event loop
+def _async_database_url(url: str):
+    """postgresql:// (или postgres://, +psycopg2) -> postgresql+asyncpg://"""
+    sa_url = make_url(url)
+    if not sa_url.drivername.startswith("postgres"):
+        return sa_url
+    query = dict(sa_url.query)
+    # asyncpg не понимает sslmode, у него параметр ssl
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return sa_url.set(drivername="postgresql+asyncpg", query=query)
+
+
+_async_url = _async_database_url(settings.DATABASE_URL)
+_async_connect_args = {}
+if settings.DB_PGBOUNCER or _async_url.port == 6543:
+    # PgBouncer в transaction-режиме (в т.ч. Supabase pooler) не поддерживает именованные prepared statements
+    _async_url = _async_url.update_query_dict({"prepared_statement_cache_size": "0"})
+    _async_connect_args = {
+        "statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+
+async_engine = create_async_engine(
+    _async_url,
+    pool_pre_ping=True,
+    pool_size=settings.SQLALCHEMY_ASYNC_POOL_SIZE,
+    max_overflow=settings.SQLALCHEMY_ASYNC_MAX_OVERFLOW,
+    pool_recycle=settings.SQLALCHEMY_POOL_RECYCLE,
+    pool_timeout=30,
+    connect_args=_async_connect_args,
+    echo=False
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
 # 3. Базовый класс для моделей
 Base = declarative_base()
 
@@ -31,7 +73,18 @@ def get_db():
         yield db
     except Exception as e:
         db.rollback()
-        print(f"Database error in get_db(): {e}")
+        logger.error("Database error in get_db(): %s", e)
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """Async-вариант get_db() для async def эндпоинтов."""
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            await db.rollback()
+            logger.error("Database error in get_async_db(): %s", e)
+            raise
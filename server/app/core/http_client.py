@@ -0,0 +1,32 @@
+"""
+Shared async HTTP client.
+
+One httpx.AsyncClient (HTTP/2, pooled keep-alive connections) is reused by
+the Gemini, Anthropic and OpenAI SDKs so provider calls don't each pay for
+their own TCP/TLS setup.
+"""
+from typing import Optional
+
+import httpx
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_async_http_client() -> httpx.AsyncClient:
+    """Get or create the process-wide async HTTP client."""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+            timeout=httpx.Timeout(600.0, connect=10.0),
+        )
+    return _shared_client
+
+
+async def close_shared_async_http_client() -> None:
+    """Close the shared client (call on application shutdown)."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
@@ -0,0 +1,141 @@
+"""
+Retry and circuit-breaker helpers for calls to external AI providers.
+
+- Exponential backoff with full jitter, so concurrent workers don't retry in
+  synchronized waves.
+- A per-provider circuit breaker that fails fast after repeated errors
+  instead of piling more requests onto a provider that is already down.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_TRANSIENT_MARKERS = (
+    "429", "resource_exhausted", "rate limit", "rate_limit", "overloaded",
+    "internal", "unavailable", "timeout", "timed out",
+    "connection reset", "connection error",
+)
+# Quota/billing errors also come back as 429 but won't clear up on retry
+_PERMANENT_MARKERS = ("insufficient_quota", "credit balance is too low")
+
+
+class CircuitOpenError(Exception):
+    """Raised when a provider's circuit is open and calls are short-circuited."""
+
+
+def is_transient_error(exc: Exception) -> bool:
+    """Rate limits, overloads, 5xx and network errors are worth retrying."""
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    text = f"{type(exc).__name__} {exc}".lower()
+    if any(marker in text for marker in _PERMANENT_MARKERS):
+        return False
+    status_code = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    if isinstance(status_code, int) and (status_code == 429 or status_code >= 500):
+        return True
+    return any(marker in text for marker in _TRANSIENT_MARKERS)
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Minimal circuit breaker.
+
+    closed -> open after `fail_max` consecutive failures; open -> half-open
+    after `reset_timeout` seconds, when a single trial call is let through.
+    A successful trial closes the circuit, a failed one re-opens it.
+    """
+
+    def __init__(self, name: str, fail_max: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> None:
+        state = self.state
+        if state == "open" or (state == "half-open" and self._trial_in_flight):
+            raise CircuitOpenError(f"{self.name} is temporarily unavailable, please try again shortly")
+        if state == "half-open":
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Give up a half-open trial without a verdict (the call was cancelled)."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._opened_at is not None or self._failures >= self.fail_max:
+            if self._opened_at is None:
+                logger.warning("[CIRCUIT] %s opened after %d consecutive failures", self.name, self._failures)
+            self._opened_at = time.monotonic()
+
+
+async def call_with_retry(
+    fn: Callable[[], Awaitable[T]],
+    breaker: Optional[CircuitBreaker] = None,
+    max_attempts: int = 4,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+    retry_if: Callable[[Exception], bool] = is_transient_error,
+) -> T:
+    """
+    Await `fn()` with jittered exponential backoff on transient errors.
+
+    Non-transient errors are raised immediately. Transient failures count
+    towards the breaker; an open breaker fails fast with CircuitOpenError.
+    """
+    for attempt in range(max_attempts):
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = await fn()
+        except Exception as e:
+            transient = retry_if(e)
+            if breaker is not None:
+                # A non-transient error (bad request, auth) still means the provider is up
+                if transient:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            if attempt == max_attempts - 1 or not transient:
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            logger.warning("[RETRY] attempt %d/%d failed (%s); retrying in %.1fs", attempt + 1, max_attempts, e, delay)
+            await asyncio.sleep(delay)
+            continue
+        except BaseException:
+            # Cancelled mid-call: free the half-open trial slot or the breaker never recovers
+            if breaker is not None:
+                breaker.release_trial()
+            raise
+        if breaker is not None:
+            breaker.record_success()
+        return result
+    raise RuntimeError("unreachable")
@@ -128,7 +128,7 @@ def decode_token(token: str) -> Optional[dict]:
             logger.warning(f"Rejected blacklisted token jti={jti[:8]}...")
             return None
 
-        logger.debug(f"Token decoded successfully - sub: {payload.get('sub')}")
+        logger.debug("Token decoded successfully - sub: %s", payload.get('sub'))
         return payload
 
     except JWTError as jwt_err:
@@ -0,0 +1,34 @@
+"""add keyset pagination indexes for chat sessions/messages
+
+Revision ID: add_chat_keyset_idx
+Revises: add_projects
+Create Date: 2026-02-20 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_chat_keyset_idx'
+down_revision = 'add_projects'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY avoids blocking chat writes while the indexes build; it can't run in a transaction
+    with op.get_context().autocommit_block():
+        # Cover ORDER BY updated_at DESC, id DESC / created_at, id so deep pages are index range scans
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chat_sessions_user_updated_id ON chat_sessions(user_id, updated_at DESC, id DESC)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chat_session_created_id ON chat_messages(session_id, created_at, id)")
+        # Superseded by the indexes above
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_chat_sessions_user_updated")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_chat_session_created")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chat_sessions_user_updated ON chat_sessions(user_id, updated_at)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chat_session_created ON chat_messages(session_id, created_at)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_chat_sessions_user_updated_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_chat_session_created_id")
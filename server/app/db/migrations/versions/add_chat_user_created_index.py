@@ -0,0 +1,26 @@
+"""add (user_id, created_at) index on chat_messages for monthly usage counts
+
+Revision ID: add_chat_user_created_idx
+Revises: add_favorites_tags_gin
+Create Date: 2026-02-24 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_chat_user_created_idx'
+down_revision = 'add_favorites_tags_gin'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        # user_scripts already has ix_scripts_user_created
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chat_user_created ON chat_messages (user_id, created_at)")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_chat_user_created")
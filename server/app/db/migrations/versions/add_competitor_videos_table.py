@@ -0,0 +1,67 @@
+"""move competitor videos from competitors.recent_videos into competitor_videos
+
+Revision ID: add_competitor_videos
+Revises: add_competitors_list_idx
+Create Date: 2026-02-22 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_competitor_videos'
+down_revision = 'add_competitors_list_idx'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS competitor_videos (
+            id SERIAL PRIMARY KEY,
+            competitor_id INTEGER NOT NULL REFERENCES competitors(id) ON DELETE CASCADE,
+            video_id VARCHAR(100) NOT NULL,
+            uploaded_at BIGINT NOT NULL DEFAULT 0,
+            views BIGINT NOT NULL DEFAULT 0,
+            digg_count BIGINT NOT NULL DEFAULT 0,
+            comment_count BIGINT NOT NULL DEFAULT 0,
+            share_count BIGINT NOT NULL DEFAULT 0,
+            uts_score DOUBLE PRECISION NOT NULL DEFAULT 0,
+            data JSONB NOT NULL
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_competitor_videos_uploaded ON competitor_videos(competitor_id, uploaded_at DESC)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_competitor_videos_views ON competitor_videos(competitor_id, views DESC)")
+
+    # Copy the existing JSONB video lists into rows, then drop the blobs
+    op.execute("""
+        INSERT INTO competitor_videos
+            (competitor_id, video_id, uploaded_at, views, digg_count, comment_count, share_count, uts_score, data)
+        SELECT
+            c.id,
+            COALESCE(v->>'id', ''),
+            CASE WHEN jsonb_typeof(v->'uploaded_at') = 'number' THEN (v->>'uploaded_at')::numeric::bigint ELSE 0 END,
+            COALESCE((v->>'views')::numeric::bigint, 0),
+            COALESCE((v->'stats'->>'diggCount')::numeric::bigint, 0),
+            COALESCE((v->'stats'->>'commentCount')::numeric::bigint, 0),
+            COALESCE((v->'stats'->>'shareCount')::numeric::bigint, 0),
+            COALESCE((v->>'uts_score')::double precision, 0),
+            v
+        FROM competitors c
+        CROSS JOIN LATERAL jsonb_array_elements(c.recent_videos) AS v
+        WHERE jsonb_typeof(c.recent_videos) = 'array'
+          AND NOT EXISTS (SELECT 1 FROM competitor_videos cv WHERE cv.competitor_id = c.id)
+    """)
+    op.execute("UPDATE competitors SET recent_videos = '[]'::jsonb WHERE recent_videos <> '[]'::jsonb")
+
+
+def downgrade():
+    op.execute("""
+        UPDATE competitors c SET recent_videos = sub.videos
+        FROM (
+            SELECT competitor_id, jsonb_agg(data ORDER BY uploaded_at DESC) AS videos
+            FROM competitor_videos GROUP BY competitor_id
+        ) sub
+        WHERE sub.competitor_id = c.id
+    """)
+    op.execute("DROP TABLE IF EXISTS competitor_videos")
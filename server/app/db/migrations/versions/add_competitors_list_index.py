@@ -0,0 +1,29 @@
+"""add (user_id, is_active, created_at DESC) index for the competitors list
+
+Revision ID: add_competitors_list_idx
+Revises: add_chat_project
+Create Date: 2026-02-21 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_competitors_list_idx'
+down_revision = 'add_chat_project'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        # Filter on user/is_active and ORDER BY created_at DESC from one index range scan
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_competitors_user_active_created ON competitors(user_id, is_active, created_at DESC)")
+        # Superseded by the index above (same leading columns)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_competitors_user_active")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_competitors_user_active ON competitors(user_id, is_active)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_competitors_user_active_created")
@@ -0,0 +1,26 @@
+"""add GIN index on user_favorites.tags for the tag filter
+
+Revision ID: add_favorites_tags_gin
+Revises: add_keyset_list_idx
+Create Date: 2026-02-23 18:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_favorites_tags_gin'
+down_revision = 'add_keyset_list_idx'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        # jsonb_path_ops: smaller than the default GIN opclass and only @> is needed
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_favorites_tags_gin ON user_favorites USING gin (tags jsonb_path_ops)")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_favorites_tags_gin")
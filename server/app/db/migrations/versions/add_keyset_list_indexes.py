@@ -0,0 +1,30 @@
+"""add (user_id, created_at DESC, id DESC) keyset indexes for competitor and favorite lists
+
+Revision ID: add_keyset_list_idx
+Revises: add_competitor_videos
+Create Date: 2026-02-23 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_keyset_list_idx'
+down_revision = 'add_competitor_videos'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        # id as the tie-breaker lets the (created_at, id) < cursor predicate stay a range scan
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_competitors_user_active_created_id ON competitors(user_id, is_active, created_at DESC, id DESC)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_competitors_user_active_created")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_favorites_user_created_id ON user_favorites(user_id, created_at DESC, id DESC)")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_favorites_user_created_id")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_competitors_user_active_created ON competitors(user_id, is_active, created_at DESC)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_competitors_user_active_created_id")
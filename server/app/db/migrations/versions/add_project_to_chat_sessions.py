@@ -0,0 +1,25 @@
+"""add project_id to chat_sessions
+
+Revision ID: add_chat_project
+Revises: add_chat_keyset_idx
+Create Date: 2026-02-21 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_chat_project'
+down_revision = 'add_chat_keyset_idx'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("ALTER TABLE chat_sessions ADD COLUMN IF NOT EXISTS project_id INTEGER REFERENCES projects(id) ON DELETE SET NULL")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_chat_sessions_project_id ON chat_sessions(project_id)")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_chat_sessions_project_id")
+    op.execute("ALTER TABLE chat_sessions DROP COLUMN IF EXISTS project_id")
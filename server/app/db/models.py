@@ -12,8 +12,8 @@ Architecture:
 """
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, Float, Text, DateTime, Boolean,
-    ForeignKey, UniqueConstraint, Index, Enum as SQLEnum
+    Column, Integer, BigInteger, String, Float, Text, DateTime, Boolean,
+    ForeignKey, UniqueConstraint, Index, Enum as SQLEnum, func
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB
@@ -380,6 +380,10 @@ class UserFavorite(Base):
     # Unique constraint: user can favorite a trend only once
     __table_args__ = (
         UniqueConstraint('user_id', 'trend_id', name='uix_favorite_user_trend'),
+        # Newest-first list and its (created_at, id) keyset cursor
+        Index('ix_favorites_user_created_id', user_id, created_at.desc(), id.desc()),
+        # tags @> '["tag"]' filter in the favorites list
+        Index('ix_favorites_tags_gin', tags, postgresql_using='gin', postgresql_ops={'tags': 'jsonb_path_ops'}),
     )
 
     def __repr__(self):
@@ -524,7 +528,8 @@ class ChatMessage(Base):
     # Indexes for conversation retrieval
     __table_args__ = (
         Index('ix_chat_user_session', 'user_id', 'session_id'),
-        Index('ix_chat_session_created', 'session_id', 'created_at'),
+        Index('ix_chat_session_created_id', 'session_id', 'created_at', 'id'),
+        Index('ix_chat_user_created', 'user_id', 'created_at'),
     )
 
     def __repr__(self):
@@ -555,6 +560,14 @@ class ChatSession(Base):
     context_id = Column(Integer, nullable=True)
     context_data = Column(JSONB, default={}, nullable=False)
 
+    # Project used for personalization (remembered from the last message that sent one)
+    project_id = Column(
+        Integer,
+        ForeignKey("projects.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True
+    )
+
     # Session metadata
     model = Column(String(50), default="gemini", nullable=False)
     mode = Column(String(50), default="script", nullable=False)
@@ -563,14 +576,24 @@ class ChatSession(Base):
 
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Bumped by Postgres on every UPDATE (naive UTC, like the Python-side defaults)
+    updated_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=func.timezone('utc', func.now()),
+        nullable=False
+    )
 
     # Relationships
     user = relationship("User", back_populates="chat_sessions")
+    project = relationship("Project")
+
+    # Read SQL-side updated_at back via RETURNING on flush instead of expiring it
+    __mapper_args__ = {"eager_defaults": True}
 
     # Indexes
     __table_args__ = (
-        Index('ix_chat_sessions_user_updated', 'user_id', 'updated_at'),
+        Index('ix_chat_sessions_user_updated_id', user_id, updated_at.desc(), id.desc()),
     )
 
     def __repr__(self):
@@ -619,6 +642,7 @@ class Competitor(Base):
     posting_frequency = Column(Float, default=0.0)  # Videos per week
 
     # Cached Data
+    # Legacy blob: videos now live in competitor_videos (CompetitorVideoRecord)
     recent_videos = Column(JSONB, default=[], nullable=False)
     top_hashtags = Column(JSONB, default=[], nullable=False)
     content_categories = Column(JSONB, default={}, nullable=False)
@@ -646,19 +670,59 @@ class Competitor(Base):
     # Relationships
     user = relationship("User", back_populates="competitors")
     project = relationship("Project", back_populates="competitors")
+    videos = relationship(
+        "CompetitorVideoRecord",
+        back_populates="competitor",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
 
     # Constraints
     __table_args__ = (
         # Each user can track a username only once
         UniqueConstraint('user_id', 'username', name='uix_competitor_user_username'),
-        # Index for user's active competitors
-        Index('ix_competitors_user_active', 'user_id', 'is_active'),
+        # User's (active) competitors, newest first - covers the list filter, ORDER BY and keyset cursor
+        Index('ix_competitors_user_active_created_id', user_id, is_active, created_at.desc(), id.desc()),
     )
 
     def __repr__(self):
         return f"<Competitor(id={self.id}, user_id={self.user_id}, username='{self.username}')>"
 
 
+class CompetitorVideoRecord(Base):
+    """
+    One scraped video of a tracked competitor.
+
+    Sort keys (upload time, views) are real columns so "latest" and "top"
+    queries are index scans; `data` keeps the full normalized video dict
+    that the spy/feed endpoints return.
+    """
+    __tablename__ = "competitor_videos"
+
+    id = Column(Integer, primary_key=True)
+    competitor_id = Column(
+        Integer,
+        ForeignKey("competitors.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    video_id = Column(String(100), nullable=False)
+    uploaded_at = Column(BigInteger, default=0, nullable=False)  # Unix seconds
+    views = Column(BigInteger, default=0, nullable=False)
+    digg_count = Column(BigInteger, default=0, nullable=False)
+    comment_count = Column(BigInteger, default=0, nullable=False)
+    share_count = Column(BigInteger, default=0, nullable=False)
+    uts_score = Column(Float, default=0.0, nullable=False)
+    data = Column(JSONB, nullable=False)
+
+    # Relationships
+    competitor = relationship("Competitor", back_populates="videos")
+
+    __table_args__ = (
+        Index('ix_competitor_videos_uploaded', competitor_id, uploaded_at.desc()),
+        Index('ix_competitor_videos_views', competitor_id, views.desc()),
+    )
+
+
 # =============================================================================
 # LEGACY / CACHE MODELS
 # =============================================================================
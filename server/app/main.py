@@ -15,11 +15,9 @@ if sys.platform == "win32":
 
 # --- БЛОК ПРОВЕРКИ ---
 import logging
+from .core.log_config import setup_logging
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s | %(levelname)-8s | %(name)s | %(message)s'
-)
+setup_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
 logger.info("=" * 60)
@@ -39,6 +37,7 @@ from pathlib import Path
 
 from .core.database import Base, engine
 from .core.config import settings
+from .core.responses import ORJSONResponse
 
 # Явный импорт моделей, чтобы SQLAlchemy их увидела!
 from .db import models
@@ -63,6 +62,7 @@ app = FastAPI(
     title="Rizko.ai API",
     version=settings.VERSION,
     redirect_slashes=False,
+    default_response_class=ORJSONResponse,
     description="""
 ## TikTok Trend Analysis Platform
 
@@ -164,7 +164,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["*"],
-    expose_headers=["X-Request-ID", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
+    expose_headers=["X-Request-ID", "X-RateLimit-Remaining", "X-RateLimit-Reset", "X-Next-Cursor", "ETag"],
 )
 
 
@@ -423,6 +423,14 @@ async def startup_event():
                 END $$
             """))
 
+            # 5. Add project_id FK to chat_sessions (nullable, SET NULL on delete)
+            conn.execute(sa_text("""
+                ALTER TABLE chat_sessions ADD COLUMN IF NOT EXISTS project_id INTEGER REFERENCES projects(id) ON DELETE SET NULL
+            """))
+            conn.execute(sa_text("""
+                CREATE INDEX IF NOT EXISTS ix_chat_sessions_project_id ON chat_sessions(project_id)
+            """))
+
             conn.commit()
             logger.info("Projects tables and columns created/verified successfully")
     except Exception as e:
@@ -517,6 +525,53 @@ async def startup_event():
     except Exception as e:
         logger.warning(f"Super Vision migration skipped or failed: {e}")
 
+    # --- Competitor videos table migration ---
+    try:
+        with engine.connect() as conn:
+            conn.execute(sa_text("""
+                CREATE TABLE IF NOT EXISTS competitor_videos (
+                    id SERIAL PRIMARY KEY,
+                    competitor_id INTEGER NOT NULL REFERENCES competitors(id) ON DELETE CASCADE,
+                    video_id VARCHAR(100) NOT NULL,
+                    uploaded_at BIGINT NOT NULL DEFAULT 0,
+                    views BIGINT NOT NULL DEFAULT 0,
+                    digg_count BIGINT NOT NULL DEFAULT 0,
+                    comment_count BIGINT NOT NULL DEFAULT 0,
+                    share_count BIGINT NOT NULL DEFAULT 0,
+                    uts_score DOUBLE PRECISION NOT NULL DEFAULT 0,
+                    data JSONB NOT NULL
+                )
+            """))
+            conn.execute(sa_text("""
+                CREATE INDEX IF NOT EXISTS ix_competitor_videos_uploaded ON competitor_videos(competitor_id, uploaded_at DESC)
+            """))
+            conn.execute(sa_text("""
+                CREATE INDEX IF NOT EXISTS ix_competitor_videos_views ON competitor_videos(competitor_id, views DESC)
+            """))
+            # Backfill rows for competitors that only have the legacy recent_videos blob
+            conn.execute(sa_text("""
+                INSERT INTO competitor_videos
+                    (competitor_id, video_id, uploaded_at, views, digg_count, comment_count, share_count, uts_score, data)
+                SELECT
+                    c.id,
+                    COALESCE(v->>'id', ''),
+                    CASE WHEN jsonb_typeof(v->'uploaded_at') = 'number' THEN (v->>'uploaded_at')::numeric::bigint ELSE 0 END,
+                    COALESCE((v->>'views')::numeric::bigint, 0),
+                    COALESCE((v->'stats'->>'diggCount')::numeric::bigint, 0),
+                    COALESCE((v->'stats'->>'commentCount')::numeric::bigint, 0),
+                    COALESCE((v->'stats'->>'shareCount')::numeric::bigint, 0),
+                    COALESCE((v->>'uts_score')::double precision, 0),
+                    v
+                FROM competitors c
+                CROSS JOIN LATERAL jsonb_array_elements(c.recent_videos) AS v
+                WHERE jsonb_typeof(c.recent_videos) = 'array'
+                  AND NOT EXISTS (SELECT 1 FROM competitor_videos cv WHERE cv.competitor_id = c.id)
+            """))
+            conn.commit()
+            logger.info("Competitor videos table created/verified successfully")
+    except Exception as e:
+        logger.warning(f"Competitor videos migration skipped or failed: {e}")
+
     # Start background scheduler for auto-rescan
     try:
         logger.info("Initializing Background Scheduler...")
@@ -534,6 +589,10 @@ async def startup_event():
     except Exception as e:
         logger.warning(f"Super Vision restore skipped: {e}")
 
+    # Pre-create AI provider clients so the first chat request doesn't pay for setup
+    from .api.chat_sessions import warm_up_ai_clients
+    await warm_up_ai_clients()
+
     logger.info("Rizko.ai Backend started successfully!")
 
 
@@ -542,6 +601,18 @@ async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Shutting down Rizko.ai Backend...")
 
+    from .core.cache import get_cache
+    from .core.http_client import close_shared_async_http_client
+    from .core.database import async_engine
+    from .services.link_parser import shutdown_parse_pool
+    from .api.proxy import close_proxy_clients
+
+    shutdown_parse_pool()
+    await get_cache().close()
+    await close_shared_async_http_client()
+    await close_proxy_clients()
+    await async_engine.dispose()
+
 
 # =============================================================================
 # HEALTH & INFO ENDPOINTS
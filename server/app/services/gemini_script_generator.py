@@ -2,24 +2,34 @@
 AI Script Generator using Google Gemini Flash
 Fast and cost-effective script generation for TikTok videos
 """
+import logging
 import os
 from typing import Dict, Any, Optional
 
+logger = logging.getLogger(__name__)
+
+GEMINI_MODEL = "gemini-2.0-flash"
+
 class GeminiScriptGenerator:
     """Генератор вирусных скриптов для TikTok с помощью Google Gemini Flash"""
 
     def __init__(self):
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key or api_key == "your_gemini_api_key_here":
-            print("WARNING: GEMINI API KEY not configured!")
+            logger.warning("GEMINI API KEY not configured!")
             self.client = None
         else:
             try:
                 from google import genai
-                self.client = genai.Client(api_key=api_key)
-                print("Gemini Flash initialized")
+                from google.genai import types
+                from ..core.http_client import get_shared_async_http_client
+                self.client = genai.Client(
+                    api_key=api_key,
+                    http_options=types.HttpOptions(httpx_async_client=get_shared_async_http_client())
+                )
+                logger.info("Gemini Flash initialized")
             except Exception as e:
-                print(f"WARNING: Failed to initialize Gemini: {e}")
+                logger.warning("Failed to initialize Gemini: %s", e)
                 self.client = None
 
     def generate_script(
@@ -46,31 +56,39 @@ class GeminiScriptGenerator:
         if not self.client:
             return self._fallback_script(video_description)
 
+        prompt = self._create_prompt(video_description, video_stats, tone, niche, duration_seconds)
         try:
-            # Создаем промпт для Gemini
-            prompt = self._create_prompt(
-                video_description,
-                video_stats,
-                tone,
-                niche,
-                duration_seconds
-            )
-
-            # Генерируем скрипт с использованием google-genai SDK
-            response = self.client.models.generate_content(
-                model='gemini-2.0-flash',
-                contents=prompt
-            )
-
-            # Парсим ответ
-            script = self._parse_response(response.text, duration_seconds)
-
-            return script
-
+            response = self.client.models.generate_content(model=GEMINI_MODEL, contents=prompt)
         except Exception as e:
-            print(f"Gemini generation error: {e}")
+            return self._generation_failed(e, video_description)
+        return self._parse_response(response.text, duration_seconds)
+
+    async def generate_script_async(
+        self,
+        video_description: str,
+        video_stats: Dict[str, int],
+        tone: str = "engaging",
+        niche: str = "general",
+        duration_seconds: int = 30
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Async-версия generate_script (не блокирует event loop)
+        """
+        if not self.client:
             return self._fallback_script(video_description)
 
+        prompt = self._create_prompt(video_description, video_stats, tone, niche, duration_seconds)
+        try:
+            response = await self.client.aio.models.generate_content(model=GEMINI_MODEL, contents=prompt)
+        except Exception as e:
+            return self._generation_failed(e, video_description)
+        return self._parse_response(response.text, duration_seconds)
+
+    def _generation_failed(self, error: Exception, description: str) -> Dict[str, Any]:
+        """Логирует ошибку Gemini и возвращает fallback скрипт"""
+        logger.error("Gemini generation error: %s", error)
+        return self._fallback_script(description)
+
     def _create_prompt(
         self,
         description: str,
@@ -115,11 +133,12 @@ OUTPUT FORMAT (strict JSON):
 
 Generate the script now as valid JSON only, no additional text:"""
 
-    def _parse_response(self, response_text: str, duration: int) -> Dict[str, Any]:
+    def _parse_response(self, response_text: Optional[str], duration: int) -> Dict[str, Any]:
         """Парсит ответ от Gemini"""
         import json
         import re
 
+        response_text = response_text or ""
         try:
             # Пытаемся извлечь JSON из ответа
             # Ищем JSON между ```json и ``` или просто { }
@@ -143,8 +162,8 @@ Generate the script now as valid JSON only, no additional text:"""
             return data
 
         except Exception as e:
-            print(f"WARNING: Failed to parse Gemini response: {e}")
-            print(f"Response was: {response_text[:500]}")
+            logger.warning("Failed to parse Gemini response: %s", e)
+            logger.warning("Response was: %s", response_text[:500])
 
             # Возвращаем базовую структуру с текстом ответа
             return {
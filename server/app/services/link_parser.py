@@ -0,0 +1,49 @@
+"""
+Video link metadata extraction (yt-dlp).
+
+yt-dlp's HTML/JSON parsing holds the GIL, so extraction runs in a dedicated
+process pool: concurrent parses don't serialize and the default thread
+executor stays free for other blocking work. This module is deliberately
+light on imports because every worker process imports it.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Get or create the yt-dlp worker pool (one process per CPU)."""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 2,
+            # spawn: forking a process with running event-loop/executor threads is unsafe
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the worker processes (call on application shutdown)."""
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+
+def extract_video_info(video_url: str) -> dict:
+    """Fetch video metadata without downloading; returns a picklable dict."""
+    import yt_dlp
+
+    ydl_opts = {
+        'skip_download': True,
+        'quiet': True,
+        'no_warnings': True,
+        'extract_flat': False,
+        'cachedir': False,  # workers would otherwise contend on the shared cache dir
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        return ydl.sanitize_info(ydl.extract_info(video_url, download=False) or {})
@@ -89,6 +89,43 @@ class TrendScorer:
             'total_sound_usage': total_in_db
         }
 
+    def calculate_uts_batch(self, views, followers, shares, likes=None, comments=None,
+                            bookmarks=None, cascade_count: int = 1) -> list:
+        """
+        calculate_uts для массива видео без истории (history_data=None).
+        Все слои считаются векторно (NumPy); результат совпадает с calculate_uts поэлементно.
+        """
+        views = np.asarray(views, dtype=np.int64)
+        n = views.size
+        zeros = np.zeros(n, dtype=np.int64)
+        # Та же защита, что и в calculate_uts: views/followers 0 -> 1
+        views = np.where(views == 0, 1, views)
+        followers = np.asarray(followers, dtype=np.int64)
+        followers = np.where(followers == 0, 1, followers)
+        shares = np.asarray(shares, dtype=np.int64)
+        likes = zeros if likes is None else np.asarray(likes, dtype=np.int64)
+        comments = zeros if comments is None else np.asarray(comments, dtype=np.int64)
+        bookmarks = zeros if bookmarks is None else np.asarray(bookmarks, dtype=np.int64)
+        cascade_count = int(cascade_count or 1)
+
+        l1 = np.minimum(views / np.maximum(followers, 1) / 10.0, 1.0)
+        l2 = np.minimum((likes + comments + shares + bookmarks) / np.maximum(views, 1) * 20, 1.0)
+        l3 = np.minimum(((bookmarks + likes * 0.1) / np.maximum(views, 1)) * 50, 1.0)
+        l4 = min(math.log10(cascade_count + 1) / 2, 1.0)
+        l5 = 1.0  # без истории насыщения нет
+        l7 = np.minimum(shares / np.maximum(views, 1) * 100 + comments / np.maximum(views, 1) * 50, 1.0)
+
+        final = (
+            l1 * self.weights['l1'] +
+            l2 * self.weights['l2'] +
+            l3 * self.weights['l3'] +
+            l4 * self.weights['l4'] +
+            l5 * self.weights['l5'] +
+            l7 * self.weights['l7']
+        ) * 10
+        # round() в Python, чтобы округление совпадало с calculate_uts
+        return [round(score, 2) for score in final.tolist()]
+
     def analyze_profile_efficiency(self, videos: list) -> dict:
         """
         Новая логика: Анализ эффективности автора.